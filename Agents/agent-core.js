@@ -0,0 +1,513 @@
+/**
+ * BytEdge AI - Shared Conversational Agent Interface
+ * One bundle for every agent page; per-agent settings come from window.AGENT_CONFIG
+ * (rendered into the page from AGENT_CONFIGS) and answers from the agent's chat API
+ */
+
+// Configuration
+const AGENT_CONFIG = window.AGENT_CONFIG;
+
+// Global variables
+let conversationHistory = [];
+let conversationId = null;
+let isProcessing = false;
+let messageCount = 0;
+
+// DOM elements
+const chatMessages = document.getElementById('chatMessages');
+const messageInput = document.getElementById('messageInput');
+const sendButton = document.getElementById('sendButton');
+const typingIndicator = document.getElementById('typingIndicator');
+const characterCount = document.querySelector('.character-count');
+
+// Initialize the application
+document.addEventListener('DOMContentLoaded', function() {
+    initializeApp();
+    setupEventListeners();
+    showWelcomeAnimation();
+    claimHandoff();
+});
+
+function initializeApp() {
+    // Set up auto-resize for textarea
+    autoResizeTextarea(messageInput);
+
+    // Initialize character counter
+    updateCharacterCount();
+
+    // Focus on input
+    messageInput.focus();
+
+    console.log(`${AGENT_CONFIG.name} initialized successfully`);
+}
+
+function setupEventListeners() {
+    // Send message on Enter (but allow Shift+Enter for new lines)
+    messageInput.addEventListener('keydown', function(e) {
+        if (e.key === 'Enter' && !e.shiftKey) {
+            e.preventDefault();
+            sendMessage();
+        }
+    });
+
+    // Auto-resize textarea
+    messageInput.addEventListener('input', function() {
+        updateCharacterCount();
+        autoResizeTextarea(this);
+    });
+
+    // Send button click
+    sendButton.addEventListener('click', sendMessage);
+
+    // Prevent form submission on Enter
+    messageInput.closest('form')?.addEventListener('submit', function(e) {
+        e.preventDefault();
+        sendMessage();
+    });
+}
+
+function updateCharacterCount() {
+    const count = messageInput.value.length;
+    const maxLength = parseInt(messageInput.getAttribute('maxlength')) || 2000;
+    characterCount.textContent = `${count}/${maxLength}`;
+
+    // Change color when approaching limit
+    if (count > maxLength * 0.9) {
+        characterCount.style.color = 'var(--status-warning)';
+    } else if (count > maxLength * 0.95) {
+        characterCount.style.color = 'var(--status-error)';
+    } else {
+        characterCount.style.color = 'var(--text-tertiary)';
+    }
+}
+
+function autoResizeTextarea(textarea) {
+    textarea.style.height = 'auto';
+    textarea.style.height = Math.min(textarea.scrollHeight, 120) + 'px';
+}
+
+// Pages opened from the router carry ?handoff=<token>: the answer to the question asked there was
+// started speculatively and is usually ready, so it is shown without asking again
+async function claimHandoff() {
+    const params = new URLSearchParams(location.search);
+    const token = params.get('handoff');
+    if (!token) {
+        return;
+    }
+    params.delete('handoff');
+    history.replaceState(null, '', location.pathname + (params.toString() ? `?${params}` : '') + location.hash);
+
+    setProcessingState(true);
+    showTypingIndicator();
+    try {
+        const response = await fetch(`/api/handoff/${encodeURIComponent(token)}`);
+        const data = await response.json();
+        if (data.success) {
+            addMessage(data.question, 'user');
+            addMessage(data.message, 'agent');
+            conversationId = data.conversation_id;
+            conversationHistory.push({ user: data.question, agent: data.message, timestamp: new Date().toISOString() });
+        } else if (data.question) {
+            // The prepared answer failed: put the question back so it can be sent normally
+            messageInput.value = data.question;
+            updateCharacterCount();
+        }
+    } catch (error) {
+        console.warn('Handoff unavailable:', error);
+    } finally {
+        hideTypingIndicator();
+        setProcessingState(false);
+        scrollToBottom();
+    }
+}
+
+function showWelcomeAnimation() {
+    const welcomeMessage = document.querySelector('.welcome-message');
+    if (welcomeMessage) {
+        welcomeMessage.classList.add('slide-up');
+    }
+}
+
+async function sendMessage() {
+    const message = messageInput.value.trim();
+
+    if (!message || isProcessing) {
+        return;
+    }
+
+    // Disable input and show processing state
+    setProcessingState(true);
+
+    // Add user message to chat
+    addMessage(message, 'user');
+
+    // Clear input
+    messageInput.value = '';
+    updateCharacterCount();
+    autoResizeTextarea(messageInput);
+
+    // Show typing indicator
+    showTypingIndicator();
+
+    // Streamed tokens fill one agent message as they arrive
+    let streamingText = null;
+    let streamed = '';
+    const onToken = (token) => {
+        if (!streamingText) {
+            hideTypingIndicator();
+            streamingText = addMessage('', 'agent');
+        }
+        streamed += token;
+        streamingText.innerHTML = formatMessage(streamed);
+        scrollToBottom();
+    };
+
+    try {
+        // Send to backend API
+        const response = await sendToAPI(message, onToken);
+
+        // Hide typing indicator
+        hideTypingIndicator();
+
+        if (response.success) {
+            if (streamingText) {
+                streamingText.innerHTML = formatMessage(response.message);
+            } else {
+                addMessage(response.message, 'agent');
+            }
+
+            // Store conversation history
+            conversationHistory.push({
+                user: message,
+                agent: response.message,
+                timestamp: new Date().toISOString()
+            });
+        } else {
+            addMessage(
+                "I apologize, but I encountered an error processing your request. Please try again or rephrase your question.",
+                'agent',
+                true
+            );
+        }
+
+    } catch (error) {
+        hideTypingIndicator();
+        console.error('Error sending message:', error);
+
+        addMessage(
+            "I'm having trouble connecting right now. Please check your connection and try again.",
+            'agent',
+            true
+        );
+    } finally {
+        setProcessingState(false);
+        scrollToBottom();
+    }
+}
+
+async function sendToAPI(message, onToken) {
+    if (!AGENT_CONFIG.apiEndpoint) {
+        return answerFromKnowledge(message);
+    }
+    // The server answers from its knowledge base when it can and falls back to it if the model is down
+    let data = null;
+    if (chatSocket.available()) {
+        try {
+            data = await chatSocket.request({ agent: AGENT_CONFIG.domain, message, conversation_id: conversationId },
+                                            onToken);
+        } catch (error) {
+            // Once the server has started the turn, sending it again over HTTP would answer it twice
+            if (error.started) {
+                throw error;
+            }
+            console.warn('WebSocket unavailable, using HTTP:', error.message);
+        }
+    }
+    if (!data) {
+        const response = await fetch(AGENT_CONFIG.apiEndpoint, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ message, conversation_id: conversationId })
+        });
+        data = await response.json();
+    }
+    if (data.conversation_id) {
+        conversationId = data.conversation_id;
+    }
+    return data;
+}
+
+// Static builds (GitHub Pages) have no chat API; the agent's curated answers ship as a JSON file instead
+const STOP_WORDS = new Set(['the', 'and', 'for', 'what', 'how', 'are', 'does', 'with', 'can', 'you', 'why',
+                            'which', 'when', 'this', 'that', 'should', 'about']);
+let knowledge = null;
+
+function terms(text) {
+    return (text.toLowerCase().match(/[a-z0-9]+/g) || []).filter((term) => term.length > 2 && !STOP_WORDS.has(term));
+}
+
+async function answerFromKnowledge(message) {
+    if (!knowledge) {
+        const response = await fetch(AGENT_CONFIG.knowledgeUrl);
+        knowledge = (await response.json()).entries.map((entry) => ({
+            answer: entry.answer,
+            keywords: new Set(entry.keywords.flatMap(terms)),
+            words: new Set(terms([entry.title, ...entry.questions].join(' ')))
+        }));
+    }
+    // Keyword matches count twice; an answer needs a keyword or two matching question words
+    let best = null;
+    let bestScore = 1;
+    for (const entry of knowledge) {
+        const score = [...new Set(terms(message))].reduce(
+            (sum, term) => sum + (entry.keywords.has(term) ? 2 : entry.words.has(term) ? 1 : 0), 0);
+        if (score > bestScore) {
+            best = entry;
+            bestScore = score;
+        }
+    }
+    const answer = best ? best.answer : `This offline page answers from ${AGENT_CONFIG.name}'s curated notes, ` +
+        'and none of them cover that question. Try one of the suggested topics, or run the agent server for full answers.';
+    return { success: true, message: answer, source: 'knowledge' };
+}
+
+// One WebSocket per page, opened on the first message and reused for every later one. Frames carry
+// request and conversation ids, so a single connection can serve any number of conversations.
+// If the first connection fails, the page uses HTTP from then on. A request whose connection closes
+// before its `start` frame is retried over HTTP; after it, the turn is already running on the server.
+const chatSocket = (function createChatSocket() {
+    const pending = new Map();  // request id -> { onToken, streamed, started, resolve, reject }
+    let socket = null;
+    let connecting = null;
+    let everConnected = false;
+    let failed = !AGENT_CONFIG.wsEndpoint || !window.WebSocket;
+    let nextId = 0;
+    let lastSeen = 0;
+    let heartbeatMs = 20000;
+    let watchdog = null;
+
+    function connect() {
+        if (connecting) {
+            return connecting;
+        }
+        connecting = new Promise((resolve, reject) => {
+            const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+            socket = new WebSocket(`${scheme}://${location.host}${AGENT_CONFIG.wsEndpoint}`);
+
+            socket.onmessage = (event) => {
+                lastSeen = Date.now();
+                const frame = JSON.parse(event.data);
+                if (frame.type === 'ready') {
+                    everConnected = true;
+                    heartbeatMs = frame.heartbeat_s * 1000;
+                    // Server heartbeats arrive while idle; missing two means the connection is gone
+                    watchdog = setInterval(() => {
+                        if (Date.now() - lastSeen > 2 * heartbeatMs) {
+                            socket.close();
+                        }
+                    }, heartbeatMs);
+                    resolve();
+                    return;
+                }
+                const request = pending.get(frame.id);
+                if (!request) {
+                    return;
+                }
+                if (frame.type === 'start') {
+                    request.started = true;
+                } else if (frame.type === 'token') {
+                    request.streamed += frame.text;
+                    request.onToken(frame.text);
+                } else if (frame.type === 'done' || frame.type === 'error') {
+                    pending.delete(frame.id);
+                    if (frame.streamed) {
+                        frame.message = request.streamed;
+                    }
+                    request.resolve({ success: false, ...frame });
+                }
+            };
+
+            socket.onclose = () => {
+                clearInterval(watchdog);
+                connecting = null;
+                failed = failed || !everConnected;
+                pending.forEach(request => {
+                    const error = new Error(request.started ? 'connection closed during the reply' : 'connection closed');
+                    error.started = request.started;
+                    request.reject(error);
+                });
+                pending.clear();
+                reject(new Error('connection closed'));
+            };
+        });
+        return connecting;
+    }
+
+    async function request(payload, onToken) {
+        await connect();
+        const id = `r${++nextId}`;
+        return new Promise((resolve, reject) => {
+            pending.set(id, { onToken, streamed: '', started: false, resolve, reject });
+            socket.send(JSON.stringify({ type: 'chat', id, ...payload }));
+        });
+    }
+
+    function end(id) {
+        if (id && socket && socket.readyState === WebSocket.OPEN) {
+            socket.send(JSON.stringify({ type: 'end', conversation_id: id }));
+        }
+    }
+
+    return { available: () => !failed, request, end };
+})();
+
+function addMessage(text, sender, isError = false) {
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${sender}-message ${isError ? 'error-message' : ''}`;
+
+    const avatarDiv = document.createElement('div');
+    avatarDiv.className = 'message-avatar';
+    avatarDiv.textContent = sender === 'user' ? '👤' : AGENT_CONFIG.avatar;
+
+    const contentDiv = document.createElement('div');
+    contentDiv.className = 'message-content';
+
+    const textDiv = document.createElement('div');
+    textDiv.className = 'message-text';
+
+    // Convert markdown-like formatting to HTML
+    const formattedText = formatMessage(text);
+    textDiv.innerHTML = formattedText;
+
+    const timeDiv = document.createElement('div');
+    timeDiv.className = 'message-time';
+    timeDiv.textContent = getCurrentTime();
+    timeDiv.dataset.timestamp = Date.now();
+
+    contentDiv.appendChild(textDiv);
+    contentDiv.appendChild(timeDiv);
+    messageDiv.appendChild(avatarDiv);
+    messageDiv.appendChild(contentDiv);
+
+    chatMessages.appendChild(messageDiv);
+    messageDiv.classList.add('fade-in');
+
+    messageCount++;
+    scrollToBottom();
+    return textDiv;
+}
+
+function formatMessage(text) {
+    return text
+        // Bold text **text**
+        .replace(/\*\*(.*?)\*\*/g, '<strong>$1</strong>')
+        // Bullet points
+        .replace(/^[•▸]\s/gm, '<span class="bullet">•</span> ')
+        // Code blocks (inline)
+        .replace(/`([^`]+)`/g, '<code>$1</code>')
+        // Line breaks
+        .replace(/\n/g, '<br>');
+}
+
+function showTypingIndicator() {
+    typingIndicator.style.display = 'flex';
+    typingIndicator.classList.add('fade-in');
+    scrollToBottom();
+}
+
+function hideTypingIndicator() {
+    typingIndicator.style.display = 'none';
+}
+
+function setProcessingState(processing) {
+    isProcessing = processing;
+    messageInput.disabled = processing;
+    sendButton.disabled = processing;
+
+    if (!processing) {
+        messageInput.focus();
+    }
+}
+
+function scrollToBottom() {
+    setTimeout(() => {
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+    }, 100);
+}
+
+function getCurrentTime() {
+    return new Date().toLocaleTimeString('en-US', {
+        hour: '2-digit',
+        minute: '2-digit',
+        hour12: true
+    });
+}
+
+// Quick action functions
+function askQuestion(question) {
+    messageInput.value = question;
+    updateCharacterCount();
+    autoResizeTextarea(messageInput);
+    messageInput.focus();
+}
+
+function clearChat() {
+    if (confirm('Are you sure you want to clear the chat history?')) {
+        // Remove all messages except welcome
+        const messages = chatMessages.querySelectorAll('.message:not(.welcome-message)');
+        messages.forEach(msg => {
+            msg.style.animation = 'fadeOut 0.3s ease';
+            setTimeout(() => msg.remove(), 300);
+        });
+
+        chatSocket.end(conversationId);
+        conversationHistory = [];
+        conversationId = null;
+        messageCount = 0;
+
+        // Reset input
+        messageInput.value = '';
+        updateCharacterCount();
+        messageInput.focus();
+    }
+}
+
+// Add CSS for fadeOut animation
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes fadeOut {
+        from { opacity: 1; transform: translateY(0); }
+        to { opacity: 0; transform: translateY(-10px); }
+    }
+
+    .error-message .message-text {
+        background: rgba(244, 67, 54, 0.1) !important;
+        border-color: rgba(244, 67, 54, 0.3) !important;
+        color: #ffcdd2 !important;
+    }
+
+    .message-text code {
+        background: rgba(255, 255, 255, 0.1);
+        padding: 2px 6px;
+        border-radius: 4px;
+        font-family: var(--font-mono);
+        font-size: 0.9em;
+    }
+
+    .message-text .bullet {
+        color: var(--theme-primary);
+        font-weight: bold;
+        margin-right: 0.5rem;
+    }
+`;
+document.head.appendChild(style);
+
+// Export for potential external use
+window[AGENT_CONFIG.exportName] = {
+    sendMessage,
+    clearChat,
+    askQuestion,
+    getConversationHistory: () => conversationHistory
+};
+
+console.log(`${AGENT_CONFIG.name} loaded successfully! 🚗${AGENT_CONFIG.avatar}`);
\ No newline at end of file
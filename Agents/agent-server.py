@@ -6,24 +6,42 @@ Supports ClutchEdge, BatteryEdge, FrameEdge, and TireEdge agents
 """
 
 import os
+import contextvars
+import hmac
+import time
+import uuid
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import contextmanager
 from datetime import datetime
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context, g
 from flask_cors import CORS
-import google.generativeai as genai
-from typing import Dict, Any, List
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('byteedge_agents.log'),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+from typing import Dict, Any, List, Callable, Optional
+
+import engineering_tools
+import instrumentation
+import tracing
+import structured_logging
+import memory_monitor
+import static_assets
+import page_builder
+import knowledge_base
+import vector_index
+import ws_gateway
+import handoff
+import warmup
+import prompt_prefix
+import sharding
+import model_tiers
+from job_queue import JobQueue, TERMINAL_STATES
+from agent_configs import AGENT_CONFIGS
+
+try:
+    from flask_sock import Sock
+except ImportError:  # optional: without it the WebSocket endpoint is off and pages chat over HTTP
+    Sock = None
 
 app = Flask(__name__)
 CORS(app, origins="*")
@@ -32,218 +50,545 @@ CORS(app, origins="*")
 class Config:
     """Application configuration"""
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
+    GEMINI_TRANSPORT = os.getenv('GEMINI_TRANSPORT', 'grpc')  # grpc (one HTTP/2 channel) or rest (pooled sessions)
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
     HOST = os.getenv('HOST', '0.0.0.0')
     PORT = int(os.getenv('PORT', 5000))
     MAX_TOKENS = int(os.getenv('MAX_TOKENS', 2048))
+    MODEL_STRONG = os.getenv('MODEL_STRONG', 'gemini-pro')
     TEMPERATURE = float(os.getenv('TEMPERATURE', 0.7))
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_RESULT_TTL = float(os.getenv('JOB_RESULT_TTL', 600))
+    JOB_TIMEOUT = float(os.getenv('JOB_TIMEOUT', 120))
+    TRACING = os.getenv('TRACING', 'True').lower() == 'true'
+    SLOW_TRACE_MS = float(os.getenv('SLOW_TRACE_MS', 2000))
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN', '')
+    LOG_FILE = os.getenv('LOG_FILE', 'byteedge_agents.log')
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_ROTATION = os.getenv('LOG_ROTATION', 'size')  # 'size' or 'time'
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 5))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')
+    LOG_SAMPLE_BURST = int(os.getenv('LOG_SAMPLE_BURST', 20))
+    LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 10))
+    MEMORY_SAMPLE_INTERVAL = float(os.getenv('MEMORY_SAMPLE_INTERVAL', 300))
+    TRACEMALLOC = os.getenv('TRACEMALLOC', 'False').lower() == 'true'
+    TRACEMALLOC_FRAMES = int(os.getenv('TRACEMALLOC_FRAMES', 1))
+    KB_DIR = os.getenv('KB_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knowledge'))
+    KB_INSTANT_COVERAGE = float(os.getenv('KB_INSTANT_COVERAGE', 0.8))
+    KB_FALLBACK_COVERAGE = float(os.getenv('KB_FALLBACK_COVERAGE', 0.3))
+    UPSTREAM_TIMEOUT = float(os.getenv('UPSTREAM_TIMEOUT', 20))
+    UPSTREAM_WORKERS = int(os.getenv('UPSTREAM_WORKERS', 8))
+    RAG_SOURCE_DIR = os.getenv('RAG_SOURCE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'references'))
+    RAG_INDEX_DIR = os.getenv('RAG_INDEX_DIR', os.path.join(RAG_SOURCE_DIR, 'index'))
+    RAG_TOP_K = int(os.getenv('RAG_TOP_K', 4))
+    RAG_NPROBE = int(os.getenv('RAG_NPROBE', 8))
+    RAG_MIN_SCORE = float(os.getenv('RAG_MIN_SCORE', 0.15))
+    RAG_TOKEN_BUDGET = int(os.getenv('RAG_TOKEN_BUDGET', 600))
+    WS_MAX_PER_CLIENT = int(os.getenv('WS_MAX_PER_CLIENT', 4))
+    WS_MAX_INFLIGHT = int(os.getenv('WS_MAX_INFLIGHT', 4))
+    WS_MAX_CONVERSATIONS = int(os.getenv('WS_MAX_CONVERSATIONS', 32))
+    WS_MAX_MESSAGE_BYTES = int(os.getenv('WS_MAX_MESSAGE_BYTES', 16 * 1024))
+    WS_HEARTBEAT = float(os.getenv('WS_HEARTBEAT', 20))
+    WS_WORKERS = int(os.getenv('WS_WORKERS', 16))
+    SPECULATE_TTL = float(os.getenv('SPECULATE_TTL', 120))
+    SPECULATE_BUDGET = int(os.getenv('SPECULATE_BUDGET', 30))
+    SPECULATE_MAX_PENDING = int(os.getenv('SPECULATE_MAX_PENDING', 2))
+    WARMUP = os.getenv('WARMUP', 'True').lower() == 'true'
+    WARMUP_BUDGET = int(os.getenv('WARMUP_BUDGET', 20))
+    WARMUP_IDLE_S = float(os.getenv('WARMUP_IDLE_S', 2))
+    WARMUP_REFRESH_S = float(os.getenv('WARMUP_REFRESH_S', 3600))
+    PROMPT_PREFIX = os.getenv('PROMPT_PREFIX', 'True').lower() == 'true'
+    PROMPT_CACHE_MIN_TOKENS = int(os.getenv('PROMPT_CACHE_MIN_TOKENS', 32768))
+    PROMPT_CACHE_TTL = int(os.getenv('PROMPT_CACHE_TTL', 3600))
+    SHARD_NODES = [node.strip() for node in os.getenv('SHARD_NODES', '').split(',') if node.strip()]
+    SHARD_SELF = os.getenv('SHARD_SELF', '')
+    SHARD_VNODES = int(os.getenv('SHARD_VNODES', 128))
+    SHARD_MODE = os.getenv('SHARD_MODE', 'forward')  # forward (proxy to the owner) or redirect (307)
+    SHARD_SECRET = os.getenv('SHARD_SECRET', '')
+    MODEL_TIERING = os.getenv('MODEL_TIERING', 'True').lower() == 'true'
+    MODEL_FAST = os.getenv('MODEL_FAST', 'gemini-1.5-flash')
+    FAST_MAX_TOKENS = int(os.getenv('FAST_MAX_TOKENS', 768))
+    TIER_SHORT_WORDS = int(os.getenv('TIER_SHORT_WORDS', 12))
+    TIER_MAX_WORDS = int(os.getenv('TIER_MAX_WORDS', 40))
+    TIER_MAX_HISTORY = int(os.getenv('TIER_MAX_HISTORY', 2))
+    TIER_MIN_CONFIDENCE = float(os.getenv('TIER_MIN_CONFIDENCE', 0.6))
+
+# Configure logging: request threads only enqueue, a listener thread writes JSON lines and the console
+log_listener = structured_logging.configure(
+    Config.LOG_FILE,
+    level=getattr(logging, Config.LOG_LEVEL, logging.INFO),
+    rotation=Config.LOG_ROTATION,
+    max_bytes=Config.LOG_MAX_BYTES,
+    backup_count=Config.LOG_BACKUP_COUNT,
+    when=Config.LOG_ROTATE_WHEN,
+    sample_burst=Config.LOG_SAMPLE_BURST,
+    sample_every=Config.LOG_SAMPLE_EVERY,
+    trace_id=tracing.current_trace_id
+)
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger('byteedge.access')
 
-# Agent configurations with specialized system prompts
-AGENT_CONFIGS = {
-    'clutch': {
-        'name': 'ClutchEdge AI',
-        'avatar': '⚙️',
-        'domain': 'Clutch and Drivetrain Systems',
-        'system_prompt': """You are ClutchEdge AI, a world-class expert in clutch and drivetrain engineering with deep knowledge of:
-
-CORE EXPERTISE:
-• Clutch system design, mechanics, and optimization
-• Torque transmission analysis and calculations
-• Friction material engineering and selection (organic, ceramic, carbon)
-• Dual-clutch systems and automated clutch technologies
-• CVT integration and drivetrain optimization
-• Clutch engagement dynamics and tuning
-• Hydraulic and electronic actuation systems
-• Performance clutch applications and racing systems
-• Clutch wear analysis and maintenance protocols
-• Manufacturing processes and quality control
-
-RESPONSE GUIDELINES:
-• Provide technically accurate information with engineering calculations
-• Include specific material properties, torque specifications, and performance data
-• Explain complex concepts clearly while maintaining technical depth
-• Reference industry standards (SAE, ISO) and best practices
-• Consider safety factors, reliability, and cost implications
-• Suggest practical solutions and optimization strategies
-
-Always approach questions with engineering rigor while being helpful and educational."""
-    },
-
-    'battery': {
-        'name': 'BatteryEdge AI',
-        'avatar': '🔋',
-        'domain': 'EV Battery and Energy Systems',
-        'system_prompt': """You are BatteryEdge AI, a leading expert in EV battery and energy systems engineering with comprehensive knowledge of:
-
-CORE EXPERTISE:
-• Battery management system (BMS) design and algorithms
-• Electrochemical cell analysis (Li-ion, LFP, solid-state, emerging chemistries)
-• Thermal management and cooling system design
-• Charging protocols, fast charging, and safety systems
-• Energy optimization and range analysis methodologies
-• Battery pack design, integration, and manufacturing
-• Safety systems, fault detection, and failure analysis
-• Battery degradation mechanisms and life prediction models
-• Grid integration, V2G technology, and energy storage
-• Regulatory compliance and testing standards
-
-RESPONSE GUIDELINES:
-• Apply electrochemical engineering principles accurately
-• Provide specific data on energy density, power density, and cycle life
-• Include thermal management solutions and safety considerations
-• Reference relevant standards (IEC, UL, SAE) and regulations
-• Consider cost, scalability, and environmental factors
-• Suggest optimization strategies for performance and longevity
-
-Combine deep technical knowledge with practical application insights for real-world EV battery engineering challenges."""
-    },
-
-    'frame': {
-        'name': 'FrameEdge AI',
-        'avatar': '🏗️',
-        'domain': 'Chassis and Structural Engineering',
-        'system_prompt': """You are FrameEdge AI, a distinguished expert in chassis and structural engineering with extensive knowledge of:
-
-CORE EXPERTISE:
-• Vehicle chassis design and structural optimization
-• Finite Element Analysis (FEA) and structural simulation
-• Material selection and properties (steel, aluminum, carbon fiber, composites)
-• Crash safety engineering and energy absorption design
-• Weight reduction strategies while maintaining stiffness and strength
-• Manufacturing processes (stamping, welding, bonding, assembly)
-• Body-on-frame vs unibody construction analysis
-• Suspension integration and mounting system design
-• Torsional rigidity, NVH optimization, and structural dynamics
-• Regulatory compliance (FMVSS, ECE, NCAP) and testing protocols
-
-RESPONSE GUIDELINES:
-• Apply structural mechanics and materials science principles
-• Include specific calculations for stress, strain, and safety factors
-• Reference material properties, yield strengths, and fatigue data
-• Consider manufacturing constraints and cost implications
-• Address safety standards and crash performance requirements
-• Provide optimization strategies for weight, stiffness, and durability
-
-Deliver engineering excellence with practical solutions for complex structural challenges in automotive design."""
-    },
-
-    'tire': {
-        'name': 'TireEdge AI',
-        'avatar': '🛞',
-        'domain': 'Tire Dynamics and Performance Engineering',
-        'system_prompt': """You are TireEdge AI, a premier expert in tire dynamics and performance engineering with deep understanding of:
-
-CORE EXPERTISE:
-• Tire mechanics, construction design, and materials engineering
-• Contact patch analysis and pressure distribution optimization
-• Traction generation, grip modeling, and vehicle dynamics integration
-• Rolling resistance analysis and energy efficiency optimization
-• Tire-road interaction physics and mathematical modeling
-• Rubber chemistry, compound formulation, and material properties
-• Temperature and pressure effects on tire performance
-• Tire wear mechanisms, life prediction, and maintenance
-• Performance testing, validation, and standards compliance
-• Specialized applications (racing, commercial, off-road, winter/summer)
-
-RESPONSE GUIDELINES:
-• Apply tire mechanics and vehicle dynamics principles accurately
-• Include specific performance data, coefficients, and measurements
-• Explain complex physics concepts with practical applications
-• Reference industry standards (ASTM, ISO, DOT) and testing methods
-• Consider trade-offs between grip, durability, efficiency, and cost
-• Provide optimization recommendations for specific applications
-
-Combine advanced tire science with practical engineering insights for optimal tire-vehicle system performance."""
-    }
-}
+
+# Request tracing and on-demand profiling
+tracer = tracing.Tracer(enabled=Config.TRACING, slow_threshold_ms=Config.SLOW_TRACE_MS)
+profiler = tracing.Profiler()
+
+@contextmanager
+def stage(name: str, agent_type: str):
+    """Time a request stage into the latency metrics and the active trace"""
+    with instrumentation.timed(name, agent_type), tracing.span(name):
+        yield
 
 class BytEdgeAI:
     """Main AI handler class for BytEdge automotive agents"""
 
     def __init__(self):
         self.model = None
+        # Per-agent upstream handles for the static prompt prefix; None sends every prompt in full
+        self.prefixes: Optional[prompt_prefix.PrefixRegistry] = None
+        # Fast/strong model choice per question; None sends everything to self.model
+        self.tiers: Optional[model_tiers.TierPolicy] = None
         self.conversation_history = {}
+        self.tools = engineering_tools.default_registry()
+        self.knowledge = knowledge_base.KnowledgeBase(
+            Config.KB_DIR,
+            instant_coverage=Config.KB_INSTANT_COVERAGE,
+            fallback_coverage=Config.KB_FALLBACK_COVERAGE
+        ).load()
+        logger.info("Knowledge base ready in %.1f ms (%s) - entries: %s", self.knowledge.build_ms,
+                    'cached index' if self.knowledge.loaded_from_cache else 'rebuilt', self.knowledge.sizes())
+        # Reference vectors stay memory-mapped; only the rows a query touches are paged in
+        self.retriever = vector_index.Retriever(
+            Config.RAG_INDEX_DIR,
+            source_dir=Config.RAG_SOURCE_DIR,
+            top_k=Config.RAG_TOP_K,
+            nprobe=Config.RAG_NPROBE,
+            min_score=Config.RAG_MIN_SCORE,
+            token_budget=Config.RAG_TOKEN_BUDGET
+        ).load()
+        if self.retriever.indexes:
+            logger.info("Reference indexes opened - chunks: %s", self.retriever.sizes())
+        else:
+            logger.warning("No reference indexes in %s; run build_index.py to enable retrieval", Config.RAG_INDEX_DIR)
+        # Upstream calls run here so a slow model can be abandoned for a knowledge-base answer
+        self.upstream = ThreadPoolExecutor(max_workers=Config.UPSTREAM_WORKERS, thread_name_prefix='upstream')
+        # Model answers to quick topics, filled by the warmup scheduler
+        self.warm_store = warmup.WarmStore(self.prompt_version)
 
     def initialize_model(self):
-        """Initialize the Gemini model"""
+        """Initialize the Gemini model, and the fast tier when tiering is on"""
         try:
-            self.model = genai.GenerativeModel(
-                'gemini-pro',
-                generation_config=genai.types.GenerationConfig(
+            import google.generativeai as genai
+
+            def generation_config(max_tokens: int):
+                return genai.types.GenerationConfig(
                     temperature=Config.TEMPERATURE,
-                    max_output_tokens=Config.MAX_TOKENS,
+                    max_output_tokens=max_tokens,
                     top_p=0.8,
                     top_k=40
                 )
-            )
+
+            def prefixes(model_name: str, max_tokens: int):
+                if not Config.PROMPT_PREFIX:
+                    return None
+                return prompt_prefix.PrefixRegistry(prompt_prefix.GeminiPrefixes(
+                    model_name, generation_config(max_tokens), cache_min_tokens=Config.PROMPT_CACHE_MIN_TOKENS,
+                    cache_ttl_s=Config.PROMPT_CACHE_TTL))
+
+            self.model = genai.GenerativeModel(Config.MODEL_STRONG, generation_config=generation_config(Config.MAX_TOKENS))
+            self.prefixes = prefixes(Config.MODEL_STRONG, Config.MAX_TOKENS)
+            if Config.MODEL_TIERING:
+                fast = genai.GenerativeModel(Config.MODEL_FAST, generation_config=generation_config(Config.FAST_MAX_TOKENS))
+                self.tiers = self.tier_policy(fast, prefixes(Config.MODEL_FAST, Config.FAST_MAX_TOKENS))
             logger.info("Gemini model initialized successfully")
             return True
         except Exception as e:
-            logger.error(f"Failed to initialize Gemini model: {e}")
+            logger.error("Failed to initialize Gemini model: %s", e)
             return False
 
-    def get_agent_response(self, message: str, agent_type: str, conversation_id: str = None) -> Dict[str, Any]:
-        """Get response from specialized agent"""
-        if not self.model:
-            return {"success": False, "error": "AI model not initialized"}
-
+    def tier_policy(self, fast_model, fast_prefixes=None) -> model_tiers.TierPolicy:
+        """Tiering between ``fast_model`` and the current strong model"""
+        return model_tiers.TierPolicy(
+            model_tiers.Tier('fast', Config.MODEL_FAST, Config.FAST_MAX_TOKENS, fast_model, fast_prefixes),
+            model_tiers.Tier('strong', Config.MODEL_STRONG, Config.MAX_TOKENS, self.model, self.prefixes),
+            short_words=Config.TIER_SHORT_WORDS, max_words=Config.TIER_MAX_WORDS,
+            max_history=Config.TIER_MAX_HISTORY, min_confidence=Config.TIER_MIN_CONFIDENCE)
+
+    def static_prefix(self, agent_type: str) -> str:
+        """The static start of every prompt for an agent: its system prompt and tool guide"""
+        prefix = AGENT_CONFIGS[agent_type]['system_prompt']
+        tool_guide = self.tools.describe(agent_type)
+        if tool_guide:
+            prefix += f"\n\n{tool_guide}"
+        return prefix
+
+    def prompt_version(self, agent_type: str) -> str:
+        """Version tag of everything that shapes an agent's answers; warmed answers must match it"""
+        return warmup.prompt_version(self.static_prefix(agent_type), Config.MODEL_STRONG, Config.TEMPERATURE,
+                                     Config.MAX_TOKENS)
+
+    def get_agent_response(self, message: str, agent_type: str, conversation_id: str = None,
+                           on_token: Optional[Callable[[str], None]] = None,
+                           use_prepared: bool = True, tier: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get response from specialized agent; ``on_token`` receives model output as it streams.
+
+        ``use_prepared=False`` skips the warm store and the knowledge base and asks the model.
+        ``tier`` ('fast' or 'strong') overrides the tiering policy's choice.
+        """
         # Get agent configuration
         agent_config = AGENT_CONFIGS.get(agent_type)
         if not agent_config:
             return {"success": False, "error": f"Unknown agent type: {agent_type}"}
 
         try:
-            # Build context with system prompt and conversation history
-            context = agent_config['system_prompt']
-
-            # Add conversation history for context
-            if conversation_id and conversation_id in self.conversation_history:
-                history = self.conversation_history[conversation_id]
-                for entry in history[-6:]:  # Keep last 6 exchanges for context
-                    context += f"\n\nPrevious User: {entry['user']}\nPrevious Assistant: {entry['assistant']}"
-
-            # Add current message
-            full_prompt = f"{context}\n\nCurrent User Question: {message}\n\nAssistant Response:"
-
-            # Generate response
-            response = self.model.generate_content(full_prompt)
-
-            if response and response.text:
-                # Store conversation history
-                if not conversation_id:
-                    conversation_id = f"{agent_type}_{datetime.now().timestamp()}"
-
-                if conversation_id not in self.conversation_history:
-                    self.conversation_history[conversation_id] = []
-
-                self.conversation_history[conversation_id].append({
-                    "user": message,
-                    "assistant": response.text,
-                    "timestamp": datetime.now().isoformat(),
-                    "agent": agent_type
-                })
-
-                # Keep only recent history (last 50 exchanges)
-                if len(self.conversation_history[conversation_id]) > 50:
-                    self.conversation_history[conversation_id] = self.conversation_history[conversation_id][-50:]
-
-                return {
-                    "success": True,
-                    "message": response.text,
-                    "agent": agent_config['name'],
-                    "conversation_id": conversation_id,
-                    "timestamp": datetime.now().isoformat()
-                }
+            # Numeric questions recognised locally are computed before any upstream call
+            with stage('tools', agent_type):
+                tool_calls = self.tools.execute(engineering_tools.pre_parse(message, agent_type), agent_type)
+            tools_succeeded = tool_calls and all('error' not in call for call in tool_calls)
+            if tools_succeeded and not engineering_tools.needs_prose(message):
+                answer = f"Computed results:\n{engineering_tools.format_results(tool_calls)}"
+                return self._build_response(message, answer, agent_type, conversation_id,
+                                            tool_calls=tool_calls, source="tools")
+
+            # Quick topics answered ahead of time by the model; warmed answers have no history
+            first_turn = not self.conversation_history.get(conversation_id)
+            if use_prepared and first_turn:
+                warmed = self.warm_store.get(agent_type, message)
+                instrumentation.record_cache('warm', warmed is not None)
+                if warmed:
+                    return self._warm_response(message, warmed, agent_type, conversation_id)
+
+            # High-confidence matches against the curated knowledge base skip the model entirely
+            if use_prepared:
+                with stage('knowledge', agent_type):
+                    hit = self.knowledge.instant_answer(agent_type, message)
+                instrumentation.record_cache('knowledge', hit is not None)
+                if hit:
+                    return self._knowledge_response(message, hit, agent_type, conversation_id, tool_calls)
+
+            if not self.model:
+                return self._fallback(message, agent_type, conversation_id, tool_calls, 'model_unavailable',
+                                      {"success": False, "error": "AI model not initialized"})
+
+            with stage('retrieval', agent_type):
+                passages = self.retriever.retrieve(agent_type, self._retrieval_queries(message, conversation_id))
+
+            # Short, definitional or well-covered questions go to the fast tier with a predicted budget
+            decision = None
+            if self.tiers:
+                coverage = self.knowledge.search(agent_type, message, limit=1)
+                decision = self.tiers.choose(agent_type, message,
+                                             history_depth=len(self.conversation_history.get(conversation_id) or ()),
+                                             confidence=coverage[0]['coverage'] if coverage else 0.0, force=tier)
+
+            with stage('prompt_build', agent_type):
+                # The static prefix can be registered upstream once; a changed prompt gets a new handle
+                prefix = self.static_prefix(agent_type)
+
+                # Everything after it changes per request: references, history, results and the question
+                context = ""
+                if passages:
+                    context += ("\n\nREFERENCE DATA (prefer these values over recall and cite them as [n]):\n"
+                                f"{vector_index.format_passages(passages)}")
+
+                # Add conversation history for context
+                if conversation_id and conversation_id in self.conversation_history:
+                    history = self.conversation_history[conversation_id]
+                    for entry in history[-6:]:  # Keep last 6 exchanges for context
+                        context += f"\n\nPrevious User: {entry['user']}\nPrevious Assistant: {entry['assistant']}"
+
+                if tool_calls:
+                    context += ("\n\nCOMPUTED RESULTS (use these exact values):\n"
+                                f"{engineering_tools.format_results(tool_calls)}")
+
+                # Add current message
+                delta = f"{context}\n\nCurrent User Question: {message}\n\nAssistant Response:"
+
+            # Generate response; a slow or failing upstream falls back to the knowledge base
+            try:
+                text = self._generate_with_timeout(prefix, delta, agent_type, on_token, decision)
+            except FutureTimeout:
+                logger.warning("Upstream call for %s exceeded %ss", agent_type, Config.UPSTREAM_TIMEOUT)
+                return self._fallback(message, agent_type, conversation_id, tool_calls, 'upstream_timeout',
+                                      {"success": False, "error": "Upstream model timed out"})
+            except Exception as e:
+                logger.error("Upstream call failed for %s: %s", agent_type, e)
+                return self._fallback(message, agent_type, conversation_id, tool_calls, 'upstream_error',
+                                      {"success": False, "error": f"Failed to generate response: {str(e)}"})
+
+            # One round of model-requested tool calls, then a final answer with the results
+            requested = engineering_tools.parse_model_tool_calls(text)
+            if requested:
+                results = self.tools.execute(requested, agent_type)
+                tool_calls = tool_calls + results
+                follow_up = (f"{delta} {text}\n\nTOOL RESULTS:\n{engineering_tools.format_results(results)}"
+                             "\n\nUsing these results, give the final answer without further tool calls."
+                             "\n\nAssistant Response:")
+                text = self._generate(prefix, follow_up, agent_type, on_token, decision)
+
+            if text:
+                result = self._build_response(message, text, agent_type, conversation_id, tool_calls=tool_calls)
+                if passages:
+                    result["references"] = [{key: p[key] for key in ('title', 'source', 'score')} for p in passages]
+                if decision:
+                    result["model_tier"] = decision.to_dict()
+                return result
             else:
                 return {"success": False, "error": "No response generated"}
 
         except Exception as e:
-            logger.error(f"Error generating response for {agent_type}: {e}")
+            logger.error("Error generating response for %s: %s", agent_type, e)
             return {"success": False, "error": f"Failed to generate response: {str(e)}"}
 
+    def warm_answer(self, agent_type: str, question: str) -> Optional[Dict[str, Any]]:
+        """A fresh model answer to a quick topic for the warm store, leaving no conversation behind"""
+        conversation_id = f"warmup_{uuid.uuid4().hex[:12]}"
+        # Nobody waits for these, so they come from the strong tier
+        result = self.get_agent_response(question, agent_type, conversation_id, use_prepared=False, tier='strong')
+        self.conversation_history.pop(conversation_id, None)
+        if not result.get('success') or result.get('source') != 'model':
+            return None
+        return {key: result[key] for key in ('message', 'tool_calls', 'references') if key in result}
+
+    def _warm_response(self, message: str, warmed: Dict[str, Any], agent_type: str,
+                       conversation_id: str = None) -> Dict[str, Any]:
+        answer = warmed['result']
+        result = self._build_response(message, answer['message'], agent_type, conversation_id,
+                                      tool_calls=answer.get('tool_calls'), source="warm")
+        if answer.get('references'):
+            result["references"] = answer['references']
+        result["warm"] = {"version": warmed['version'], "age_s": round(time.time() - warmed['warmed_at'], 1)}
+        return result
+
+    def _retrieval_queries(self, message: str, conversation_id: str = None) -> List[str]:
+        """The question, plus the question joined to the previous one so follow-ups keep their subject"""
+        queries = [message]
+        history = self.conversation_history.get(conversation_id) if conversation_id else None
+        if history:
+            queries.append(f"{history[-1]['user']} {message}")
+        return queries
+
+    def _generate_with_timeout(self, prefix: str, delta: str, agent_type: str,
+                               on_token: Optional[Callable[[str], None]] = None,
+                               decision: Optional[model_tiers.Decision] = None) -> str:
+        """Run _generate on the upstream pool, raising FutureTimeout after UPSTREAM_TIMEOUT seconds"""
+        # The worker runs in a copy of this context so spans and log records keep the request's ids
+        future = self.upstream.submit(contextvars.copy_context().run, self._generate, prefix, delta, agent_type,
+                                      on_token, decision)
+        return future.result(timeout=Config.UPSTREAM_TIMEOUT)
+
+    def _knowledge_response(self, message: str, hit: Dict[str, Any], agent_type: str, conversation_id: str = None,
+                            tool_calls: List[Dict[str, Any]] = None, fallback_reason: str = None) -> Dict[str, Any]:
+        """Answer from a knowledge-base entry, keeping any locally computed results"""
+        text = hit['answer']
+        if tool_calls:
+            text = f"Computed results:\n{engineering_tools.format_results(tool_calls)}\n\n{text}"
+        result = self._build_response(message, text, agent_type, conversation_id,
+                                      tool_calls=tool_calls, source="knowledge")
+        result["knowledge"] = {key: hit[key] for key in ('id', 'title', 'score', 'coverage')}
+        if fallback_reason:
+            result["fallback_reason"] = fallback_reason
+        return result
+
+    def _fallback(self, message: str, agent_type: str, conversation_id: str, tool_calls: List[Dict[str, Any]],
+                  reason: str, error: Dict[str, Any]) -> Dict[str, Any]:
+        """Best knowledge-base answer when the model cannot answer, else the original error"""
+        hit = self.knowledge.fallback_answer(agent_type, message)
+        instrumentation.record_cache('knowledge_fallback', hit is not None)
+        if not hit:
+            return error
+        return self._knowledge_response(message, hit, agent_type, conversation_id, tool_calls, fallback_reason=reason)
+
+    def _generate(self, prefix: str, delta: str, agent_type: str,
+                  on_token: Optional[Callable[[str], None]] = None,
+                  decision: Optional[model_tiers.Decision] = None) -> str:
+        """Ask the decided tier; a fast answer that fails, comes back empty or hits its budget goes to the strong tier"""
+        if decision is None or decision.tier is not self.tiers.fast:
+            return self._ask(prefix, delta, agent_type, on_token, decision)[0]
+        streamed = []
+
+        def forward(text: str):
+            streamed.append(text)
+            on_token(text)
+
+        try:
+            text, response = self._ask(prefix, delta, agent_type, forward if on_token else None, decision)
+            reason = self.tiers.escalation(decision, text, response)
+        except Exception as e:
+            if streamed:
+                raise
+            logger.warning("Fast tier failed for %s; asking the strong tier: %s", agent_type, e)
+            text, reason = '', 'error'
+        if reason is None:
+            return text
+        strong = self.tiers.escalate(agent_type, decision, reason)
+        if reason == 'truncated':
+            # Continue the cut-off answer rather than restart it, so streamed text stays in place
+            continuation = (f"{delta} {text}\n\nThe answer above was cut off. Continue it from exactly where "
+                            "it stops, without repeating any of it.\n\nContinuation:")
+            return text + (self._ask(prefix, continuation, agent_type, on_token, strong)[0] or '')
+        return self._ask(prefix, delta, agent_type, on_token, strong)[0]
+
+    def _ask(self, prefix: str, delta: str, agent_type: str, on_token: Optional[Callable[[str], None]] = None,
+             decision: Optional[model_tiers.Decision] = None):
+        """(text, response) from one tier, with only the delta when its prefix has a handle"""
+        model, prefixes = (decision.tier.model, decision.tier.prefixes) if decision else (self.model, self.prefixes)
+        handle = prefixes.handle(agent_type, prefix) if prefixes else None
+        if handle:
+            streamed = []
+
+            def forward(text: str):
+                streamed.append(text)
+                on_token(text)
+
+            try:
+                return self._call(handle.model, delta.lstrip(), agent_type, forward if on_token else None, handle,
+                                  prefixes, decision)
+            except Exception as e:
+                if streamed:
+                    raise
+                # A rejected handle costs one retry; later calls send the prefix inline
+                prefixes.disable(handle, e)
+        return self._call(model, prefix + delta, agent_type, on_token, None, prefixes, decision)
+
+    def _call(self, model, prompt: str, agent_type: str, on_token: Optional[Callable[[str], None]] = None,
+              handle: Optional[prompt_prefix.PrefixHandle] = None,
+              prefixes: Optional[prompt_prefix.PrefixRegistry] = None,
+              decision: Optional[model_tiers.Decision] = None):
+        """Call the upstream model, recording latency and token usage; returns (text, response)"""
+        # The tier's output budget is set per call; without tiering the model's own config applies
+        options = {'generation_config': {'max_output_tokens': decision.budget}} if decision else {}
+        started = time.perf_counter()
+        with stage('upstream_call', agent_type):
+            if on_token is None:
+                response = model.generate_content(prompt, **options)
+            else:
+                # Streamed chunks are forwarded as they arrive, minus any TOOL_CALL lines
+                response = model.generate_content(prompt, stream=True, **options)
+                forward = engineering_tools.ToolCallFilter(on_token)
+                for chunk in response:
+                    forward.feed(chunk.text or '')
+                forward.flush()
+        seconds = time.perf_counter() - started
+        text = response.text if response else None
+        instrumentation.record_tokens(agent_type, response, prompt, text or '')
+        if prefixes:
+            prefixes.record(agent_type, handle, response, seconds)
+        if decision:
+            self.tiers.record(agent_type, decision, response, prompt, text or '', seconds)
+        return text, response
+
+    def _build_response(self, message: str, text: str, agent_type: str, conversation_id: str = None,
+                        tool_calls: List[Dict[str, Any]] = None, source: str = "model") -> Dict[str, Any]:
+        """Store the exchange in conversation history and build the API response"""
+        with tracing.span('history'):
+            # Store conversation history
+            if not conversation_id:
+                conversation_id = f"{agent_type}_{datetime.now().timestamp()}"
+
+            if conversation_id not in self.conversation_history:
+                self.conversation_history[conversation_id] = []
+
+            self.conversation_history[conversation_id].append({
+                "user": message,
+                "assistant": text,
+                "timestamp": datetime.now().isoformat(),
+                "agent": agent_type
+            })
+
+            # Keep only recent history (last 50 exchanges)
+            if len(self.conversation_history[conversation_id]) > 50:
+                self.conversation_history[conversation_id] = self.conversation_history[conversation_id][-50:]
+
+        result = {
+            "success": True,
+            "message": text,
+            "agent": AGENT_CONFIGS[agent_type]['name'],
+            "conversation_id": conversation_id,
+            "timestamp": datetime.now().isoformat(),
+            "source": source
+        }
+        if tool_calls:
+            result["tool_calls"] = tool_calls
+        return result
+
 # Initialize AI handler
 ai_handler = BytEdgeAI()
 
+# Background simulation jobs run in worker processes, off the request threads
+job_queue = JobQueue(max_workers=Config.JOB_WORKERS, result_ttl_s=Config.JOB_RESULT_TTL,
+                     default_timeout_s=Config.JOB_TIMEOUT)
+# Referenced by name so the simulation modules (SciPy for frames) load in the workers, not at startup
+job_queue.register('battery', 'battery_sim:simulate_from_request')
+job_queue.register('tire', 'tire_model:evaluate_from_request')
+job_queue.register('tire_fit', 'tire_model:fit_from_request')
+job_queue.register('frame', 'frame_fe:analyze_from_request')
+
+# Live gauges sampled when /api/metrics is scraped
+instrumentation.registry.gauge(
+    'job_queue_depth',
+    lambda: {(('state', state),): count for state, count in job_queue.depth().items()},
+    'Simulation jobs by state'
+)
+instrumentation.registry.gauge(
+    'conversations',
+    lambda: {(): len(ai_handler.conversation_history)},
+    'Conversations held in memory'
+)
+instrumentation.registry.gauge(
+    'knowledge_entries',
+    lambda: {(('agent', agent),): count for agent, count in ai_handler.knowledge.sizes().items()},
+    'Curated knowledge-base entries per agent'
+)
+instrumentation.registry.gauge(
+    'reference_chunks',
+    lambda: {(('agent', agent),): count for agent, count in ai_handler.retriever.sizes().items()},
+    'Reference chunks in the memory-mapped vector index per agent'
+)
+
+# Speculative answers started by the router before the user opens an agent page
+def answer_speculatively(message: str, agent_type: str, conversation_id: str) -> Dict[str, Any]:
+    with tracer.trace('speculate', agent=agent_type):
+        return ai_handler.get_agent_response(message, agent_type, conversation_id)
+
+def discard_handoff(entry: handoff.Handoff):
+    """Forget the conversation an unused or failed speculative answer started"""
+    ai_handler.conversation_history.pop(entry.conversation_id, None)
+
+handoffs = handoff.HandoffStore(answer_speculatively, ttl_s=Config.SPECULATE_TTL,
+                                budget_per_minute=Config.SPECULATE_BUDGET,
+                                max_pending=Config.SPECULATE_MAX_PENDING, on_discard=discard_handoff)
+instrumentation.registry.gauge(
+    'handoff_entries',
+    lambda: {(): handoffs.size()},
+    'Speculative answers waiting to be claimed'
+)
+
+# Quick topics are answered at startup and refreshed while idle; user requests always go first
+warmup_scheduler = warmup.WarmupScheduler(
+    ai_handler.warm_store,
+    {agent_type: [question for _, question in config['quick_topics']] for agent_type, config in AGENT_CONFIGS.items()},
+    ai_handler.warm_answer,
+    budget_per_minute=Config.WARMUP_BUDGET,
+    idle_s=Config.WARMUP_IDLE_S,
+    refresh_s=Config.WARMUP_REFRESH_S
+)
+instrumentation.registry.gauge(
+    'warm_answers',
+    lambda: {(('agent', agent),): count for agent, count in ai_handler.warm_store.sizes().items()},
+    'Warmed quick-topic answers per agent'
+)
+
+# Memory instrumentation: structure sizes, RSS/GC gauges and tracemalloc diffs
+memory = memory_monitor.MemoryMonitor(interval_s=Config.MEMORY_SAMPLE_INTERVAL,
+                                      trace_allocations=Config.TRACEMALLOC, frames=Config.TRACEMALLOC_FRAMES)
+memory.track('conversation_history', lambda: ai_handler.conversation_history)
+memory.track('job_store', lambda: job_queue.jobs)
+memory.track('slow_traces', lambda: tracer.slow_traces)
+memory.register_metrics(instrumentation.registry)
+
 def init_gemini():
     """Initialize Google Gemini AI with API key"""
     if not Config.GEMINI_API_KEY:
@@ -252,142 +597,212 @@ def init_gemini():
         return False
 
     try:
-        genai.configure(api_key=Config.GEMINI_API_KEY)
+        # Imported only once a key is configured: the SDK alone takes longer to load than the rest of startup
+        import google.generativeai as genai
+        # One client per process, kept alive and shared by every agent model and prefix handle
+        genai.configure(api_key=Config.GEMINI_API_KEY, transport=Config.GEMINI_TRANSPORT)
         logger.info("Gemini AI configured successfully")
         return True
     except Exception as e:
-        logger.error(f"Failed to configure Gemini AI: {e}")
+        logger.error("Failed to configure Gemini AI: %s", e)
         return False
 
-# Initialize the home page HTML template
-HOME_PAGE_HTML = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>BytEdge AI Agents</title>
-    <style>
-        body {{
-            font-family: 'Inter', sans-serif;
-            background: linear-gradient(135deg, rgba(10,10,15,1) 0%, rgba(26,26,46,1) 50%, rgba(22,33,62,1) 100%);
-            color: white;
-            margin: 0;
-            padding: 2rem;
-            min-height: 100vh;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            text-align: center;
-        }}
-        .header {{
-            margin-bottom: 3rem;
-        }}
-        .header h1 {{
-            font-size: 3rem;
-            font-weight: 700;
-            background: linear-gradient(45deg, rgba(100,255,218,1), rgba(0,188,212,1), rgba(33,150,243,1));
-            background-clip: text;
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 1rem;
-        }}
-        .header p {{
-            font-size: 1.2rem;
-            color: rgba(184,193,236,1);
-            opacity: 0.9;
-        }}
-        .agents-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 2rem;
-            margin-top: 3rem;
-        }}
-        .agent-card {{
-            background: rgba(255, 255, 255, 0.05);
-            backdrop-filter: blur(20px);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: 16px;
-            padding: 2rem;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            color: inherit;
-            display: block;
-        }}
-        .agent-card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
-            border-color: rgba(100, 255, 218, 0.3);
-        }}
-        .agent-avatar {{
-            font-size: 3rem;
-            margin-bottom: 1rem;
-        }}
-        .agent-name {{
-            font-size: 1.5rem;
-            font-weight: 600;
-            margin-bottom: 0.5rem;
-        }}
-        .agent-description {{
-            color: rgba(184,193,236,1);
-            line-height: 1.6;
-        }}
-        .status {{
-            margin-top: 2rem;
-            font-size: 0.9rem;
-            opacity: 0.7;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>BytEdge AI Agents</h1>
-            <p>Specialized Conversational AI for Automotive Engineering</p>
-        </div>
-
-        <div class="agents-grid">
-            <a href="/clutch-edge.html" class="agent-card">
-                <div class="agent-avatar">⚙️</div>
-                <div class="agent-name">ClutchEdge AI</div>
-                <div class="agent-description">Advanced clutch and drivetrain engineering assistant</div>
-            </a>
-
-            <a href="/battery-edge.html" class="agent-card">
-                <div class="agent-avatar">🔋</div>
-                <div class="agent-name">BatteryEdge AI</div>
-                <div class="agent-description">EV battery and energy systems specialist</div>
-            </a>
-
-            <a href="/frame-edge.html" class="agent-card">
-                <div class="agent-avatar">🏗️</div>
-                <div class="agent-name">FrameEdge AI</div>
-                <div class="agent-description">Chassis and structural engineering expert</div>
-            </a>
-
-            <a href="/tire-edge.html" class="agent-card">
-                <div class="agent-avatar">🛞</div>
-                <div class="agent-name">TireEdge AI</div>
-                <div class="agent-description">Tire dynamics and performance specialist</div>
-            </a>
-        </div>
-
-        <div class="status">
-            <p>🚗 BytEdge Automotive AI - Powered by Google Gemini</p>
-        </div>
-    </div>
-</body>
-</html>"""
+# Conversation sharding: each conversation's history lives on the node its id hashes to
+shards = sharding.ShardRouter(Config.SHARD_SELF or f"http://{Config.HOST}:{Config.PORT}", Config.SHARD_NODES,
+                              vnodes=Config.SHARD_VNODES, mode=Config.SHARD_MODE, secret=Config.SHARD_SECRET,
+                              timeout_s=Config.UPSTREAM_TIMEOUT + 5)
+
+def route_to_owner():
+    """Forward or redirect a chat turn whose conversation another node owns; None to answer it here"""
+    if not shards.enabled:
+        return None
+    # Only a peer holding the shard secret may stop a turn from being routed; clients can send the header too
+    if request.headers.get(sharding.FORWARDED_HEADER) and shards.authorized(request.headers.get(sharding.TOKEN_HEADER)):
+        return None
+    data = request.get_json(silent=True) or {}
+    conversation_id = data.get('conversation_id')
+    if not isinstance(conversation_id, str) or shards.is_local(conversation_id):
+        if conversation_id:
+            sharding.SHARD_REQUESTS.inc(decision='local')
+        return None
+    owner = shards.owner(conversation_id)
+    if shards.mode == 'redirect':
+        sharding.SHARD_REQUESTS.inc(decision='redirected')
+        return Response(status=307, headers={'Location': shards.redirect_url(owner, request.full_path.rstrip('?'))})
+    try:
+        status, content_type, body = shards.forward(owner, request.full_path.rstrip('?'), request.get_data(),
+                                                    g.get('request_id'))
+    except OSError as e:
+        # An unreachable owner should not fail the turn; it is answered here without its history
+        logger.error("Forwarding conversation to %s failed: %s", owner, e)
+        sharding.SHARD_REQUESTS.inc(decision='forward_failed')
+        return None
+    sharding.SHARD_REQUESTS.inc(decision='forwarded')
+    return Response(body, status=status, content_type=content_type)
+
+def forward_turn(message: str, agent_type: str, conversation_id: str, request_id: str) -> Dict[str, Any]:
+    """Answer a WebSocket turn on the node that owns its conversation"""
+    owner = shards.owner(conversation_id)
+    body = json.dumps({'message': message, 'conversation_id': conversation_id}).encode()
+    try:
+        _, _, data = shards.forward(owner, f"/api/chat/{agent_type}", body, request_id)
+    except OSError as e:
+        logger.error("Forwarding conversation to %s failed: %s", owner, e)
+        sharding.SHARD_REQUESTS.inc(decision='forward_failed')
+        return ai_handler.get_agent_response(message, agent_type, conversation_id)
+    sharding.SHARD_REQUESTS.inc(decision='forwarded')
+    return json.loads(data)
+
+def adopt_moved_conversation(conversation_id: Optional[str]):
+    """Pull a conversation's history from its previous owner if a membership change moved it here"""
+    if shards.previous is not None and conversation_id and conversation_id not in ai_handler.conversation_history:
+        history = shards.pull(conversation_id)
+        if history:
+            ai_handler.conversation_history.setdefault(conversation_id, history)
+
+@app.route('/api/shard/conversations', methods=['POST'])
+def receive_conversations():
+    """Accept conversations handed off by a node that no longer owns them"""
+    if not shards.authorized(request.headers.get(sharding.TOKEN_HEADER)):
+        return jsonify({"success": False, "error": "Shard token required"}), 403
+    conversations = (request.get_json(silent=True) or {}).get('conversations') or {}
+    for conversation_id, history in conversations.items():
+        # Turns answered here before the handoff arrived stay after the handed-off ones
+        current = ai_handler.conversation_history.get(conversation_id, [])
+        ai_handler.conversation_history[conversation_id] = (history + current)[-50:]
+    sharding.SHARD_MOVES.inc(len(conversations), direction='received')
+    return jsonify({"success": True, "received": len(conversations)})
+
+@app.route('/api/shard/release/<conversation_id>', methods=['POST'])
+def release_conversation(conversation_id):
+    """Give up a conversation to the node that now owns it"""
+    if not shards.authorized(request.headers.get(sharding.TOKEN_HEADER)):
+        return jsonify({"success": False, "error": "Shard token required"}), 403
+    history = ai_handler.conversation_history.pop(conversation_id, None)
+    if history is None:
+        return jsonify({"success": False, "error": "Conversation not held here"}), 404
+    return jsonify({"success": True, "history": history})
+
+@app.route('/api/shard/members', methods=['POST'])
+def set_shard_members():
+    """Change ring membership here (and on every other old or new node), then hand off moved conversations"""
+    if not shards.authorized(request.headers.get(sharding.TOKEN_HEADER)):
+        return jsonify({"success": False, "error": "Shard token required"}), 403
+    data = request.get_json(silent=True) or {}
+    nodes = [node.rstrip('/') for node in data.get('nodes') or [] if isinstance(node, str)]
+    if not nodes:
+        return jsonify({"success": False, "error": "nodes is required"}), 400
+    peers = sorted((set(shards.ring.nodes) | set(nodes)) - {shards.self_node})
+    added, removed = shards.set_members(nodes)
+    if data.get('propagate', True):
+        for peer in peers:
+            try:
+                shards.call(peer, 'POST', '/api/shard/members', {'nodes': nodes, 'propagate': False})
+            except OSError as e:
+                logger.error("Could not update shard membership on %s: %s", peer, e)
+    sent = shards.rebalance(ai_handler.conversation_history)
+    return jsonify({"success": True, "added": added, "removed": removed, "sent": sent,
+                    "conversations": len(ai_handler.conversation_history)})
+
+# Per-process state: threads and the upstream client cannot cross a fork, so each worker starts its own
+_import_pid = os.getpid()
+_worker_pid = None
+_worker_lock = threading.Lock()
+
+def init_worker() -> bool:
+    """
+    Start this process's log writer, memory monitor, upstream client, model and warmup, once per pid.
+
+    Everything set up at import (configs, pages, knowledge and reference indexes) is read-only, so a
+    gunicorn master that preloads the app shares it copy-on-write with every forked worker.
+    A model that is already set (a stand-in) is kept. Returns whether the model is available.
+    """
+    global _worker_pid, log_listener
+    with _worker_lock:
+        if _worker_pid == os.getpid():
+            return ai_handler.model is not None
+        _worker_pid = os.getpid()
+        if _worker_pid != _import_pid:
+            log_listener = structured_logging.restart_after_fork(log_listener)
+        memory.start()
+        ready = ai_handler.model is not None or (init_gemini() and ai_handler.initialize_model())
+        if ready and Config.WARMUP:
+            warmup_scheduler.start()
+        logger.info("Worker %s initialized (model %s)", _worker_pid, 'ready' if ready else 'unavailable')
+        return ready
+
+def shutdown_worker():
+    """Stop background work when a worker exits; in-flight requests have already finished"""
+    warmup_scheduler.stop()
+    memory.stop()
+    for pool in (handoffs, gateway, ai_handler.tools):
+        pool.shutdown()
+    ai_handler.upstream.shutdown(wait=False)
+
+def create_app(init: bool = True) -> Flask:
+    """
+    WSGI application factory: ``gunicorn -c gunicorn.conf.py`` or ``gunicorn 'agent-server:create_app()'``.
+
+    ``init=False`` leaves per-process setup to the gunicorn post_fork hook, for a master that
+    preloads the app before forking workers. Any other server initializes on the first request.
+    """
+    if init:
+        init_worker()
+    return app
+
+@app.before_request
+def ensure_worker():
+    if _worker_pid != os.getpid():
+        init_worker()
+
+# Request ids and access timings for the structured log
+@app.before_request
+def bind_request_id():
+    g.request_started = time.perf_counter()
+    g.request_id = request.headers.get('X-Request-Id') or uuid.uuid4().hex[:16]
+    structured_logging.bind_request(g.request_id)
+
+@app.after_request
+def log_request(response):
+    started = g.get('request_started')
+    if started is not None:
+        duration_ms = round((time.perf_counter() - started) * 1000.0, 3)
+        access_logger.info("%s %s %s", request.method, request.path, response.status_code,
+                           extra={'method': request.method, 'path': request.path,
+                                  'status': response.status_code, 'duration_ms': duration_ms})
+        response.headers['X-Request-Id'] = g.request_id
+    return response
+
+@app.teardown_request
+def unbind_request_id(error=None):
+    structured_logging.bind_request(None)
+
+# Pages generated from AGENT_CONFIGS plus the shared stylesheet and scripts, minified,
+# precompressed and fingerprinted once and held in memory
+STATIC_ROOT = os.path.dirname(os.path.abspath(__file__))
+assets = static_assets.AssetPipeline(STATIC_ROOT)
+assets.build(page_builder.render_pages(AGENT_CONFIGS))
+STATIC_BYTES = instrumentation.registry.counter('static_bytes_total', 'Static asset body bytes sent by encoding')
+
+def serve_asset(path):
+    """Serve an in-memory asset with content negotiation and ETag revalidation"""
+    asset = assets.lookup(path)
+    status, body, headers = assets.negotiate(asset, path, request.headers.get('Accept-Encoding', ''),
+                                             request.headers.get('If-None-Match', ''))
+    STATIC_BYTES.inc(len(body or b''), encoding=headers.get('Content-Encoding', 'identity'), status=str(status))
+    return Response(body, status=status, headers=headers)
 
 # Routes for serving static files
 @app.route('/')
 def index():
     """Serve agent selection page"""
-    return HOME_PAGE_HTML
+    return serve_asset('index.html')
 
 @app.route('/<path:filename>')
 def static_files(filename):
     """Serve static files"""
+    if assets.lookup(filename):
+        return serve_asset(filename)
     return send_from_directory('.', filename)
 
 # API Routes
@@ -401,6 +816,12 @@ def health_check():
         "available_agents": list(AGENT_CONFIGS.keys())
     })
 
+@app.route('/api/metrics')
+def metrics():
+    """Prometheus text exposition of runtime metrics"""
+    return Response(instrumentation.registry.render_prometheus(),
+                    mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/agents')
 def get_agents():
     """Get available agents information"""
@@ -416,41 +837,267 @@ def get_agents():
 @app.route('/api/chat/<agent_type>', methods=['POST'])
 def chat_with_agent(agent_type):
     """Chat with specific agent"""
+    routed = route_to_owner()
+    if routed is not None:
+        return routed
+    with warmup_scheduler.interactive(), tracer.trace('chat', agent=agent_type) as trace, profiler.maybe_profile():
+        response = _handle_chat(agent_type)
+        if trace is not None:
+            body, status = response if isinstance(response, tuple) else (response, 200)
+            body.headers['X-Trace-Id'] = trace.trace_id
+            return body, status
+        return response
+
+def _handle_chat(agent_type):
+    """Validate, answer and serialize one chat request"""
     try:
-        data = request.get_json()
+        with stage('route', agent_type):
+            data = request.get_json()
 
-        if not data or 'message' not in data:
-            return jsonify({"success": False, "error": "Message is required"}), 400
+            if not data or 'message' not in data:
+                instrumentation.REQUESTS.inc(agent=agent_type, status='bad_request')
+                return jsonify({"success": False, "error": "Message is required"}), 400
 
-        message = data['message'].strip()
-        conversation_id = data.get('conversation_id')
+            message = data['message'].strip()
+            conversation_id = data.get('conversation_id') or (shards.new_id(agent_type) if shards.enabled else None)
 
-        if not message:
-            return jsonify({"success": False, "error": "Message cannot be empty"}), 400
+            if not message:
+                instrumentation.REQUESTS.inc(agent=agent_type, status='bad_request')
+                return jsonify({"success": False, "error": "Message cannot be empty"}), 400
 
-        if agent_type not in AGENT_CONFIGS:
-            return jsonify({"success": False, "error": f"Unknown agent type: {agent_type}"}), 400
+            if agent_type not in AGENT_CONFIGS:
+                instrumentation.REQUESTS.inc(agent='unknown', status='bad_request')
+                return jsonify({"success": False, "error": f"Unknown agent type: {agent_type}"}), 400
 
-        logger.info(f"Processing chat request - Agent: {agent_type}, Message length: {len(message)}")
+        logger.info("Processing chat request - Agent: %s, Message length: %s", agent_type, len(message))
+        adopt_moved_conversation(conversation_id)
 
         # Get response from AI
         result = ai_handler.get_agent_response(message, agent_type, conversation_id)
+        trace_id = tracing.current_trace_id()
+        if trace_id:
+            result["trace_id"] = trace_id
+
+        with stage('serialization', agent_type):
+            body = jsonify(result)
 
         if result["success"]:
-            logger.info(f"Successfully generated response for {agent_type}")
-            return jsonify(result)
+            instrumentation.REQUESTS.inc(agent=agent_type, status='ok')
+            logger.info("Successfully generated response for %s", agent_type)
+            return body
         else:
-            logger.error(f"Failed to generate response: {result.get('error', 'Unknown error')}")
-            return jsonify(result), 500
+            instrumentation.REQUESTS.inc(agent=agent_type, status='error')
+            logger.error("Failed to generate response: %s", result.get('error', 'Unknown error'))
+            return body, 500
 
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}")
+        instrumentation.REQUESTS.inc(agent=agent_type, status='error')
+        logger.error("Error in chat endpoint: %s", e)
         return jsonify({
             "success": False,
             "error": "Internal server error",
             "message": "Please try again later"
         }), 500
 
+@app.route('/api/simulate/battery', methods=['POST'])
+def simulate_battery():
+    """Run a BatteryEdge pack electro-thermal simulation"""
+    try:
+        import battery_sim
+        params = request.get_json(silent=True) or {}
+        result = battery_sim.simulate_from_request(params)
+        logger.info("Battery simulation completed - Pack: %s", result['summary']['configuration'])
+        return jsonify({"success": True, "agent": AGENT_CONFIGS['battery']['name'], **result})
+    except (ValueError, TypeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error("Error in battery simulation endpoint: %s", e)
+        return jsonify({"success": False, "error": "Simulation failed"}), 500
+
+@app.route('/api/simulate/tire', methods=['POST'])
+def simulate_tire():
+    """Evaluate TireEdge Magic Formula force surfaces"""
+    try:
+        import tire_model
+        params = request.get_json(silent=True) or {}
+        result = tire_model.evaluate_from_request(params)
+        logger.info("Tire force surface evaluated - Mode: %s, Points: %s", result['mode'], result['points_evaluated'])
+        return jsonify({"success": True, "agent": AGENT_CONFIGS['tire']['name'], **result})
+    except (ValueError, TypeError, KeyError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error("Error in tire simulation endpoint: %s", e)
+        return jsonify({"success": False, "error": "Simulation failed"}), 500
+
+@app.route('/api/simulate/tire/fit', methods=['POST'])
+def fit_tire():
+    """Fit Magic Formula coefficients to measured tire data"""
+    import numpy as np
+    import tire_model
+    try:
+        params = request.get_json(silent=True) or {}
+        result = tire_model.fit_from_request(params)
+        logger.info("Tire coefficients fitted - Samples: %s, RMS: %.2f N", result['samples'], result['rms_error_n'])
+        return jsonify({"success": True, "agent": AGENT_CONFIGS['tire']['name'], **result})
+    except (ValueError, TypeError, KeyError, np.linalg.LinAlgError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error("Error in tire fitting endpoint: %s", e)
+        return jsonify({"success": False, "error": "Fitting failed"}), 500
+
+@app.route('/api/simulate/frame', methods=['POST'])
+def simulate_frame():
+    """Run FrameEdge beam FE static, modal and torsional-rigidity analyses"""
+    try:
+        import frame_fe
+        params = request.get_json(silent=True) or {}
+        result = frame_fe.analyze_from_request(params)
+        logger.info("Frame analysis completed - DOFs: %s", result['dofs'])
+        return jsonify({"success": True, "agent": AGENT_CONFIGS['frame']['name'], **result})
+    except (ValueError, TypeError, KeyError, IndexError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        logger.error("Error in frame analysis endpoint: %s", e)
+        return jsonify({"success": False, "error": "Analysis failed"}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a simulation job and return its id"""
+    try:
+        data = request.get_json(silent=True) or {}
+        submitted = job_queue.submit(
+            data.get('kind', ''),
+            data.get('params') or {},
+            priority=data.get('priority', 'interactive'),
+            timeout_s=data.get('timeout_s'),
+        )
+        job = submitted['job']
+        instrumentation.record_cache('job_dedup', submitted['deduplicated'])
+        logger.info("Job %s submitted - Kind: %s, Priority: %s", job.id, job.kind, job.priority)
+        return jsonify({
+            "success": True,
+            "job_id": job.id,
+            "status": job.status,
+            "deduplicated": submitted['deduplicated']
+        }), 202
+    except (ValueError, TypeError) as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def poll_job(job_id):
+    """Get job status, progress and result"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found or expired"}), 404
+    return jsonify({"success": True, **job.to_dict()})
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    if not job_queue.cancel(job_id):
+        return jsonify({"success": False, "error": "Job not found or already finished"}), 404
+    return jsonify({"success": True, "job_id": job_id, "status": "cancelling"})
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_job(job_id):
+    """Stream job progress as server-sent events until it finishes"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found or expired"}), 404
+
+    def events():
+        last = None
+        while True:
+            state = job.to_dict(include_result=False)
+            if state != last:
+                yield f"data: {json.dumps(state)}\n\n"
+                last = state
+            if job.status in TERMINAL_STATES:
+                yield f"event: done\ndata: {json.dumps(job.to_dict())}\n\n"
+                return
+            # Heartbeat comment keeps proxies from closing idle streams
+            if not job_queue.wait(job, timeout=15.0):
+                yield ": keep-alive\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/handoff', methods=['POST'])
+def start_handoff():
+    """Start a speculative answer for an agent page the user is likely to open next"""
+    data = request.get_json(silent=True) or {}
+    agent_type = data.get('agent')
+    message = (data.get('message') or '').strip()
+    if agent_type not in AGENT_CONFIGS or not message:
+        return jsonify({"success": False, "error": "A known agent and a message are required"}), 400
+
+    started = handoffs.start(agent_type, message, gateway.new_conversation_id(agent_type))
+    if 'rejected' in started:
+        return jsonify({"success": False, "error": "Speculation budget exhausted",
+                        "reason": started['rejected']}), 429
+    logger.info("Speculative answer started - Agent: %s", agent_type)
+    return jsonify({"success": True, **started,
+                    "url": f"/{agent_type}-edge.html?handoff={started['token']}"}), 202
+
+@app.route('/api/handoff/<token>')
+def claim_handoff(token):
+    """Claim a speculative answer once, waiting up to ?wait= seconds if it is still running"""
+    wait_s = min(max(request.args.get('wait', Config.UPSTREAM_TIMEOUT, type=float), 0.0), Config.UPSTREAM_TIMEOUT)
+    claimed = handoffs.claim(token, wait_s)
+    if claimed is None:
+        return jsonify({"success": False, "error": "Handoff not found, expired or already claimed"}), 404
+    if claimed.get('pending'):
+        return jsonify({"success": False, "pending": True, "agent": claimed['agent']}), 202
+    if claimed.get('failed'):
+        return jsonify({"success": False, "question": claimed['message'],
+                        "error": "The prepared answer failed; ask again"})
+    return jsonify({**claimed['result'], "question": claimed['message'], "handoff": True})
+
+# WebSocket transport: one connection multiplexes conversations with every agent
+def answer_ws_turn(message: str, agent_type: str, conversation_id: str, on_token) -> Dict[str, Any]:
+    """Answer one WebSocket chat frame with the same tracing, logging and metrics as the HTTP route"""
+    request_id = uuid.uuid4().hex[:16]
+    structured_logging.bind_request(request_id)
+    try:
+        with warmup_scheduler.interactive(), tracer.trace('chat', agent=agent_type, transport='websocket') as trace:
+            logger.info("Processing WebSocket chat - Agent: %s, Message length: %s", agent_type, len(message))
+            if not shards.is_local(conversation_id):
+                # Another node holds this conversation; its answer arrives whole instead of streamed
+                return forward_turn(message, agent_type, conversation_id, request_id)
+            adopt_moved_conversation(conversation_id)
+            result = ai_handler.get_agent_response(message, agent_type, conversation_id, on_token=on_token)
+            if trace is not None:
+                result["trace_id"] = trace.trace_id
+        instrumentation.REQUESTS.inc(agent=agent_type, status='ok' if result["success"] else 'error')
+        return result
+    finally:
+        structured_logging.bind_request(None)
+
+gateway = ws_gateway.Gateway(
+    answer_ws_turn,
+    AGENT_CONFIGS,
+    max_per_client=Config.WS_MAX_PER_CLIENT,
+    max_inflight=Config.WS_MAX_INFLIGHT,
+    max_conversations=Config.WS_MAX_CONVERSATIONS,
+    heartbeat_s=Config.WS_HEARTBEAT,
+    workers=Config.WS_WORKERS,
+    new_conversation_id=shards.new_id if shards.enabled else None
+)
+gateway.register_metrics(instrumentation.registry)
+
+if Sock is not None:
+    # Protocol pings close connections whose client stopped answering
+    app.config['SOCK_SERVER_OPTIONS'] = {'ping_interval': Config.WS_HEARTBEAT,
+                                         'max_message_size': Config.WS_MAX_MESSAGE_BYTES}
+    sock = Sock(app)
+
+    @sock.route('/api/ws')
+    def chat_socket(ws):
+        """Multiplexed chat over one WebSocket (see ws_gateway for the frame protocol)"""
+        gateway.serve(ws, request.remote_addr or 'unknown')
+else:
+    logger.warning("flask-sock is not installed; the WebSocket endpoint /api/ws is disabled")
+
 # Generic chat endpoint for backwards compatibility
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -460,19 +1107,108 @@ def chat():
         agent_type = data.get('agent', 'clutch')  # Default to clutch agent
         return chat_with_agent(agent_type)
     except Exception as e:
-        logger.error(f"Error in generic chat endpoint: {e}")
+        logger.error("Error in generic chat endpoint: %s", e)
         return jsonify({
             "success": False,
             "error": "Internal server error"
         }), 500
 
+# Admin routes (require the X-Admin-Token header to match ADMIN_TOKEN)
+def admin_denied():
+    """Return an error response unless the request carries the admin token"""
+    token = request.headers.get('X-Admin-Token', '')
+    if not Config.ADMIN_TOKEN:
+        return jsonify({"success": False, "error": "Admin endpoints are disabled (ADMIN_TOKEN not set)"}), 403
+    if not hmac.compare_digest(token, Config.ADMIN_TOKEN):
+        return jsonify({"success": False, "error": "Forbidden"}), 403
+    return None
+
+@app.route('/api/admin/traces')
+def slow_traces():
+    """Recent traces slower than SLOW_TRACE_MS"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    limit = request.args.get('limit', 20, type=int)
+    return jsonify({
+        "success": True,
+        "slow_threshold_ms": tracer.slow_threshold_ms,
+        "traces": tracer.recent_slow(limit)
+    })
+
+@app.route('/api/admin/profile', methods=['POST'])
+def profile():
+    """Profile the server for N seconds and return collapsed stacks for flamegraphs"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    data = request.get_json(silent=True) or {}
+    try:
+        result = profiler.run(
+            data.get('mode', 'sample'),
+            float(data.get('seconds', 10)),
+            interval_ms=float(data.get('interval_ms', 5)),
+            sample_rate=float(data.get('sample_rate', 1.0)),
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({"success": False, "error": str(e)}), 409
+    logger.info("Profiling session completed - Mode: %s, Seconds: %s", result['mode'], result['seconds'])
+    return jsonify({"success": True, **result})
+
+@app.route('/api/admin/warmup')
+def warmup_status():
+    """Warm-store coverage, age and prompt version per quick topic"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify({"success": True, **warmup_scheduler.status()})
+
+@app.route('/api/admin/prefixes')
+def prefix_status():
+    """Prompt-prefix handle, tokens saved and upstream latency with and without it, per agent"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    if ai_handler.prefixes is None:
+        return jsonify({"success": True, "enabled": False, "agents": {}})
+    return jsonify({"success": True, "enabled": True, **ai_handler.prefixes.status()})
+
+@app.route('/api/admin/tiers')
+def tier_status():
+    """Per-tier answers, escalation rate, latency, tokens per call and predicted output budget, per agent"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    if ai_handler.tiers is None:
+        return jsonify({"success": True, "enabled": False, "tiers": {}})
+    return jsonify({"success": True, "enabled": True, **ai_handler.tiers.status()})
+
+@app.route('/api/admin/shard')
+def shard_status():
+    """Ring membership, hash-space shares, local conversations and routing counts for this node"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify({"success": True, **shards.status(ai_handler.conversation_history)})
+
+@app.route('/api/admin/memory')
+def memory_report():
+    """RSS, GC statistics, structure sizes and top allocators since the last snapshot"""
+    denied = admin_denied()
+    if denied:
+        return denied
+    limit = request.args.get('limit', 25, type=int)
+    return jsonify({"success": True, **memory.report(limit)})
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Endpoint not found"}), 404
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"Internal server error: {error}")
+    logger.error("Internal server error: %s", error)
     return jsonify({"error": "Internal server error"}), 500
 
 def main():
@@ -480,18 +1216,15 @@ def main():
     print("🚗 BytEdge AI Agent Backend Starting...")
     print("=" * 60)
 
-    # Initialize Gemini AI
-    if not init_gemini():
+    # Initialize Gemini AI, the model and this process's background threads
+    if not init_worker():
         print("❌ Failed to initialize Gemini AI. Please check your API key.")
         print("Set your API key with: export GEMINI_API_KEY='your_key_here'")
         return
 
-    # Initialize AI model
-    if not ai_handler.initialize_model():
-        print("❌ Failed to initialize AI model.")
-        return
-
     print(f"✅ Gemini AI initialized successfully")
+    if Config.WARMUP:
+        print(f"🔥 Warming {sum(len(q) for q in warmup_scheduler.topics.values())} quick topics in the background")
     print(f"🌐 Server starting on http://{Config.HOST}:{Config.PORT}")
     print(f"📊 Debug mode: {Config.DEBUG}")
     print(f"🤖 Available agents: {', '.join(AGENT_CONFIGS.keys())}")
@@ -0,0 +1,301 @@
+"""
+BatteryEdge Pack Simulation Engine
+Vectorized Thevenin (1-RC) equivalent-circuit and lumped thermal model
+Integrates every cell of a pack at once over a drive-cycle current profile
+"""
+
+import numpy as np
+from typing import Dict, Any, Optional, Callable
+
+GAS_CONSTANT = 8.314  # J/(mol*K)
+KELVIN = 273.15
+
+# Nominal NMC cell parameters (21700-class cell)
+DEFAULT_CELL_PARAMS = {
+    'capacity_ah': 5.0,
+    'r0_ohm': 0.018,           # ohmic resistance at reference temperature
+    'r1_ohm': 0.012,           # polarization resistance
+    'c1_farad': 2400.0,        # polarization capacitance
+    'mass_kg': 0.07,
+    'cp_j_per_kg_k': 1100.0,
+    'h_a_w_per_k': 0.05,       # convective conductance to coolant / ambient
+    'r0_activation_j': 20000.0,  # Arrhenius activation energy for resistance
+    'v_min': 2.5,
+    'v_max': 4.2,
+}
+
+# Open-circuit voltage table (SOC -> V) for NMC chemistry
+OCV_SOC = np.array([0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 1.0])
+OCV_VOLTAGE = np.array([3.00, 3.30, 3.45, 3.56, 3.62, 3.67, 3.72, 3.79, 3.87, 3.95, 4.05, 4.11, 4.20])
+
+# Cycle-aging model (Ah-throughput with Arrhenius temperature acceleration)
+AGING_PARAMS = {
+    'pre_exponential': 31630.0,
+    'activation_j': 31500.0,
+    'throughput_exponent': 0.55,
+    'end_of_life_fade_pct': 20.0,
+}
+
+DRIVE_CYCLES = ('constant', 'pulse', 'urban', 'highway')
+
+
+def drive_cycle_current(name: str, duration_s: float, dt: float, peak_current: float) -> np.ndarray:
+    """Build a synthetic pack current profile (positive = discharge)"""
+    t = np.arange(0.0, duration_s, dt)
+    if name == 'constant':
+        return np.full(t.shape, peak_current)
+    if name == 'pulse':
+        # 10 s discharge pulses followed by 40 s rest
+        return np.where((t % 50.0) < 10.0, peak_current, 0.0)
+    if name == 'urban':
+        # Stop-and-go: accelerate, cruise, regenerate, idle over a 120 s period
+        phase = t % 120.0
+        current = np.zeros_like(t)
+        current[phase < 15.0] = peak_current
+        current[(phase >= 15.0) & (phase < 60.0)] = 0.3 * peak_current
+        current[(phase >= 60.0) & (phase < 75.0)] = -0.4 * peak_current
+        return current
+    if name == 'highway':
+        # Sustained cruise with slow load variation from grade and overtakes
+        return peak_current * (0.55 + 0.15 * np.sin(2 * np.pi * t / 300.0)
+                               + 0.1 * np.sin(2 * np.pi * t / 47.0))
+    raise ValueError(f"Unknown drive cycle: {name}. Available: {', '.join(DRIVE_CYCLES)}")
+
+
+class BatteryPackSimulator:
+    """Electro-thermal simulation of a series/parallel pack with cell-to-cell variation"""
+
+    def __init__(self, series: int = 96, parallel: int = 4, cell_params: Optional[Dict[str, float]] = None,
+                 variation: float = 0.03, ambient_c: float = 25.0, initial_soc: float = 0.9, seed: int = 0):
+        if series < 1 or parallel < 1:
+            raise ValueError("Pack must have at least one cell in series and in parallel")
+        if not 0.0 <= initial_soc <= 1.0:
+            raise ValueError("initial_soc must be between 0 and 1")
+
+        self.series = series
+        self.parallel = parallel
+        self.n_cells = series * parallel
+        self.params = dict(DEFAULT_CELL_PARAMS)
+        self.params.update(cell_params or {})
+        self.ambient_k = ambient_c + KELVIN
+        self.initial_soc = initial_soc
+
+        # Manufacturing spread in capacity and resistance, one value per cell
+        rng = np.random.default_rng(seed)
+
+        def spread():
+            return 1.0 + variation * rng.standard_normal(self.n_cells)
+
+        self.capacity_ah = self.params['capacity_ah'] * np.clip(spread(), 0.8, 1.2)
+        self.r0 = self.params['r0_ohm'] * np.clip(spread(), 0.7, 1.3)
+        self.r1 = self.params['r1_ohm'] * np.clip(spread(), 0.7, 1.3)
+        self.c1 = np.full(self.n_cells, self.params['c1_farad'])
+        self.heat_capacity = self.params['mass_kg'] * self.params['cp_j_per_kg_k']
+
+    def run(self, current: np.ndarray, dt: float = 1.0, record_cells: bool = False,
+            progress: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
+        """
+        Integrate the pack over a pack-level current profile sampled every dt seconds. Discharge stops
+        (the contactor opens and current is zero) after the first step that empties a cell or takes one
+        below v_min; ``cutoff_s`` is when that happened, or None
+        """
+        current = np.array(current, dtype=np.float64)
+        if current.ndim != 1 or current.size == 0:
+            raise ValueError("current must be a non-empty 1-D profile")
+        if dt <= 0:
+            raise ValueError("dt must be positive")
+
+        n_steps = current.size
+        n = self.n_cells
+        p = self.params
+        cell_current = current / self.parallel
+
+        soc = np.full(n, self.initial_soc)
+        v1 = np.zeros(n)
+        temp_k = np.full(n, self.ambient_k)
+        ah_throughput = np.zeros(n)
+        aging_rate_integral = np.zeros(n)
+
+        # Exact discretization of the RC branch: v1[k+1] = a*v1[k] + (1-a)*R1*I
+        rc_decay = np.exp(-dt / (self.r1 * self.c1))
+        rc_gain = self.r1 * (1.0 - rc_decay)
+        coulomb_scale = dt / (3600.0 * self.capacity_ah)
+        thermal_scale = dt / self.heat_capacity
+        inv_t_ref = 1.0 / (25.0 + KELVIN)
+        r0_ea = p['r0_activation_j'] / GAS_CONSTANT
+        aging_ea = AGING_PARAMS['activation_j'] / GAS_CONSTANT
+
+        pack_voltage = np.empty(n_steps)
+        min_cell_voltage = np.empty(n_steps)
+        max_temp_c = np.empty(n_steps)
+        mean_soc = np.empty(n_steps)
+        heat_w = np.empty(n_steps)
+        if record_cells:
+            cell_voltage_hist = np.empty((n_steps, n), dtype=np.float32)
+            cell_temp_hist = np.empty((n_steps, n), dtype=np.float32)
+            cell_soc_hist = np.empty((n_steps, n), dtype=np.float32)
+
+        cutoff_step = None
+        report_every = max(1, n_steps // 100)
+        for k in range(n_steps):
+            if progress and k % report_every == 0:
+                progress(k / n_steps)
+            if cutoff_step is not None and current[k] > 0:
+                current[k] = cell_current[k] = 0.0
+            i_cell = cell_current[k]
+            r0_t = self.r0 * np.exp(r0_ea * (1.0 / temp_k - inv_t_ref))
+
+            ocv = np.interp(soc, OCV_SOC, OCV_VOLTAGE)
+            v_terminal = ocv - i_cell * r0_t - v1
+
+            q_gen = i_cell * i_cell * r0_t + v1 * v1 / self.r1
+            temp_k += thermal_scale * (q_gen - p['h_a_w_per_k'] * (temp_k - self.ambient_k))
+
+            v1 = rc_decay * v1 + rc_gain * i_cell
+            soc = soc - i_cell * coulomb_scale
+            if cutoff_step is None and i_cell > 0 and (soc.min() <= 0.0 or v_terminal.min() < p['v_min']):
+                cutoff_step = k
+            soc = np.clip(soc, 0.0, 1.0)
+
+            ah_throughput += abs(i_cell) * dt / 3600.0
+            aging_rate_integral += np.exp(-aging_ea / temp_k) * abs(i_cell) * dt / 3600.0
+
+            # Series strings are summed per parallel group; parallel cells share the bus voltage
+            pack_voltage[k] = v_terminal.reshape(self.series, self.parallel).mean(axis=1).sum()
+            min_cell_voltage[k] = v_terminal.min()
+            max_temp_c[k] = temp_k.max() - KELVIN
+            mean_soc[k] = soc.mean()
+            heat_w[k] = q_gen.sum()
+            if record_cells:
+                cell_voltage_hist[k] = v_terminal
+                cell_temp_hist[k] = temp_k - KELVIN
+                cell_soc_hist[k] = soc
+
+        fade_pct = self._capacity_fade(ah_throughput, aging_rate_integral)
+        time_s = np.arange(n_steps) * dt
+
+        result = {
+            'time_s': time_s,
+            'pack_current_a': current,
+            'pack_voltage_v': pack_voltage,
+            'pack_power_kw': pack_voltage * current / 1000.0,
+            'min_cell_voltage_v': min_cell_voltage,
+            'max_cell_temp_c': max_temp_c,
+            'mean_soc': mean_soc,
+            'heat_generation_w': heat_w,
+            'final_soc': soc,
+            'final_temp_c': temp_k - KELVIN,
+            'ah_throughput': ah_throughput,
+            'capacity_fade_pct': fade_pct,
+            'dt': dt,
+            'cutoff_s': None if cutoff_step is None else float((cutoff_step + 1) * dt),
+        }
+        if record_cells:
+            result['cell_voltage_v'] = cell_voltage_hist
+            result['cell_temp_c'] = cell_temp_hist
+            result['cell_soc'] = cell_soc_hist
+        return result
+
+    def _capacity_fade(self, ah_throughput: np.ndarray, aging_rate_integral: np.ndarray) -> np.ndarray:
+        """Capacity fade in percent from Ah throughput weighted by cell temperature history"""
+        z = AGING_PARAMS['throughput_exponent']
+        safe_ah = np.maximum(ah_throughput, 1e-12)
+        # Effective Arrhenius factor is the throughput-weighted mean over the profile
+        effective_factor = aging_rate_integral / safe_ah
+        return AGING_PARAMS['pre_exponential'] * effective_factor * ah_throughput ** z
+
+    def estimate_cycle_life(self, result: Dict[str, Any]) -> Dict[str, float]:
+        """Extrapolate the number of repeats of the profile until end-of-life capacity fade"""
+        z = AGING_PARAMS['throughput_exponent']
+        fade = result['capacity_fade_pct']
+        worst = float(fade.max())
+        if worst <= 0.0:
+            return {'profile_repeats_to_eol': float('inf'), 'worst_cell_fade_pct': 0.0}
+        # fade scales as throughput^z, so repeats to EOL = (EOL / fade)^(1/z)
+        repeats = (AGING_PARAMS['end_of_life_fade_pct'] / worst) ** (1.0 / z)
+        return {
+            'profile_repeats_to_eol': float(repeats),
+            'worst_cell_fade_pct': worst,
+            'mean_cell_fade_pct': float(fade.mean()),
+        }
+
+
+def summarize(sim: BatteryPackSimulator, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Condense a simulation result into headline engineering numbers"""
+    dt = result['dt']
+    energy_kwh = float(np.sum(result['pack_power_kw']) * dt / 3600.0)
+    summary = {
+        'cells': sim.n_cells,
+        'configuration': f"{sim.series}s{sim.parallel}p",
+        'duration_s': float(result['time_s'][-1] + dt),
+        'energy_delivered_kwh': round(energy_kwh, 4),
+        'min_pack_voltage_v': round(float(result['pack_voltage_v'].min()), 3),
+        'max_pack_voltage_v': round(float(result['pack_voltage_v'].max()), 3),
+        'min_cell_voltage_v': round(float(result['min_cell_voltage_v'].min()), 4),
+        'peak_cell_temp_c': round(float(result['max_cell_temp_c'].max()), 3),
+        'final_mean_soc': round(float(result['final_soc'].mean()), 4),
+        'soc_spread': round(float(np.ptp(result['final_soc'])), 5),
+        'peak_heat_generation_w': round(float(result['heat_generation_w'].max()), 2),
+        'undervoltage': bool(result['min_cell_voltage_v'].min() < sim.params['v_min']),
+        'depleted': result['cutoff_s'] is not None,
+        'cutoff_s': result['cutoff_s'],
+    }
+    summary.update({k: round(v, 5) for k, v in sim.estimate_cycle_life(result).items()})
+    return summary
+
+
+MAX_STEPS = 200000  # time steps per request
+
+
+def downsample(series: np.ndarray, max_points: int) -> np.ndarray:
+    """Stride-based reduction of a time series for JSON transport"""
+    if series.size <= max_points:
+        return series
+    step = int(np.ceil(series.size / max_points))
+    return series[::step]
+
+
+def simulate_from_request(params: Dict[str, Any],
+                          progress: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
+    """Run a simulation from a JSON request body and return JSON-serializable output"""
+    dt = float(params.get('dt', 1.0))
+    duration_s = float(params.get('duration_s', 3600.0))
+    if dt <= 0:
+        raise ValueError("dt must be positive")
+    if duration_s <= 0 or duration_s / dt > MAX_STEPS:
+        raise ValueError(f"duration_s must be positive and at most {MAX_STEPS} time steps")
+    max_points = int(params.get('max_points', 500))
+    if max_points < 1:
+        raise ValueError("max_points must be at least 1")
+
+    sim = BatteryPackSimulator(
+        series=int(params.get('series', 96)),
+        parallel=int(params.get('parallel', 4)),
+        cell_params=params.get('cell_params'),
+        variation=float(params.get('variation', 0.03)),
+        ambient_c=float(params.get('ambient_c', 25.0)),
+        initial_soc=float(params.get('initial_soc', 0.9)),
+        seed=int(params.get('seed', 0)),
+    )
+    if sim.n_cells > 50000:
+        raise ValueError("Packs are limited to 50000 cells")
+
+    if 'current' in params:
+        current = np.asarray(params['current'], dtype=np.float64)
+        if current.size > MAX_STEPS:
+            raise ValueError(f"current is limited to {MAX_STEPS} time steps")
+    else:
+        current = drive_cycle_current(
+            params.get('drive_cycle', 'urban'),
+            duration_s,
+            dt,
+            float(params.get('peak_current_a', 200.0)),
+        )
+
+    result = sim.run(current, dt=dt, progress=progress)
+    series_keys = ('time_s', 'pack_current_a', 'pack_voltage_v', 'pack_power_kw',
+                   'min_cell_voltage_v', 'max_cell_temp_c', 'mean_soc')
+    return {
+        'summary': summarize(sim, result),
+        'series': {key: downsample(result[key], max_points).round(5).tolist() for key in series_keys},
+    }
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+BytEdge Reference Indexer
+Chunks and embeds each agent's reference documents (references/<agent>/*.md) on CPU and writes
+memory-mapped float16 vector indexes that the server opens at startup for retrieval
+
+Usage: python build_index.py [--source references] [--out references/index] [--nlist N] [agent ...]
+"""
+
+import argparse
+import os
+import time
+
+from vector_index import build_agent_index
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('agents', nargs='*', help='agents to index (default: every directory under --source)')
+    parser.add_argument('--source', default=os.path.join(ROOT, 'references'), help='reference document root')
+    parser.add_argument('--out', default=None, help='index root (default: <source>/index)')
+    parser.add_argument('--nlist', type=int, default=None,
+                        help='IVF lists per agent (default: exact below 4096 chunks, else about 4 * sqrt(N))')
+    args = parser.parse_args()
+
+    out = args.out or os.path.join(args.source, 'index')
+    agents = args.agents or sorted(name for name in os.listdir(args.source)
+                                   if name != 'index' and os.path.isdir(os.path.join(args.source, name)))
+    for agent in agents:
+        started = time.perf_counter()
+        manifest = build_agent_index(os.path.join(args.source, agent), os.path.join(out, agent), nlist=args.nlist)
+        mode = f"IVF {manifest['nlist']} lists" if manifest['nlist'] else 'exact'
+        print(f"{agent:<10} {manifest['count']:>8} chunks  {mode:<16} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    print(f"Wrote {len(agents)} indexes to {out}")
+
+
+if __name__ == '__main__':
+    main()
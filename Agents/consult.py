@@ -0,0 +1,124 @@
+"""
+BytEdge Multi-Agent Consultation
+Puts one question to several specialist agents in parallel under a single deadline and merges
+whichever answers arrived in time into one synthesis
+"""
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeout
+from typing import Dict, Any, List, Callable, Optional
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+# synthesize(question, answers) -> merged text; answers are the on-time ones in request order
+Synthesizer = Callable[[str, List[Dict[str, Any]]], str]
+
+_SENTENCE = re.compile(r'(?<=[.!?])\s+')
+
+
+def lead(text: str, sentences: int = 2, limit: int = 320) -> str:
+    """The first sentences of an answer, for the merged overview"""
+    plain = text.replace('**', '').replace('__', '')
+    flat = ' '.join(line.strip(' #*-•') for line in plain.strip().splitlines() if line.strip())
+    summary = ' '.join(_SENTENCE.split(flat)[:sentences])
+    return summary if len(summary) <= limit else summary[:limit].rsplit(' ', 1)[0] + '…'
+
+
+def merge_answers(answers: List[Dict[str, Any]], missing: List[Dict[str, Any]]) -> str:
+    """Local synthesis: each specialist's lead point, in relevance order, plus who did not answer"""
+    names = ', '.join(f"{item['name']} ({item['reason']})" for item in missing)
+    if not answers:
+        return f"None of the specialist agents could answer: {names}. Please try again or ask one agent directly."
+    lines = [f"**Combined view from {len(answers)} specialist{'s' if len(answers) > 1 else ''}:**", ""]
+    lines += [f"- **{answer['name']}:** {lead(answer['text'])}" for answer in answers]
+    if missing:
+        lines += ["", f"*Not included: {names}.*"]
+    return '\n'.join(lines)
+
+
+class Consultation:
+    """Shared worker pool; each run fans out, waits until the deadline and keeps what finished"""
+
+    def __init__(self, max_workers: int = 8):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='consult')
+
+    def run(self, question: str, asks: Dict[str, Callable[[], str]], deadline_s: float,
+            synthesize: Optional[Synthesizer] = None, synthesis_s: float = 0.0,
+            names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Ask every agent in ``asks`` (agent key -> zero-argument call returning its answer) concurrently.
+
+        Answers must arrive within ``deadline_s`` minus ``synthesis_s``; the rest are reported
+        as missing and left to finish in the background. With ``synthesize``, the remaining time
+        goes to a model-written synthesis, falling back to the local merge if it cannot finish.
+        """
+        started = time.perf_counter()
+        answer_deadline = started + max(deadline_s - (synthesis_s if synthesize else 0.0), 0.0)
+        futures = {self.pool.submit(self._timed, agent, ask): agent for agent, ask in asks.items()}
+
+        # Wake on each completion so the run ends as soon as the slowest on-time answer lands
+        outstanding = set(futures)
+        while outstanding:
+            remaining = answer_deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            _, outstanding = wait(outstanding, timeout=remaining, return_when=FIRST_COMPLETED)
+
+        names = names or {}
+        answers, missing = [], []
+        for future, agent in futures.items():
+            name = names.get(agent, agent)
+            if not future.done():
+                future.cancel()
+                missing.append({'agent': agent, 'name': name, 'reason': 'timeout'})
+                instrumentation.REQUESTS.inc(agent=agent, status='timeout')
+                continue
+            try:
+                text, latency_ms = future.result()
+            except Exception as e:
+                logger.warning("Consult answer from %s failed: %s", agent, e)
+                missing.append({'agent': agent, 'name': name, 'reason': 'error'})
+                instrumentation.REQUESTS.inc(agent=agent, status='error')
+                continue
+            if not text:
+                missing.append({'agent': agent, 'name': name, 'reason': 'no answer'})
+                continue
+            answers.append({'agent': agent, 'name': name, 'text': text, 'latency_ms': latency_ms})
+            instrumentation.REQUESTS.inc(agent=agent, status='ok')
+
+        synthesis, source = None, 'merge'
+        remaining = started + deadline_s - time.perf_counter()
+        if synthesize and len(answers) > 1 and remaining > 0:
+            try:
+                synthesis = self.pool.submit(synthesize, question, answers).result(timeout=remaining)
+                source = 'model'
+            except FutureTimeout:
+                logger.warning("Consult synthesis missed the %.1f s deadline; using the merged overview", deadline_s)
+            except Exception as e:
+                logger.warning("Consult synthesis failed: %s", e)
+        if not synthesis:
+            synthesis, source = merge_answers(answers, missing), 'merge'
+
+        elapsed_s = time.perf_counter() - started
+        instrumentation.STAGE_LATENCY.observe(elapsed_s, stage='consult', agent='router')
+        return {
+            'answers': answers,
+            'missing': missing,
+            'synthesis': synthesis,
+            'synthesis_source': source,
+            'elapsed_ms': round(elapsed_s * 1000.0, 1),
+            'deadline_s': deadline_s,
+        }
+
+    @staticmethod
+    def _timed(agent: str, ask: Callable[[], str]):
+        started = time.perf_counter()
+        text = ask()
+        return text, round((time.perf_counter() - started) * 1000.0, 1)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
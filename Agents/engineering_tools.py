@@ -0,0 +1,403 @@
+"""
+BytEdge Engineering Tool Layer
+Registered Python calculators that agents can call instead of estimating numbers
+Includes a local pre-parser for common numeric questions and a parallel executor
+"""
+
+import json
+import re
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Any, List, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Model-side protocol: one JSON object per line, prefixed with this marker
+TOOL_CALL_MARKER = 'TOOL_CALL:'
+TOOL_CALL_PATTERN = re.compile(r'^\s*' + re.escape(TOOL_CALL_MARKER) + r'\s*(\{.*\})\s*$', re.MULTILINE)
+
+# Questions asking for explanation need prose even when every number was computed locally
+PROSE_PATTERN = re.compile(r'\b(why|explain|how does|how do|compare|difference|should i|recommend|design)\b', re.I)
+
+# Highest per-cell nominal voltage; a larger quoted voltage is a pack voltage
+MAX_CELL_VOLTAGE = 5.0
+
+
+# ============================================================================
+# CALCULATORS
+# ============================================================================
+
+def clutch_torque_capacity(outer_diameter_mm: float, clamp_load_kn: float, plates: int = 1,
+                           inner_diameter_mm: Optional[float] = None, friction_coefficient: float = 0.3,
+                           safety_factor: float = 1.0) -> Dict[str, float]:
+    """Dry clutch torque capacity using the uniform-wear mean radius"""
+    if outer_diameter_mm <= 0 or clamp_load_kn <= 0 or plates < 1:
+        raise ValueError("Diameter, clamp load and plate count must be positive")
+    inner = inner_diameter_mm if inner_diameter_mm is not None else 0.65 * outer_diameter_mm
+    if not 0 < inner < outer_diameter_mm:
+        raise ValueError("Inner diameter must be between 0 and the outer diameter")
+    friction_surfaces = 2 * int(plates)
+    mean_radius_m = (outer_diameter_mm + inner) / 4.0 / 1000.0
+    torque = friction_coefficient * clamp_load_kn * 1000.0 * friction_surfaces * mean_radius_m
+    return {
+        'torque_capacity_nm': round(torque, 1),
+        'rated_torque_nm': round(torque / safety_factor, 1),
+        'friction_surfaces': friction_surfaces,
+        'mean_radius_mm': round(mean_radius_m * 1000.0, 2),
+        'inner_diameter_mm': round(inner, 1),
+        'friction_coefficient': friction_coefficient,
+    }
+
+
+def battery_pack_energy(series: int, parallel: int, cell_capacity_ah: float,
+                        nominal_voltage: float = 3.65, usable_fraction: float = 0.92) -> Dict[str, float]:
+    """Nominal and usable energy of a series/parallel pack"""
+    if series < 1 or parallel < 1 or cell_capacity_ah <= 0:
+        raise ValueError("Series, parallel and cell capacity must be positive")
+    if not 0 < nominal_voltage <= MAX_CELL_VOLTAGE:
+        raise ValueError(f"nominal_voltage is per cell and must be in (0, {MAX_CELL_VOLTAGE}] V")
+    pack_voltage = series * nominal_voltage
+    capacity_ah = parallel * cell_capacity_ah
+    energy_kwh = pack_voltage * capacity_ah / 1000.0
+    return {
+        'cells': series * parallel,
+        'nominal_voltage_v': round(pack_voltage, 1),
+        'capacity_ah': round(capacity_ah, 2),
+        'nominal_energy_kwh': round(energy_kwh, 2),
+        'usable_energy_kwh': round(energy_kwh * usable_fraction, 2),
+    }
+
+
+def battery_pack_simulation(series: int = 96, parallel: int = 4, drive_cycle: str = 'urban',
+                            peak_current_a: float = 200.0, duration_s: float = 3600.0) -> Dict[str, Any]:
+    """Electro-thermal pack simulation summary (runs on the worker pool)"""
+    import battery_sim
+    return battery_sim.simulate_from_request({
+        'series': series, 'parallel': parallel, 'drive_cycle': drive_cycle,
+        'peak_current_a': peak_current_a, 'duration_s': duration_s, 'max_points': 2,
+    })['summary']
+
+
+def tire_peak_force(load_n: float, mode: str = 'lateral', camber_deg: float = 0.0,
+                    pressure_kpa: float = 220.0) -> Dict[str, float]:
+    """Peak Magic Formula force and friction coefficient at one operating point"""
+    import numpy as np
+    import tire_model
+    if load_n <= 0:
+        raise ValueError("Vertical load must be positive")
+    slip = np.linspace(0.0, 0.3, 301)
+    forces = tire_model.evaluate_grid(mode, slip, [load_n], [np.radians(camber_deg)], [pressure_kpa * 1000.0])
+    force = np.abs(next(iter(forces.values()))[:, 0, 0, 0])
+    peak_index = int(force.argmax())
+    return {
+        'peak_force_n': round(float(force[peak_index]), 1),
+        'peak_slip': round(float(slip[peak_index]), 4),
+        'friction_coefficient': round(float(force[peak_index] / load_n), 3),
+        'mode': mode,
+    }
+
+
+def frame_torsional_stiffness(length_m: float = 4.5, width_m: float = 1.0, cross_members: int = 6,
+                              tube_width_mm: float = 60.0, tube_height_mm: float = 120.0,
+                              wall_mm: float = 4.0, material: str = 'steel') -> Dict[str, Any]:
+    """Ladder-frame torsional rigidity and lowest modes (runs on the worker pool)"""
+    import frame_fe
+    result = frame_fe.analyze_from_request({
+        'length': length_m, 'width': width_m, 'cross_members': cross_members, 'material': material,
+        'section': {'type': 'rectangular_tube', 'width': tube_width_mm / 1000.0,
+                    'height': tube_height_mm / 1000.0, 'thickness': wall_mm / 1000.0},
+        'modes': 4,
+    })
+    return {
+        'torsional_stiffness_nm_per_deg': result['torsional_stiffness_nm_per_deg'],
+        'frequencies_hz': result['frequencies_hz'],
+        'mass_kg': result['mass_kg'],
+    }
+
+
+# ============================================================================
+# REGISTRY AND EXECUTION
+# ============================================================================
+
+class ToolRegistry:
+    """Named calculators per agent with thread-pool and process-pool execution"""
+
+    def __init__(self, max_threads: int = 8, max_processes: int = 2):
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.max_processes = max_processes
+        self._threads = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix='tool')
+        self._processes = None
+
+    def register(self, name: str, func: Callable, agents: List[str], description: str,
+                 parameters: Dict[str, str], heavy: bool = False):
+        """Register a calculator; heavy tools run in a separate worker process"""
+        self.tools[name] = {
+            'func': func,
+            'agents': agents,
+            'description': description,
+            'parameters': parameters,
+            'heavy': heavy,
+        }
+
+    def for_agent(self, agent_type: str) -> Dict[str, Dict[str, Any]]:
+        return {name: tool for name, tool in self.tools.items() if agent_type in tool['agents']}
+
+    def describe(self, agent_type: str) -> str:
+        """Prompt section describing the tools an agent may request"""
+        tools = self.for_agent(agent_type)
+        if not tools:
+            return ""
+        lines = [
+            "AVAILABLE CALCULATION TOOLS:",
+            f"If exact numbers are needed and not already provided, reply with only lines of the form "
+            f'{TOOL_CALL_MARKER} {{"name": "<tool>", "arguments": {{...}}}} and you will receive the results.',
+        ]
+        for name, tool in tools.items():
+            params = ', '.join(f"{p} ({t})" for p, t in tool['parameters'].items())
+            lines.append(f"• {name}: {tool['description']}. Arguments: {params}")
+        return '\n'.join(lines)
+
+    def _executor_for(self, tool: Dict[str, Any]):
+        if not tool['heavy']:
+            return self._threads
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.max_processes)
+        return self._processes
+
+    def execute(self, calls: List[Dict[str, Any]], agent_type: str, timeout: float = 30.0) -> List[Dict[str, Any]]:
+        """Run independent tool calls in parallel and report per-call latency"""
+        allowed = self.for_agent(agent_type)
+        pending = []
+        results = []
+        for call in calls:
+            name = call.get('name')
+            record = {'name': name, 'arguments': call.get('arguments', {})}
+            tool = allowed.get(name)
+            if tool is None:
+                record.update({'error': f"Unknown tool for {agent_type}: {name}", 'latency_ms': 0.0})
+                results.append(record)
+                continue
+            results.append(record)
+            if not isinstance(record['arguments'], dict):
+                record.update({'error': f"Arguments for {name} must be an object", 'latency_ms': 0.0})
+                continue
+            started = time.perf_counter()
+            try:
+                future = self._executor_for(tool).submit(tool['func'], **record['arguments'])
+            except TypeError as e:
+                record.update({'error': f"TypeError: {e}", 'latency_ms': 0.0})
+                continue
+            pending.append((record, future, started))
+
+        for record, future, started in pending:
+            try:
+                record['result'] = future.result(timeout=timeout)
+            except Exception as e:
+                record['error'] = f"{type(e).__name__}: {e}"
+                logger.warning("Tool %s failed: %s", record['name'], e)
+            # Latency is measured submit-to-result, so parallel calls overlap
+            record['latency_ms'] = round((time.perf_counter() - started) * 1000.0, 3)
+        return results
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False)
+
+
+def parse_model_tool_calls(text: str) -> List[Dict[str, Any]]:
+    """Extract TOOL_CALL lines emitted by the model"""
+    calls = []
+    for match in TOOL_CALL_PATTERN.finditer(text or ''):
+        try:
+            payload = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(payload, dict) or 'name' not in payload:
+            continue
+        arguments = payload.get('arguments') or {}
+        if isinstance(arguments, dict):
+            calls.append({'name': payload['name'], 'arguments': arguments})
+    return calls
+
+
+class ToolCallFilter:
+    """Forwards streamed model text to ``emit`` while holding back TOOL_CALL lines"""
+
+    def __init__(self, emit: Callable[[str], None]):
+        self.emit = emit
+        self.line = ''
+        self.passing = False  # part of the current line was already forwarded, so it is not a call
+
+    def feed(self, text: str):
+        for piece in text.splitlines(keepends=True):
+            self.line += piece
+            complete = self.line.endswith('\n')
+            head = self.line.lstrip()
+            if not self.passing and (head.startswith(TOOL_CALL_MARKER)
+                                     or (not complete and TOOL_CALL_MARKER.startswith(head))):
+                # A tool call, or a line start that may still become one
+                if complete:
+                    self.line = ''
+                continue
+            self.emit(self.line)
+            self.line = ''
+            self.passing = not complete
+
+    def flush(self):
+        if self.line and not self.line.lstrip().startswith(TOOL_CALL_MARKER):
+            self.emit(self.line)
+        self.line = ''
+        self.passing = False
+
+
+# ============================================================================
+# LOCAL PRE-PARSER
+# ============================================================================
+
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_DIAMETER_LABELS = {'od': 'outer', 'outer': 'outer', 'outside': 'outer',
+                    'id': 'inner', 'inner': 'inner', 'inside': 'inner'}
+_LABEL_BEFORE = re.compile(r'\b(od|id|outer|inner|outside|inside)(?:\s+diameter)?\s*(?:of|is|=|:)?\s*$')
+_LABEL_AFTER = re.compile(r'\s*\(?\s*(od|id|outer|inner|outside|inside)\b')
+_PLATE_WORDS = {'single': 1, 'twin': 2, 'dual': 2, 'double': 2, 'triple': 3}
+
+
+def _diameter_label(text: str, match) -> Optional[str]:
+    """'outer' or 'inner' when a millimetre value is labelled just before or just after it"""
+    label = _LABEL_BEFORE.search(text, max(0, match.start() - 40), match.start()) \
+        or _LABEL_AFTER.match(text, match.end())
+    return _DIAMETER_LABELS[label.group(1)] if label else None
+
+
+def _clutch_diameters(text: str) -> Dict[str, float]:
+    """
+    Outer and inner diameters by their labels (OD/outer, ID/inner). A single unlabelled value is the outer
+    diameter; any other unlabelled value makes the question ambiguous, so nothing is returned
+    """
+    labelled, unlabelled = {}, []
+    for match in re.finditer(_NUMBER + r'\s*mm\b', text):
+        label = _diameter_label(text, match)
+        if label is None:
+            unlabelled.append(float(match.group(1)))
+        elif label in labelled:
+            return {}
+        else:
+            labelled[label] = float(match.group(1))
+    if 'outer' not in labelled and len(unlabelled) == 1:
+        labelled['outer'], unlabelled = unlabelled[0], []
+    if 'outer' not in labelled or unlabelled:
+        return {}
+    diameters = {'outer_diameter_mm': labelled['outer']}
+    if 'inner' in labelled:
+        diameters['inner_diameter_mm'] = labelled['inner']
+    return diameters
+
+
+def _clutch_calls(text: str) -> List[Dict[str, Any]]:
+    if 'torque' not in text or 'clutch' not in text:
+        return []
+    diameters = _clutch_diameters(text)
+    clamp = re.search(_NUMBER + r'\s*kn\b', text)
+    if not diameters or not clamp:
+        return []
+    arguments = {**diameters, 'clamp_load_kn': float(clamp.group(1))}
+    plates = re.search(r'\b(single|twin|dual|double|triple|\d)[- ]plate', text)
+    if plates:
+        word = plates.group(1)
+        arguments['plates'] = int(word) if word.isdigit() else _PLATE_WORDS[word]
+    mu = re.search(r'(?:friction coefficient|coefficient of friction|μ|mu)\s*(?:of|=)?\s*(0\.\d+)', text)
+    if mu:
+        arguments['friction_coefficient'] = float(mu.group(1))
+    return [{'name': 'clutch_torque_capacity', 'arguments': arguments}]
+
+
+def _battery_calls(text: str) -> List[Dict[str, Any]]:
+    config = re.search(r'\b(\d+)\s*s\s*(\d+)\s*p\b', text)
+    capacity = re.search(_NUMBER + r'\s*ah\b', text)
+    if not config or not capacity or not re.search(r'energy|kwh|capacity', text):
+        return []
+    arguments = {'series': int(config.group(1)), 'parallel': int(config.group(2)),
+                 'cell_capacity_ah': float(capacity.group(1))}
+    voltage = re.search(_NUMBER + r'\s*v\b', text)
+    if voltage:
+        # A cell voltage is used as given; a pack voltage is split across the series cells
+        volts = float(voltage.group(1))
+        cell_volts = volts if volts <= MAX_CELL_VOLTAGE else volts / arguments['series']
+        if 0 < cell_volts <= MAX_CELL_VOLTAGE:
+            arguments['nominal_voltage'] = round(cell_volts, 3)
+    return [{'name': 'battery_pack_energy', 'arguments': arguments}]
+
+
+def _tire_calls(text: str) -> List[Dict[str, Any]]:
+    load = re.search(_NUMBER + r'\s*(kn|n)\b', text)
+    if not load or not re.search(r'peak|max|grip|friction', text):
+        return []
+    load_n = float(load.group(1)) * (1000.0 if load.group(2) == 'kn' else 1.0)
+    modes = [m for m in ('lateral', 'longitudinal') if m in text] or ['lateral']
+    calls = []
+    for mode in modes:
+        arguments = {'load_n': load_n, 'mode': mode}
+        pressure = re.search(_NUMBER + r'\s*kpa', text)
+        if pressure:
+            arguments['pressure_kpa'] = float(pressure.group(1))
+        calls.append({'name': 'tire_peak_force', 'arguments': arguments})
+    return calls
+
+
+PRE_PARSERS = {
+    'clutch': _clutch_calls,
+    'battery': _battery_calls,
+    'tire': _tire_calls,
+}
+
+
+def pre_parse(message: str, agent_type: str) -> List[Dict[str, Any]]:
+    """Map a numeric question directly to tool calls without consulting the model"""
+    parser = PRE_PARSERS.get(agent_type)
+    return parser(message.lower()) if parser else []
+
+
+def needs_prose(message: str) -> bool:
+    """Whether the question asks for explanation beyond the computed numbers"""
+    return bool(PROSE_PATTERN.search(message)) or len(message.split()) > 40
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    """Render tool results as a compact block for prompts or direct answers"""
+    lines = []
+    for record in results:
+        if 'error' in record:
+            lines.append(f"• {record['name']}: failed ({record['error']})")
+            continue
+        values = ', '.join(f"{k} = {v}" for k, v in record['result'].items())
+        lines.append(f"• {record['name']}({json.dumps(record['arguments'])}): {values}")
+    return '\n'.join(lines)
+
+
+def default_registry() -> ToolRegistry:
+    """Registry preloaded with the BytEdge engineering calculators"""
+    registry = ToolRegistry()
+    registry.register('clutch_torque_capacity', clutch_torque_capacity, ['clutch'],
+                      'Torque capacity of a dry friction clutch (uniform wear)',
+                      {'outer_diameter_mm': 'number', 'clamp_load_kn': 'number', 'plates': 'integer',
+                       'inner_diameter_mm': 'number, optional', 'friction_coefficient': 'number, optional'})
+    registry.register('battery_pack_energy', battery_pack_energy, ['battery'],
+                      'Nominal and usable energy of a series/parallel pack',
+                      {'series': 'integer', 'parallel': 'integer', 'cell_capacity_ah': 'number',
+                       'nominal_voltage': 'number, optional'})
+    registry.register('battery_pack_simulation', battery_pack_simulation, ['battery'],
+                      'Electro-thermal drive-cycle simulation with temperature rise and cycle-aging estimate',
+                      {'series': 'integer', 'parallel': 'integer', 'drive_cycle': 'constant|pulse|urban|highway',
+                       'peak_current_a': 'number', 'duration_s': 'number'}, heavy=True)
+    registry.register('tire_peak_force', tire_peak_force, ['tire'],
+                      'Peak Magic Formula force and friction coefficient at a vertical load',
+                      {'load_n': 'number', 'mode': 'lateral|longitudinal', 'camber_deg': 'number, optional',
+                       'pressure_kpa': 'number, optional'})
+    registry.register('frame_torsional_stiffness', frame_torsional_stiffness, ['frame'],
+                      'Ladder-frame torsional rigidity and lowest natural frequencies from beam FE',
+                      {'length_m': 'number', 'width_m': 'number', 'cross_members': 'integer',
+                       'tube_width_mm': 'number', 'tube_height_mm': 'number', 'wall_mm': 'number',
+                       'material': 'steel|aluminum|carbon_fiber'}, heavy=True)
+    return registry
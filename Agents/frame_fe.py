@@ -0,0 +1,351 @@
+"""
+FrameEdge Beam Finite-Element Engine
+3D Timoshenko beam elements (Euler-Bernoulli when shear deformation is disabled)
+Sparse COO->CSR assembly, factorized static solves and shift-invert modal analysis
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from typing import Dict, Any, Sequence
+
+DOF_PER_NODE = 6  # ux, uy, uz, rx, ry, rz
+
+MATERIALS = {
+    'steel': {'E': 210e9, 'G': 80.8e9, 'rho': 7850.0, 'yield_pa': 355e6},
+    'aluminum': {'E': 70e9, 'G': 26.3e9, 'rho': 2700.0, 'yield_pa': 240e6},
+    'carbon_fiber': {'E': 135e9, 'G': 5.0e9, 'rho': 1600.0, 'yield_pa': 600e6},
+}
+
+
+def rectangular_tube(width: float, height: float, thickness: float) -> Dict[str, float]:
+    """Section properties of a thin-walled rectangular tube (metres)"""
+    wi, hi = width - 2 * thickness, height - 2 * thickness
+    if wi <= 0 or hi <= 0:
+        raise ValueError("Wall thickness too large for the tube dimensions")
+    area = width * height - wi * hi
+    iy = (width * height ** 3 - wi * hi ** 3) / 12.0  # bending about local y (height direction)
+    iz = (height * width ** 3 - hi * wi ** 3) / 12.0
+    # Bredt-Batho closed-section torsion constant
+    am = (width - thickness) * (height - thickness)
+    j = 4.0 * am ** 2 * thickness / (2.0 * ((width - thickness) + (height - thickness)))
+    return {'A': area, 'Iy': iy, 'Iz': iz, 'J': j, 'shear_factor': 0.44,
+            'cy': width / 2.0, 'cz': height / 2.0}
+
+
+def circular_tube(diameter: float, thickness: float) -> Dict[str, float]:
+    """Section properties of a round tube (metres)"""
+    ro, ri = diameter / 2.0, diameter / 2.0 - thickness
+    if ri < 0:
+        raise ValueError("Wall thickness too large for the tube diameter")
+    area = np.pi * (ro ** 2 - ri ** 2)
+    i = np.pi * (ro ** 4 - ri ** 4) / 4.0
+    return {'A': area, 'Iy': i, 'Iz': i, 'J': 2.0 * i, 'shear_factor': 0.5, 'cy': ro, 'cz': ro}
+
+
+class BeamFrame:
+    """Beam-element frame model with per-element section and material arrays"""
+
+    def __init__(self, nodes: np.ndarray, elements: np.ndarray, section: Dict[str, float],
+                 material: str = 'steel', timoshenko: bool = True):
+        self.nodes = np.asarray(nodes, dtype=np.float64)
+        self.elements = np.asarray(elements, dtype=np.int64)
+        if self.nodes.ndim != 2 or self.nodes.shape[1] != 3:
+            raise ValueError("nodes must be an (n, 3) array of coordinates")
+        if self.elements.ndim != 2 or self.elements.shape[1] != 2:
+            raise ValueError("elements must be an (m, 2) array of node indices")
+        if self.elements.min() < 0 or self.elements.max() >= len(self.nodes):
+            raise ValueError("element references a node that does not exist")
+        if material not in MATERIALS:
+            raise ValueError(f"Unknown material: {material}. Available: {', '.join(MATERIALS)}")
+
+        self.material = MATERIALS[material]
+        self.section = section
+        self.timoshenko = timoshenko
+        self.n_dof = len(self.nodes) * DOF_PER_NODE
+
+        delta = self.nodes[self.elements[:, 1]] - self.nodes[self.elements[:, 0]]
+        self.lengths = np.linalg.norm(delta, axis=1)
+        if np.any(self.lengths <= 0):
+            raise ValueError("elements must have non-zero length")
+        self.rotations = self._rotation_matrices(delta / self.lengths[:, None])
+        self.element_dofs = (self.elements[:, :, None] * DOF_PER_NODE
+                             + np.arange(DOF_PER_NODE)).reshape(-1, 2 * DOF_PER_NODE)
+
+        self._k_local = self._local_stiffness()
+        self.K = self._assemble(self._k_local)
+        self.M = self._assemble(self._local_mass())
+
+    @staticmethod
+    def _rotation_matrices(ex: np.ndarray) -> np.ndarray:
+        """Element 12x12 transformation matrices from global to local axes"""
+        reference = np.tile([0.0, 0.0, 1.0], (len(ex), 1))
+        vertical = np.abs(ex[:, 2]) > 0.99
+        reference[vertical] = [0.0, 1.0, 0.0]
+        ez = reference - np.sum(reference * ex, axis=1, keepdims=True) * ex
+        ez /= np.linalg.norm(ez, axis=1, keepdims=True)
+        ey = np.cross(ez, ex)
+        r = np.stack([ex, ey, ez], axis=1)  # (m, 3, 3), rows are local axes
+
+        t = np.zeros((len(ex), 12, 12))
+        for block in range(4):
+            t[:, 3 * block:3 * block + 3, 3 * block:3 * block + 3] = r
+        return t
+
+    def _local_stiffness(self) -> np.ndarray:
+        """Batched local element stiffness matrices (m, 12, 12)"""
+        s, mat, length = self.section, self.material, self.lengths
+        e, g = mat['E'], mat['G']
+        k = np.zeros((len(length), 12, 12))
+
+        if self.timoshenko:
+            shear_area = s['shear_factor'] * s['A']
+            phi_y = 12.0 * e * s['Iz'] / (g * shear_area * length ** 2)
+            phi_z = 12.0 * e * s['Iy'] / (g * shear_area * length ** 2)
+        else:
+            phi_y = phi_z = np.zeros_like(length)
+
+        axial = e * s['A'] / length
+        torsion = g * s['J'] / length
+        k[:, 0, 0] = k[:, 6, 6] = axial
+        k[:, 0, 6] = k[:, 6, 0] = -axial
+        k[:, 3, 3] = k[:, 9, 9] = torsion
+        k[:, 3, 9] = k[:, 9, 3] = -torsion
+
+        # Bending in the local x-y plane (uy, rz) about Iz
+        a = 12.0 * e * s['Iz'] / ((1 + phi_y) * length ** 3)
+        b = 6.0 * e * s['Iz'] / ((1 + phi_y) * length ** 2)
+        c = (4.0 + phi_y) * e * s['Iz'] / ((1 + phi_y) * length)
+        d = (2.0 - phi_y) * e * s['Iz'] / ((1 + phi_y) * length)
+        self._fill_bending(k, (1, 5, 7, 11), a, b, c, d, sign=1.0)
+
+        # Bending in the local x-z plane (uz, ry) about Iy
+        a = 12.0 * e * s['Iy'] / ((1 + phi_z) * length ** 3)
+        b = 6.0 * e * s['Iy'] / ((1 + phi_z) * length ** 2)
+        c = (4.0 + phi_z) * e * s['Iy'] / ((1 + phi_z) * length)
+        d = (2.0 - phi_z) * e * s['Iy'] / ((1 + phi_z) * length)
+        self._fill_bending(k, (2, 4, 8, 10), a, b, c, d, sign=-1.0)
+        return k
+
+    @staticmethod
+    def _fill_bending(k: np.ndarray, idx: Sequence[int], a, b, c, d, sign: float):
+        """Write one bending plane's 4x4 block into the batched element matrices"""
+        v1, r1, v2, r2 = idx
+        block = {
+            (v1, v1): a, (v1, r1): sign * b, (v1, v2): -a, (v1, r2): sign * b,
+            (r1, r1): c, (r1, v2): -sign * b, (r1, r2): d,
+            (v2, v2): a, (v2, r2): -sign * b,
+            (r2, r2): c,
+        }
+        for (i, j), value in block.items():
+            k[:, i, j] = value
+            k[:, j, i] = value
+
+    def _local_mass(self) -> np.ndarray:
+        """Batched consistent local element mass matrices (m, 12, 12)"""
+        s, rho, length = self.section, self.material['rho'], self.lengths
+        mass = rho * s['A'] * length
+        m = np.zeros((len(length), 12, 12))
+        m[:, 0, 0] = m[:, 6, 6] = mass / 3.0
+        m[:, 0, 6] = m[:, 6, 0] = mass / 6.0
+        polar = rho * (s['Iy'] + s['Iz']) * length
+        m[:, 3, 3] = m[:, 9, 9] = polar / 3.0
+        m[:, 3, 9] = m[:, 9, 3] = polar / 6.0
+
+        scale = mass / 420.0
+        l1, l2 = length * scale, length ** 2 * scale
+        for (v1, r1, v2, r2), sign in (((1, 5, 7, 11), 1.0), ((2, 4, 8, 10), -1.0)):
+            block = {
+                (v1, v1): 156.0 * scale, (v1, r1): sign * 22.0 * l1, (v1, v2): 54.0 * scale,
+                (v1, r2): -sign * 13.0 * l1, (r1, r1): 4.0 * l2, (r1, v2): sign * 13.0 * l1,
+                (r1, r2): -3.0 * l2, (v2, v2): 156.0 * scale, (v2, r2): -sign * 22.0 * l1,
+                (r2, r2): 4.0 * l2,
+            }
+            for (i, j), value in block.items():
+                m[:, i, j] = value
+                m[:, j, i] = value
+        return m
+
+    def _assemble(self, local: np.ndarray) -> sp.csr_matrix:
+        """Rotate element matrices to global axes and assemble via COO -> CSR"""
+        t = self.rotations
+        global_blocks = np.einsum('eji,ejk,ekl->eil', t, local, t, optimize=True)
+        rows = np.repeat(self.element_dofs, 12, axis=1).ravel()
+        cols = np.tile(self.element_dofs, (1, 12)).ravel()
+        return sp.coo_matrix((global_blocks.ravel(), (rows, cols)),
+                             shape=(self.n_dof, self.n_dof)).tocsr()
+
+    def free_dofs(self, fixed_nodes: Sequence[int], fixed_dofs: Sequence[int] = range(DOF_PER_NODE)) -> np.ndarray:
+        """Indices of unconstrained global DOFs"""
+        mask = np.ones(self.n_dof, dtype=bool)
+        fixed_nodes = np.asarray(fixed_nodes, dtype=np.int64)
+        for dof in fixed_dofs:
+            mask[fixed_nodes * DOF_PER_NODE + dof] = False
+        return np.flatnonzero(mask)
+
+    def solve_static(self, loads: np.ndarray, free: np.ndarray) -> np.ndarray:
+        """
+        Solve K u = f for one or many load cases with a single sparse LU factorization.
+
+        ``loads`` is (n_dof,) or (n_dof, n_cases); returns displacements of the same shape.
+        """
+        loads = np.asarray(loads, dtype=np.float64)
+        single = loads.ndim == 1
+        f = loads[:, None] if single else loads
+        k_ff = self.K[free][:, free].tocsc()
+        lu = spla.splu(k_ff)
+        u = np.zeros_like(f)
+        u[free] = lu.solve(np.ascontiguousarray(f[free]))
+        return u[:, 0] if single else u
+
+    def modes(self, free: np.ndarray, k: int = 6, shift: float = -1.0) -> Dict[str, np.ndarray]:
+        """Lowest k natural frequencies via shift-invert Lanczos around ``shift`` (rad^2/s^2)"""
+        k_ff = self.K[free][:, free].tocsc()
+        m_ff = self.M[free][:, free].tocsc()
+        k = min(k, len(free) - 2)
+        eigenvalues, vectors = spla.eigsh(k_ff, k=k, M=m_ff, sigma=shift, which='LM')
+        order = np.argsort(eigenvalues)
+        eigenvalues = np.clip(eigenvalues[order], 0.0, None)
+        shapes = np.zeros((self.n_dof, k))
+        shapes[free] = vectors[:, order]
+        return {'frequencies_hz': np.sqrt(eigenvalues) / (2.0 * np.pi), 'mode_shapes': shapes}
+
+    def element_stresses(self, u: np.ndarray) -> np.ndarray:
+        """Peak combined axial + biaxial bending stress per element (Pa) from end forces"""
+        u_e = u[self.element_dofs]  # (m, 12)
+        local_u = np.einsum('eij,ej->ei', self.rotations, u_e)
+        forces = np.einsum('eij,ej->ei', self._k_local, local_u)
+        s = self.section
+        axial = np.abs(forces[:, 0]) / s['A']
+        moment_y = np.maximum(np.abs(forces[:, 4]), np.abs(forces[:, 10]))
+        moment_z = np.maximum(np.abs(forces[:, 5]), np.abs(forces[:, 11]))
+        return axial + moment_y * s['cz'] / s['Iy'] + moment_z * s['cy'] / s['Iz']
+
+    @property
+    def total_mass(self) -> float:
+        return float(self.material['rho'] * self.section['A'] * self.lengths.sum())
+
+
+def ladder_frame(length: float = 4.5, width: float = 1.0, cross_members: int = 6,
+                 segments_per_bay: int = 4) -> Dict[str, np.ndarray]:
+    """Ladder frame geometry: two longitudinal rails joined by evenly spaced cross members"""
+    if cross_members < 2 or segments_per_bay < 1:
+        raise ValueError("Ladder frame needs at least 2 cross members and 1 segment per bay")
+    n_rail = (cross_members - 1) * segments_per_bay + 1
+    x = np.linspace(0.0, length, n_rail)
+    left = np.column_stack([x, np.zeros(n_rail), np.zeros(n_rail)])
+    right = np.column_stack([x, np.full(n_rail, width), np.zeros(n_rail)])
+    nodes = [left, right]
+    rail = np.arange(n_rail - 1)
+    elements = [np.column_stack([rail, rail + 1]), np.column_stack([rail + n_rail, rail + n_rail + 1])]
+
+    # Cross members are subdivided like the rails so mesh density is uniform
+    next_node = 2 * n_rail
+    cross_segments = max(1, int(round(segments_per_bay * width / (length / (cross_members - 1)))))
+    for bay in range(cross_members):
+        i_left, i_right = bay * segments_per_bay, bay * segments_per_bay + n_rail
+        inner = np.linspace(0.0, width, cross_segments + 1)[1:-1]
+        chain = [i_left]
+        if inner.size:
+            nodes.append(np.column_stack([np.full(inner.size, x[bay * segments_per_bay]), inner,
+                                          np.zeros(inner.size)]))
+            chain.extend(range(next_node, next_node + inner.size))
+            next_node += inner.size
+        chain.append(i_right)
+        elements.append(np.column_stack([chain[:-1], chain[1:]]))
+
+    return {
+        'nodes': np.vstack(nodes),
+        'elements': np.vstack(elements),
+        'corners': np.array([0, n_rail, n_rail - 1, 2 * n_rail - 1]),  # rear-left, rear-right, front-left, front-right
+    }
+
+
+def torsional_stiffness(frame: BeamFrame, corners: Sequence[int], width: float, load: float = 1000.0) -> float:
+    """Torsional rigidity (Nm/deg) from a front-axle twist test with the rear axle clamped"""
+    rear_left, rear_right, front_left, front_right = corners
+    free = frame.free_dofs([rear_left, rear_right])
+    loads = np.zeros(frame.n_dof)
+    loads[front_left * DOF_PER_NODE + 2] = load
+    loads[front_right * DOF_PER_NODE + 2] = -load
+    u = frame.solve_static(loads, free)
+    dz = u[front_left * DOF_PER_NODE + 2] - u[front_right * DOF_PER_NODE + 2]
+    twist_deg = np.degrees(np.arctan2(dz, width))
+    return float(load * width / twist_deg) if twist_deg else float('inf')
+
+
+def analyze_from_request(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a frame from a JSON request body and run static, modal and torsion analyses"""
+    section_spec = params.get('section', {'type': 'rectangular_tube', 'width': 0.06, 'height': 0.12,
+                                          'thickness': 0.004})
+    section_type = section_spec.get('type', 'rectangular_tube')
+    if section_type == 'rectangular_tube':
+        section = rectangular_tube(float(section_spec['width']), float(section_spec['height']),
+                                   float(section_spec['thickness']))
+    elif section_type == 'circular_tube':
+        section = circular_tube(float(section_spec['diameter']), float(section_spec['thickness']))
+    else:
+        raise ValueError("section type must be 'rectangular_tube' or 'circular_tube'")
+
+    if 'nodes' in params:
+        geometry = {'nodes': np.asarray(params['nodes'], dtype=np.float64),
+                    'elements': np.asarray(params['elements'], dtype=np.int64),
+                    'corners': params.get('corners')}
+        width = float(params.get('width', 1.0))
+    else:
+        width = float(params.get('width', 1.0))
+        geometry = ladder_frame(float(params.get('length', 4.5)), width,
+                                int(params.get('cross_members', 6)), int(params.get('segments_per_bay', 4)))
+
+    if len(geometry['nodes']) * DOF_PER_NODE > 300000:
+        raise ValueError("Models are limited to 300000 DOFs")
+
+    frame = BeamFrame(geometry['nodes'], geometry['elements'], section,
+                      material=params.get('material', 'steel'),
+                      timoshenko=bool(params.get('timoshenko', True)))
+    result = {
+        'nodes': len(frame.nodes),
+        'elements': len(frame.elements),
+        'dofs': frame.n_dof,
+        'mass_kg': round(frame.total_mass, 3),
+    }
+
+    corners = geometry.get('corners')
+    fixed = params.get('fixed_nodes', corners[:2] if corners is not None else [0])
+    free = frame.free_dofs(fixed)
+
+    # Each load case is a list of [node, dof, value] entries, solved against one factorization
+    load_cases = params.get('load_cases')
+    if load_cases is None and corners is not None:
+        load_cases = [[[int(corners[2]), 2, -1000.0], [int(corners[3]), 2, -1000.0]]]
+    if load_cases:
+        f = np.zeros((frame.n_dof, len(load_cases)))
+        for case, entries in enumerate(load_cases):
+            for node, dof, value in entries:
+                node, dof = int(node), int(dof)
+                if not 0 <= node < len(frame.nodes):
+                    raise ValueError(f"load case {case} references node {node}, which does not exist")
+                if not 0 <= dof < DOF_PER_NODE:
+                    raise ValueError(f"load case {case} has dof {dof}; dof must be 0-{DOF_PER_NODE - 1}")
+                f[node * DOF_PER_NODE + dof, case] += float(value)
+        u = frame.solve_static(f, free)
+        translations = u.reshape(len(frame.nodes), DOF_PER_NODE, -1)[:, :3, :]
+        cases = []
+        for case in range(len(load_cases)):
+            stress = frame.element_stresses(u[:, case])
+            peak = float(stress.max())
+            cases.append({
+                'max_displacement_mm': round(float(np.linalg.norm(translations[:, :, case], axis=1).max()) * 1e3, 4),
+                'max_stress_mpa': round(peak / 1e6, 3),
+                'safety_factor': round(frame.material['yield_pa'] / peak, 3) if peak > 0 else None,
+            })
+        result['load_cases'] = cases
+
+    n_modes = int(params.get('modes', 6))
+    if n_modes > 0:
+        modal = frame.modes(free, k=n_modes)
+        result['frequencies_hz'] = np.round(modal['frequencies_hz'], 3).tolist()
+
+    if corners is not None and params.get('torsion', True):
+        result['torsional_stiffness_nm_per_deg'] = round(torsional_stiffness(frame, corners, width), 1)
+    return result
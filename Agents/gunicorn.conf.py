@@ -0,0 +1,55 @@
+"""
+BytEdge gunicorn configuration
+Preloads the app's read-only data in the master, initializes each worker after fork and reloads gracefully
+
+Usage: gunicorn -c gunicorn.conf.py
+Reload workers and this file: kill -HUP <master>. Deploy new code: kill -USR2 <master>, then kill -QUIT the old one.
+"""
+
+import gc
+import os
+import sys
+
+chdir = os.path.dirname(os.path.abspath(__file__))
+wsgi_app = 'agent-server:create_app(init=False)'
+bind = os.getenv('BIND', f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}")
+
+# Threaded workers: WebSocket connections and upstream waits hold a thread, not a process.
+# Jobs, handoff tokens, conversation history and metrics live in each worker's memory, and any worker
+# may take the next request, so keep one worker per node and scale out with SHARD_NODES instead
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 32))
+
+# Configs, pages, assets and the knowledge/reference indexes load once and are shared copy-on-write
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True').lower() == 'true'
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+# Exiting workers stop accepting and finish in-flight requests (open WebSockets are cut after this)
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+# Recycle workers after this many requests to bound per-worker memory (0 = never)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+
+def _server():
+    """The agent-server module the app factory was loaded from"""
+    return sys.modules['agent-server']
+
+
+def pre_fork(server, worker):
+    # Move everything allocated so far out of the collector's reach, so collections in the
+    # workers do not write to (and un-share) the preloaded pages
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Runs in the worker once the app is loaded (after fork with preload, after import without)
+    _server().init_worker()
+
+
+def worker_exit(server, worker):
+    server_module = sys.modules.get('agent-server')
+    if server_module is not None:  # None if the worker failed before loading the app
+        server_module.shutdown_worker()
@@ -0,0 +1,145 @@
+"""
+BytEdge Speculative Handoff Store
+Answers started before the user opens an agent page, kept under single-use tokens for a short TTL
+A rate budget and a pending cap bound the upstream calls that may be spent on guesses
+"""
+
+import logging
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Any, Callable, List, Optional
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+SPECULATIONS = instrumentation.registry.counter(
+    'speculative_requests_total', 'Speculative answers by agent and outcome (claimed, expired, rejected, failed)')
+SPECULATIVE_SAVED = instrumentation.registry.counter(
+    'speculative_saved_seconds_total', 'Answer time already spent when a speculative answer was claimed')
+
+
+class Handoff:
+    """One speculative answer and its lifecycle"""
+
+    def __init__(self, token: str, agent: str, message: str, conversation_id: str, ttl_s: float):
+        self.token = token
+        self.agent = agent
+        self.message = message
+        self.conversation_id = conversation_id
+        self.created = time.monotonic()
+        self.expires = self.created + ttl_s
+        self.future = None
+        self.finished_at: Optional[float] = None
+
+
+class HandoffStore:
+    """Token -> speculative answer, computed on a small pool so guesses never crowd out real requests"""
+
+    def __init__(self, answer: Callable[[str, str, str], Dict[str, Any]], ttl_s: float = 120.0,
+                 budget_per_minute: int = 30, max_pending: int = 2, max_entries: int = 256,
+                 on_discard: Optional[Callable[[Handoff], None]] = None):
+        self.answer = answer  # answer(message, agent, conversation_id) -> chat API result
+        self.ttl_s = ttl_s
+        self.budget_per_minute = budget_per_minute
+        self.max_pending = max_pending
+        self.max_entries = max_entries
+        self.on_discard = on_discard
+        self.entries: Dict[str, Handoff] = {}
+        self._started: List[float] = []  # monotonic start times within the last minute
+        self._lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_pending, thread_name_prefix='speculate')
+
+    def _pending(self) -> int:
+        return sum(1 for entry in self.entries.values() if entry.future and not entry.future.done())
+
+    def sweep(self):
+        """Drop expired entries; each one is a speculative call nobody used"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [entry for entry in self.entries.values() if entry.expires <= now]
+            for entry in expired:
+                del self.entries[entry.token]
+        for entry in expired:
+            SPECULATIONS.inc(agent=entry.agent, outcome='expired')
+            if not self.on_discard:
+                continue
+            if entry.future and not entry.future.done():
+                # The answer is still running and would write its conversation back after a discard now
+                entry.future.add_done_callback(lambda _, entry=entry: self.on_discard(entry))
+            else:
+                self.on_discard(entry)
+
+    def start(self, agent: str, message: str, conversation_id: str) -> Dict[str, Any]:
+        """Begin a speculative answer; returns {'token'} or {'rejected': reason} when over budget"""
+        self.sweep()
+        now = time.monotonic()
+        with self._lock:
+            self._started = [t for t in self._started if now - t < 60.0]
+            if len(self._started) >= self.budget_per_minute:
+                reason = 'budget'
+            elif self._pending() >= self.max_pending:
+                reason = 'pending'
+            elif len(self.entries) >= self.max_entries:
+                reason = 'capacity'
+            else:
+                reason = None
+                entry = Handoff(secrets.token_urlsafe(16), agent, message, conversation_id, self.ttl_s)
+                entry.future = self.pool.submit(self._run, entry)
+                self.entries[entry.token] = entry
+                self._started.append(now)
+        if reason:
+            SPECULATIONS.inc(agent=agent, outcome=f'rejected_{reason}')
+            return {'rejected': reason}
+        SPECULATIONS.inc(agent=agent, outcome='started')
+        return {'token': entry.token, 'expires_in': self.ttl_s}
+
+    def _run(self, entry: Handoff) -> Dict[str, Any]:
+        try:
+            return self.answer(entry.message, entry.agent, entry.conversation_id)
+        finally:
+            entry.finished_at = time.monotonic()
+
+    def claim(self, token: str, wait_s: float) -> Optional[Dict[str, Any]]:
+        """
+        Take the answer for ``token``, waiting up to ``wait_s`` if it is still being computed.
+
+        Returns None for unknown, expired or already claimed tokens and {'pending': True}
+        when the answer is not ready yet (the token stays claimable until it expires).
+        """
+        self.sweep()
+        with self._lock:
+            entry = self.entries.get(token)
+        if entry is None:
+            return None
+        ready = entry.future.done()
+        started = time.perf_counter()
+        try:
+            result = entry.future.result(timeout=wait_s)
+        except FutureTimeout:
+            return {'pending': True, 'agent': entry.agent}
+        except Exception as e:
+            logger.error("Speculative answer for %s failed: %s", entry.agent, e)
+            result = {'success': False, 'error': 'Speculative answer failed'}
+        with self._lock:
+            if self.entries.pop(token, None) is None:
+                return None  # claimed concurrently
+        waited = time.perf_counter() - started
+        instrumentation.STAGE_LATENCY.observe(waited, stage='handoff_wait', agent=entry.agent)
+        if not result.get('success'):
+            SPECULATIONS.inc(agent=entry.agent, outcome='failed')
+            if self.on_discard:
+                self.on_discard(entry)
+            return {'failed': True, 'agent': entry.agent, 'message': entry.message}
+        SPECULATIONS.inc(agent=entry.agent, outcome='claimed_ready' if ready else 'claimed_waiting')
+        # The part of the answer time the user did not have to wait for
+        SPECULATIVE_SAVED.inc(max(entry.finished_at - entry.created - waited, 0.0), agent=entry.agent)
+        return {'agent': entry.agent, 'message': entry.message, 'result': result}
+
+    def size(self) -> int:
+        return len(self.entries)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
@@ -0,0 +1,258 @@
+"""
+BytEdge Runtime Instrumentation
+Shared by the agent server and the Streamlit app (standard library only)
+Counters, gauges and HDR-style log-linear latency histograms with Prometheus text export
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Latency stages instrumented along the chat path
+STAGES = ('route', 'tools', 'prompt_build', 'upstream_call', 'serialization')
+
+
+def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(key: LabelKey, extra: Iterable[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (f'{name}="{_escape(value)}"' for name, value in pairs)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Counter:
+    """Monotonic counter per label set; increments hold the lock for a single dict update"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return '\n'.join(lines)
+
+
+class Gauge:
+    """Point-in-time value sampled from a callback at export time"""
+
+    def __init__(self, name: str, help_text: str, sampler: Callable[[], Dict[LabelKey, float]]):
+        self.name = name
+        self.help = help_text
+        self.sampler = sampler
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            samples = self.sampler()
+        except Exception:
+            samples = {}
+        for key, value in sorted(samples.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return '\n'.join(lines)
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram: power-of-two magnitudes split into linear sub-buckets.
+
+    With 16 sub-buckets per power of two, recorded values keep ~6% relative precision
+    from 1 µs up to hours, in a fixed-size sparse bucket map.
+    """
+
+    SUB_BUCKETS = 16
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, micros: float) -> int:
+        if micros < 1.0:
+            return 0
+        mantissa, exponent = math.frexp(micros)  # micros = mantissa * 2**exponent, mantissa in [0.5, 1)
+        return exponent * self.SUB_BUCKETS + int((mantissa - 0.5) * 2 * self.SUB_BUCKETS)
+
+    def _upper_bound(self, index: int) -> float:
+        exponent, sub = divmod(index, self.SUB_BUCKETS)
+        return (0.5 + (sub + 1) / (2.0 * self.SUB_BUCKETS)) * 2.0 ** exponent
+
+    def record(self, seconds: float):
+        micros = seconds * 1e6
+        index = self._index(micros)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile in seconds (upper edge of the containing bucket)"""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            seen = 0
+            for index in sorted(self.buckets):
+                seen += self.buckets[index]
+                if seen >= target:
+                    return min(self._upper_bound(index) / 1e6, self.max)
+            return self.max
+
+
+class HistogramFamily:
+    """Latency histograms per label set, exported as a Prometheus summary"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._histograms: Dict[LabelKey, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels) -> LatencyHistogram:
+        key = _label_key(labels)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def observe(self, seconds: float, **labels):
+        self.labels(**labels).record(seconds)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} summary"]
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+        for key, histogram in histograms:
+            for q in LatencyHistogram.QUANTILES:
+                lines.append(f"{self.name}{_format_labels(key, [('quantile', str(q))])} {histogram.quantile(q):.6g}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {histogram.sum:.6g}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines)
+
+
+class MetricsRegistry:
+    """Process-wide collection of named metrics"""
+
+    def __init__(self, namespace: str = 'byteedge'):
+        self.namespace = namespace
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _get_or_create(self, name: str, factory: Callable[[str], object]):
+        full_name = f"{self.namespace}_{name}"
+        metric = self._metrics.get(full_name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(full_name)
+                if metric is None:
+                    metric = factory(full_name)
+                    self._metrics[full_name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str = '') -> Counter:
+        return self._get_or_create(name, lambda full: Counter(full, help_text))
+
+    def histogram(self, name: str, help_text: str = '') -> HistogramFamily:
+        return self._get_or_create(name, lambda full: HistogramFamily(full, help_text))
+
+    def gauge(self, name: str, sampler: Callable[[], Dict[LabelKey, float]], help_text: str = '') -> Gauge:
+        return self._get_or_create(name, lambda full: Gauge(full, help_text, sampler))
+
+    def render_prometheus(self) -> str:
+        uptime = (f"# HELP {self.namespace}_uptime_seconds Process uptime\n"
+                  f"# TYPE {self.namespace}_uptime_seconds gauge\n"
+                  f"{self.namespace}_uptime_seconds {time.time() - self.started_at:.3f}")
+        return '\n'.join([uptime] + [metric.render() for metric in list(self._metrics.values())]) + '\n'
+
+
+registry = MetricsRegistry()
+
+# Standard metrics shared by both applications
+REQUESTS = registry.counter('requests_total', 'Agent requests by agent and outcome')
+STAGE_LATENCY = registry.histogram('stage_latency_seconds', 'Latency per agent and request stage')
+UPSTREAM_TOKENS = registry.counter('upstream_tokens_total', 'Upstream model tokens by agent, direction and source')
+CACHE_REQUESTS = registry.counter('cache_requests_total', 'Cache lookups by cache and result')
+
+
+@contextmanager
+def timed(stage: str, agent: str = 'router'):
+    """Record the wall time of a block into the per-agent stage histogram"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.observe(time.perf_counter() - started, stage=stage, agent=agent)
+
+
+def record_tokens(agent: str, response, prompt: str = '', text: str = ''):
+    """Count upstream tokens, preferring the SDK's usage metadata over a chars/4 estimate"""
+    usage = getattr(response, 'usage_metadata', None)
+    prompt_tokens = getattr(usage, 'prompt_token_count', None) if usage else None
+    output_tokens = getattr(usage, 'candidates_token_count', None) if usage else None
+    if prompt_tokens is not None and output_tokens is not None:
+        UPSTREAM_TOKENS.inc(prompt_tokens, agent=agent, direction='input', source='reported')
+        UPSTREAM_TOKENS.inc(output_tokens, agent=agent, direction='output', source='reported')
+    else:
+        UPSTREAM_TOKENS.inc(len(prompt) // 4, agent=agent, direction='input', source='estimated')
+        UPSTREAM_TOKENS.inc(len(text) // 4, agent=agent, direction='output', source='estimated')
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def cache_hit_rate(cache: str) -> Optional[float]:
+    hits = CACHE_REQUESTS.value(cache=cache, result='hit')
+    total = hits + CACHE_REQUESTS.value(cache=cache, result='miss')
+    return hits / total if total else None
+
+
+def latency_quantile(q: float, stage: Optional[str] = None) -> float:
+    """Quantile in seconds across all agents for one stage (or every stage)"""
+    merged = LatencyHistogram()
+    with STAGE_LATENCY._lock:
+        histograms = list(STAGE_LATENCY._histograms.items())
+    for key, histogram in histograms:
+        if stage is not None and dict(key).get('stage') != stage:
+            continue
+        with histogram._lock:
+            for index, count in histogram.buckets.items():
+                merged.buckets[index] = merged.buckets.get(index, 0) + count
+            merged.count += histogram.count
+            merged.max = max(merged.max, histogram.max)
+    return merged.quantile(q)
@@ -0,0 +1,259 @@
+"""
+BytEdge Simulation Job Queue
+Local priority queue feeding a bounded pool of worker processes
+Per-job timeouts and cancellation, TTL result store and parameter deduplication
+"""
+
+import hashlib
+import importlib
+import inspect
+import itertools
+import json
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = {'interactive': 0, 'batch': 1}
+TERMINAL_STATES = ('completed', 'failed', 'cancelled', 'timeout')
+
+
+def resolve(handler: Union[str, Callable]) -> Callable:
+    """A job function, importing 'module:function' references on first use"""
+    if callable(handler):
+        return handler
+    module, _, name = handler.partition(':')
+    return getattr(importlib.import_module(module), name)
+
+
+def _run_in_worker(conn, func: Callable, params: Dict[str, Any]):
+    """Worker process body: run the job and stream progress and the outcome over a pipe"""
+    try:
+        if 'progress' in inspect.signature(func).parameters:
+            result = func(params, progress=lambda fraction: conn.send(('progress', float(fraction))))
+        else:
+            result = func(params)
+        conn.send(('result', result))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class Job:
+    """State of one submitted simulation"""
+
+    def __init__(self, job_id: str, kind: str, params: Dict[str, Any], priority: str,
+                 timeout_s: float, dedup_key: str):
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.priority = priority
+        self.timeout_s = timeout_s
+        self.dedup_key = dedup_key
+        self.status = 'queued'
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = False
+        self.changed = threading.Condition()
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            'job_id': self.id,
+            'kind': self.kind,
+            'priority': self.priority,
+            'status': self.status,
+            'progress': round(self.progress, 4),
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result and self.status == 'completed':
+            data['result'] = self.result
+        return data
+
+
+class JobQueue:
+    """Process-local simulation job subsystem (no external broker)"""
+
+    def __init__(self, max_workers: int = 2, result_ttl_s: float = 600.0, default_timeout_s: float = 120.0):
+        self.max_workers = max_workers
+        self.result_ttl_s = result_ttl_s
+        self.default_timeout_s = default_timeout_s
+        self.handlers: Dict[str, Union[str, Callable]] = {}
+        self.jobs: Dict[str, Job] = {}
+        self._by_key: Dict[str, str] = {}
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._slots = threading.Semaphore(max_workers)
+        self._lock = threading.Lock()
+        self._dispatcher = None
+
+    def register(self, kind: str, func: Union[str, Callable]):
+        """
+        Register a module-level job function taking a params dict (and optionally progress).
+
+        A 'module:function' string defers importing the (often heavy) module until the first
+        job of that kind; it is imported in this process, so later forked workers inherit it.
+        """
+        self.handlers[kind] = func
+
+    def start(self):
+        if self._dispatcher is None:
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name='job-dispatcher', daemon=True)
+            self._dispatcher.start()
+
+    @staticmethod
+    def dedup_key(kind: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps({'kind': kind, 'params': params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def submit(self, kind: str, params: Dict[str, Any], priority: str = 'interactive',
+               timeout_s: Optional[float] = None) -> Dict[str, Any]:
+        """Queue a job, or return the live/cached job with identical parameters"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}. Available: {', '.join(self.handlers)}")
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority must be one of: {', '.join(PRIORITIES)}")
+        timeout_s = float(timeout_s or self.default_timeout_s)
+        if timeout_s <= 0:
+            raise ValueError("timeout_s must be positive")
+
+        key = self.dedup_key(kind, params)
+        with self._lock:
+            self._purge_expired()
+            existing = self.jobs.get(self._by_key.get(key, ''))
+            if existing and existing.status in ('queued', 'running', 'completed'):
+                return {'job': existing, 'deduplicated': True}
+
+            job = Job(uuid.uuid4().hex, kind, params, priority, timeout_s, key)
+            self.jobs[job.id] = job
+            self._by_key[key] = job.id
+        self._queue.put((PRIORITIES[priority], next(self._sequence), job.id))
+        self.start()
+        return {'job': job, 'deduplicated': False}
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._purge_expired()
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job immediately or terminate a running one"""
+        job = self.get(job_id)
+        if job is None or job.status in TERMINAL_STATES:
+            return False
+        job.cancel_requested = True
+        if job.status == 'queued':
+            self._finish(job, 'cancelled')
+        return True
+
+    def depth(self) -> Dict[str, int]:
+        """Queued and running job counts"""
+        with self._lock:
+            statuses = [job.status for job in self.jobs.values()]
+        return {'queued': statuses.count('queued'), 'running': statuses.count('running')}
+
+    def wait(self, job: Job, timeout: float) -> bool:
+        """Block until the job changes state or progress, or the timeout elapses"""
+        with job.changed:
+            return job.changed.wait(timeout)
+
+    def _purge_expired(self):
+        cutoff = time.time() - self.result_ttl_s
+        expired = [job_id for job_id, job in self.jobs.items()
+                   if job.finished_at is not None and job.finished_at < cutoff]
+        for job_id in expired:
+            job = self.jobs.pop(job_id)
+            if self._by_key.get(job.dedup_key) == job_id:
+                del self._by_key[job.dedup_key]
+
+    def _finish(self, job: Job, status: str, result: Any = None, error: Optional[str] = None):
+        with job.changed:
+            if job.status in TERMINAL_STATES:
+                return
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            if status == 'completed':
+                job.progress = 1.0
+            job.changed.notify_all()
+        logger.info("Job %s (%s) finished with status %s", job.id, job.kind, status)
+
+    def _dispatch_loop(self):
+        while True:
+            self._slots.acquire()
+            _, _, job_id = self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.status != 'queued':
+                self._slots.release()
+                continue
+            threading.Thread(target=self._supervise, args=(job,), name=f'job-{job.id[:8]}', daemon=True).start()
+
+    def _supervise(self, job: Job):
+        """Run one job in its own worker process, enforcing timeout and cancellation"""
+        try:
+            with job.changed:
+                # Cancelled after the dispatcher picked it up: no worker process, and it never shows as running
+                if job.status in TERMINAL_STATES or job.cancel_requested:
+                    return
+                job.status = 'running'
+                job.started_at = time.time()
+                job.changed.notify_all()
+            parent, child = multiprocessing.Pipe(duplex=False)
+            func = self.handlers[job.kind] = resolve(self.handlers[job.kind])
+            process = multiprocessing.Process(target=_run_in_worker, args=(child, func, job.params),
+                                              daemon=True)
+            process.start()
+            child.close()
+            deadline = job.started_at + job.timeout_s
+
+            while True:
+                if job.cancel_requested:
+                    process.terminate()
+                    self._finish(job, 'cancelled')
+                    break
+                if time.time() > deadline:
+                    process.terminate()
+                    self._finish(job, 'timeout', error=f"Job exceeded {job.timeout_s:g}s timeout")
+                    break
+                if not parent.poll(0.05):
+                    if not process.is_alive() and not parent.poll():
+                        self._finish(job, 'failed', error=f"Worker exited with code {process.exitcode}")
+                        break
+                    continue
+                try:
+                    message, value = parent.recv()
+                except EOFError:
+                    self._finish(job, 'failed', error="Worker closed the result channel")
+                    break
+                if message == 'progress':
+                    with job.changed:
+                        job.progress = value
+                        job.changed.notify_all()
+                elif message == 'result':
+                    self._finish(job, 'completed', result=value)
+                    break
+                else:
+                    self._finish(job, 'failed', error=value)
+                    break
+
+            process.join(timeout=1.0)
+            parent.close()
+        except Exception as e:
+            logger.error("Job %s supervision failed: %s", job.id, e)
+            self._finish(job, 'failed', error=str(e))
+        finally:
+            self._slots.release()
@@ -0,0 +1,207 @@
+"""
+BytEdge Knowledge Base
+Curated per-agent answers (knowledge/<agent>.json) behind a BM25 inverted index
+Built once, persisted next to the sources and rebuilt only when they change
+"""
+
+import glob
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional
+
+INDEX_VERSION = 1
+K1 = 1.2
+B = 0.75
+# Term-frequency multipliers per field (a simplified BM25F)
+FIELD_WEIGHTS = {'title': 3, 'questions': 3, 'keywords': 2, 'answer': 1}
+
+_WORD = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a about an and are as at be between by can could do does for from how i in into is it its me my of on or
+should so than that the their them there these this to vs was what when where which while who why will with
+would you your explain tell give compare
+""".split())
+
+
+def _stem(word: str) -> str:
+    """Light suffix stripping so 'batteries', 'charging' and 'charged' meet their stems"""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 5 and word.endswith('ing'):
+        return word[:-3]
+    if len(word) > 4 and word.endswith('ed'):
+        return word[:-2]
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    tokens = []
+    for word in _WORD.findall(text.lower()):
+        parts = [word] + (re.split(r"[-']", word) if '-' in word else [])
+        tokens.extend(_stem(part) for part in parts if part not in STOPWORDS and len(part) > 1)
+    return tokens
+
+
+class AgentIndex:
+    """BM25 postings for one agent with weights precomputed at build time"""
+
+    def __init__(self, entries: List[Dict[str, Any]], postings: Dict[str, List[List[float]]],
+                 idf: Dict[str, float], unknown_idf: float):
+        self.entries = entries
+        self.postings = postings  # term -> [[doc, weight], ...]
+        self.idf = idf
+        self.unknown_idf = unknown_idf
+
+    @classmethod
+    def build(cls, entries: List[Dict[str, Any]]) -> 'AgentIndex':
+        term_freqs = []
+        for entry in entries:
+            tf: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                value = entry.get(field, '')
+                text = ' '.join(value) if isinstance(value, list) else value
+                for term in tokenize(text):
+                    tf[term] += weight
+            term_freqs.append(tf)
+
+        n = len(entries)
+        lengths = [sum(tf.values()) for tf in term_freqs]
+        average = (sum(lengths) / n) if n else 1.0
+        df: Counter = Counter(term for tf in term_freqs for term in tf)
+        idf = {term: math.log(1 + (n - count + 0.5) / (count + 0.5)) for term, count in df.items()}
+        postings = defaultdict(list)
+        for doc, tf in enumerate(term_freqs):
+            norm = K1 * (1 - B + B * lengths[doc] / average)
+            for term, freq in tf.items():
+                postings[term].append([doc, round(idf[term] * freq * (K1 + 1) / (freq + norm), 6)])
+        return cls(entries, dict(postings), idf, math.log(1 + (n + 0.5) / 0.5))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'entries': self.entries, 'postings': self.postings, 'idf': self.idf, 'unknown_idf': self.unknown_idf}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AgentIndex':
+        return cls(data['entries'], data['postings'], data['idf'], data['unknown_idf'])
+
+    def search(self, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Best entries with their BM25 score and coverage.
+
+        Coverage is the share of the query's IDF mass found in the entry; query terms the
+        knowledge base has never seen count at the maximum IDF, so off-topic questions score low.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, float] = defaultdict(float)
+        total_idf = 0.0
+        for term in terms:
+            total_idf += self.idf.get(term, self.unknown_idf)
+            for doc, weight in self.postings.get(term, ()):
+                scores[doc] += weight
+                matched[doc] += self.idf[term]
+        ranked = sorted(scores, key=scores.get, reverse=True)[:limit]
+        return [{
+            'id': self.entries[doc]['id'],
+            'title': self.entries[doc]['title'],
+            'answer': self.entries[doc]['answer'],
+            'score': round(scores[doc], 4),
+            'coverage': round(matched[doc] / total_idf, 4),
+        } for doc in ranked]
+
+
+class KnowledgeBase:
+    """All agents' indexes, loaded from the persisted index when the sources are unchanged"""
+
+    def __init__(self, source_dir: str, index_path: Optional[str] = None,
+                 instant_coverage: float = 0.8, fallback_coverage: float = 0.3, instant_margin: float = 1.15):
+        self.source_dir = source_dir
+        self.index_path = index_path or os.path.join(source_dir, 'index', 'bm25.json')
+        self.instant_coverage = instant_coverage
+        self.fallback_coverage = fallback_coverage
+        self.instant_margin = instant_margin
+        self.indexes: Dict[str, AgentIndex] = {}
+        self.loaded_from_cache = False
+        self.build_ms = 0.0
+
+    def _sources(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.source_dir, '*.json')))
+
+    def _fingerprint(self, sources: List[str]) -> str:
+        digest = hashlib.sha256(f"{INDEX_VERSION}:{K1}:{B}:{sorted(FIELD_WEIGHTS.items())}".encode())
+        for path in sources:
+            digest.update(os.path.basename(path).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def load(self) -> 'KnowledgeBase':
+        started = time.perf_counter()
+        sources = self._sources()
+        fingerprint = self._fingerprint(sources)
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('fingerprint') == fingerprint:
+                self.indexes = {agent: AgentIndex.from_dict(index) for agent, index in data['agents'].items()}
+                self.loaded_from_cache = True
+        except (OSError, ValueError, KeyError):
+            pass
+
+        if not self.loaded_from_cache:
+            for path in sources:
+                with open(path, encoding='utf-8') as f:
+                    source = json.load(f)
+                self.indexes[source['agent']] = AgentIndex.build(source['entries'])
+            self._persist(fingerprint)
+        self.build_ms = (time.perf_counter() - started) * 1000.0
+        return self
+
+    def _persist(self, fingerprint: str):
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        payload = {'version': INDEX_VERSION, 'fingerprint': fingerprint,
+                   'agents': {agent: index.to_dict() for agent, index in self.indexes.items()}}
+        temporary = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporary, self.index_path)
+
+    def search(self, agent: str, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+        index = self.indexes.get(agent)
+        return index.search(query, limit) if index else []
+
+    def best(self, agent: str, query: str, min_coverage: float, margin: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Top entry if its coverage clears ``min_coverage`` and it beats the runner-up by ``margin``"""
+        results = self.search(agent, query, limit=2)
+        if not results or results[0]['coverage'] < min_coverage:
+            return None
+        if len(results) > 1 and results[0]['score'] < margin * results[1]['score']:
+            return None
+        return results[0]
+
+    def instant_answer(self, agent: str, query: str) -> Optional[Dict[str, Any]]:
+        """A match confident enough to answer without calling the model"""
+        return self.best(agent, query, self.instant_coverage, self.instant_margin)
+
+    def fallback_answer(self, agent: str, query: str) -> Optional[Dict[str, Any]]:
+        return self.best(agent, query, self.fallback_coverage)
+
+    def search_all(self, query: str) -> Optional[Dict[str, Any]]:
+        """Best fallback-quality entry across every agent, tagged with its agent"""
+        best = None
+        for agent in self.indexes:
+            hit = self.fallback_answer(agent, query)
+            if hit and (best is None or (hit['coverage'], hit['score']) > (best['coverage'], best['score'])):
+                best = {**hit, 'agent': agent}
+        return best
+
+    def sizes(self) -> Dict[str, int]:
+        return {agent: len(index.entries) for agent, index in self.indexes.items()}
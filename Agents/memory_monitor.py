@@ -0,0 +1,215 @@
+"""
+BytEdge Memory Monitor
+Periodic tracemalloc snapshot diffs, deep sizing of in-memory structures
+and process RSS / garbage-collector statistics for leak detection
+"""
+
+import collections
+import gc
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def deep_sizeof(obj, max_objects: int = 1_000_000) -> Dict[str, int]:
+    """Recursive size in bytes of containers and plain objects, counting shared objects once"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(current)
+        else:
+            if hasattr(current, '__dict__'):
+                stack.append(vars(current))
+            for slot in getattr(type(current), '__slots__', ()):
+                if hasattr(current, slot):
+                    stack.append(getattr(current, slot))
+    return {'bytes': total, 'objects': len(seen), 'truncated': len(seen) >= max_objects}
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux /proc), falling back to the peak RSS elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+def gc_stats() -> Dict[str, Any]:
+    counts = gc.get_count()
+    return {
+        'pending': {f'gen{i}': count for i, count in enumerate(counts)},
+        'generations': [{'generation': i, **stats} for i, stats in enumerate(gc.get_stats())],
+        'garbage': len(gc.garbage),
+    }
+
+
+def _diff_rows(current: tracemalloc.Snapshot, previous: tracemalloc.Snapshot, limit: int) -> List[Dict[str, Any]]:
+    rows = []
+    for stat in current.compare_to(previous, 'lineno')[:limit]:
+        frame = stat.traceback[0]
+        rows.append({
+            'location': f"{frame.filename}:{frame.lineno}",
+            'size_bytes': stat.size,
+            'size_diff_bytes': stat.size_diff,
+            'count': stat.count,
+            'count_diff': stat.count_diff,
+        })
+    return rows
+
+
+class MemoryMonitor:
+    """Background sampler of allocation growth and structure sizes"""
+
+    def __init__(self, interval_s: float = 300.0, top_n: int = 25, trace_allocations: bool = False,
+                 frames: int = 1):
+        self.interval_s = interval_s
+        self.top_n = top_n
+        self.trace_allocations = trace_allocations
+        self.frames = frames
+        self.structures: Dict[str, Callable[[], Any]] = {}
+        self.sizes: Dict[str, Dict[str, int]] = {}
+        self.last_diff: List[Dict[str, Any]] = []
+        self.last_sampled_at = None
+        self.started_rss = rss_bytes()
+        self._snapshot = None
+        self._snapshot_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def track(self, name: str, getter: Callable[[], Any]):
+        """Size the object returned by ``getter`` on every sample"""
+        self.structures[name] = getter
+
+    def start(self):
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='memory-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                logger.warning("Memory sample failed: %s", e)
+            if self._stop.wait(self.interval_s):
+                return
+
+    def measure_structures(self) -> Dict[str, Dict[str, int]]:
+        sizes = {}
+        for name, getter in self.structures.items():
+            for _ in range(3):
+                try:
+                    sizes[name] = deep_sizeof(getter())
+                    break
+                except RuntimeError:
+                    continue  # container resized by a request thread mid-walk; retry
+        self.sizes = sizes
+        return sizes
+
+    def take_diff(self) -> Dict[str, Any]:
+        """Top allocation growth since the previous snapshot; the new snapshot becomes the baseline"""
+        if not tracemalloc.is_tracing():
+            return {'tracing': False, 'top': []}
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        now = time.time()
+        with self._lock:
+            previous, previous_at = self._snapshot, self._snapshot_at
+            self._snapshot, self._snapshot_at = snapshot, now
+        traced, peak = tracemalloc.get_traced_memory()
+        if previous is None:
+            return {'tracing': True, 'baseline_taken_at': now, 'traced_bytes': traced, 'peak_bytes': peak, 'top': []}
+        return {
+            'tracing': True,
+            'since': previous_at,
+            'interval_s': round(now - previous_at, 3),
+            'traced_bytes': traced,
+            'peak_bytes': peak,
+            'top': _diff_rows(snapshot, previous, self.top_n),
+        }
+
+    def sample(self):
+        """One periodic pass: structure sizes, RSS and the tracemalloc diff"""
+        sizes = self.measure_structures()
+        diff = self.take_diff()
+        self.last_diff = diff['top']
+        self.last_sampled_at = time.time()
+        growth = sum(row['size_diff_bytes'] for row in diff['top'] if row['size_diff_bytes'] > 0)
+        rss = rss_bytes()
+        logger.info("Memory sample - RSS: %s bytes, traced growth: %s bytes", rss, growth,
+                    extra={'rss_bytes': rss,
+                           'structure_bytes': {name: size['bytes'] for name, size in sizes.items()},
+                           'top_growth': diff['top'][:5]})
+
+    def report(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Current RSS, GC statistics, fresh structure sizes and allocators since the last snapshot"""
+        diff = self.take_diff()
+        if limit is not None:
+            diff['top'] = diff['top'][:limit]
+        rss = rss_bytes()
+        return {
+            'rss_bytes': rss,
+            'rss_growth_bytes': rss - self.started_rss if rss is not None and self.started_rss is not None else None,
+            'gc': gc_stats(),
+            'structures': self.measure_structures(),
+            'allocations': diff,
+            'last_periodic_sample_at': self.last_sampled_at,
+            'last_periodic_top': self.last_diff[:limit] if limit is not None else self.last_diff,
+        }
+
+    def register_metrics(self, registry):
+        """Export RSS, GC and structure sizes as gauges (sizes come from the latest sample)"""
+        registry.gauge('process_resident_memory_bytes', lambda: {(): rss_bytes() or 0},
+                       'Resident set size of the server process')
+        registry.gauge('gc_collections', lambda: {(('generation', str(i)),): stats['collections']
+                                                  for i, stats in enumerate(gc.get_stats())},
+                       'Garbage collections run per generation')
+        registry.gauge('gc_uncollectable', lambda: {(('generation', str(i)),): stats['uncollectable']
+                                                    for i, stats in enumerate(gc.get_stats())},
+                       'Uncollectable objects found per generation')
+        registry.gauge('gc_pending_objects', lambda: {(('generation', str(i)),): count
+                                                      for i, count in enumerate(gc.get_count())},
+                       'Allocations pending per generation since the last collection')
+        registry.gauge('memory_structure_bytes', lambda: {(('structure', name),): size['bytes']
+                                                          for name, size in self.sizes.items()},
+                       'Deep size of in-memory structures at the last sample')
+        registry.gauge('tracemalloc_traced_bytes',
+                       lambda: {(): tracemalloc.get_traced_memory()[0]} if tracemalloc.is_tracing() else {},
+                       'Memory currently traced by tracemalloc')
@@ -0,0 +1,208 @@
+"""
+BytEdge Model Tiering
+Routes short, definitional or well-covered questions to a fast model with a predicted output budget,
+sends complex design questions to the strong model, and escalates fast answers that fail or run out of budget
+"""
+
+import math
+import re
+import threading
+from collections import deque
+from typing import Dict, Any, Deque, Optional, Tuple
+
+import instrumentation
+
+TIER_DECISIONS = instrumentation.registry.counter(
+    'model_tier_decisions_total', 'Upstream answers by agent, tier and the signal that chose it')
+TIER_ESCALATIONS = instrumentation.registry.counter(
+    'model_tier_escalations_total', 'Fast-tier answers re-asked on the strong tier by agent and reason')
+TIER_LATENCY = instrumentation.registry.histogram(
+    'model_tier_latency_seconds', 'Upstream call latency by agent and tier')
+TIER_TOKENS = instrumentation.registry.counter(
+    'model_tier_tokens_total', 'Upstream tokens by agent, tier and direction')
+
+DEFINITIONAL = re.compile(r"^\s*(what\s+(is|are|does)|what's|define|definition of|meaning of|"
+                          r"how many|how much)\b", re.IGNORECASE)
+COMPLEX = re.compile(r"\b(design|optimi[sz]\w*|trade-?offs?|compare|comparison|versus|vs\.?|walk me through|"
+                     r"step[- ]by[- ]step|strategy|architecture|analy[sz]\w*|evaluate|recommend\w*|"
+                     r"pros and cons|why)\b", re.IGNORECASE)
+REASONS = ('forced', 'complex', 'long', 'history', 'definitional', 'short', 'confident', 'default')
+ESCALATION_REASONS = ('error', 'empty', 'truncated')
+TRUNCATED = ('MAX_TOKENS', '2')  # finish reason name, or its enum value in older SDKs
+
+
+def usage(response, prompt: str, text: str) -> Tuple[int, int]:
+    """(input, output) tokens, preferring the SDK's usage metadata over a chars/4 estimate"""
+    meta = getattr(response, 'usage_metadata', None)
+    prompt_tokens = getattr(meta, 'prompt_token_count', None) if meta else None
+    output_tokens = getattr(meta, 'candidates_token_count', None) if meta else None
+    if prompt_tokens is not None and output_tokens is not None:
+        return prompt_tokens, output_tokens
+    return len(prompt) // 4, len(text) // 4
+
+
+def finish_reason(response) -> Optional[str]:
+    candidates = getattr(response, 'candidates', None)
+    if not candidates:
+        return None
+    reason = getattr(candidates[0], 'finish_reason', None)
+    if reason is None:
+        return None
+    return getattr(reason, 'name', None) or str(reason)
+
+
+class Tier:
+    """One upstream model with its output-token cap and, when registered, its prompt-prefix handles"""
+
+    def __init__(self, name: str, model_name: str, max_tokens: int, model=None, prefixes=None):
+        self.name = name
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.model = model
+        self.prefixes = prefixes
+
+
+class Decision:
+    """The tier and output budget chosen for one answer; ``escalated`` names why it moved up, if it did"""
+
+    def __init__(self, tier: Tier, budget: int, reason: str):
+        self.tier = tier
+        self.budget = budget
+        self.reason = reason
+        self.escalated: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'tier': self.tier.name, 'model': self.tier.model_name, 'budget': self.budget,
+                'reason': self.reason, 'escalated': self.escalated}
+
+
+class OutputBudget:
+    """Predicts an agent's output budget from a high quantile of its recent fast-tier answer lengths"""
+
+    def __init__(self, window: int = 200, quantile: float = 0.9, headroom: float = 1.25,
+                 floor: int = 256, min_samples: int = 20):
+        self.window = window
+        self.quantile = quantile
+        self.headroom = headroom
+        self.floor = floor
+        self.min_samples = min_samples
+        self.samples: Dict[str, Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, agent: str, tokens: int):
+        with self._lock:
+            self.samples.setdefault(agent, deque(maxlen=self.window)).append(tokens)
+
+    def predict(self, agent: str, cap: int) -> int:
+        """``cap`` until enough answers are seen, then the quantile with headroom, within [floor, cap]"""
+        samples = self.samples.get(agent)
+        if not samples or len(samples) < self.min_samples:
+            return cap
+        ordered = sorted(samples)
+        observed = ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+        return max(self.floor, min(cap, int(math.ceil(observed * self.headroom))))
+
+
+class TierPolicy:
+    """Chooses fast or strong per question from its wording, length, history depth and domain coverage"""
+
+    def __init__(self, fast: Tier, strong: Tier, short_words: int = 12, max_words: int = 40,
+                 max_history: int = 2, min_confidence: float = 0.6, budget: Optional[OutputBudget] = None):
+        self.fast = fast
+        self.strong = strong
+        self.tiers = {fast.name: fast, strong.name: strong}
+        self.short_words = short_words
+        self.max_words = max_words
+        self.max_history = max_history
+        self.min_confidence = min_confidence
+        self.budget = budget or OutputBudget(floor=min(256, fast.max_tokens))
+        self.agents = set()
+
+    def choose(self, agent: str, message: str, history_depth: int = 0, confidence: float = 0.0,
+               force: Optional[str] = None) -> Decision:
+        """
+        Complex wording, long questions and deep conversations go to the strong tier; otherwise
+        definitional, short or well-covered questions (``confidence`` is the best knowledge-base coverage)
+        go to the fast tier with a predicted budget
+        """
+        words = len(message.split())
+        if force:
+            tier, reason = self.tiers[force], 'forced'
+        elif COMPLEX.search(message) or message.count('?') > 1:
+            tier, reason = self.strong, 'complex'
+        elif words > self.max_words:
+            tier, reason = self.strong, 'long'
+        elif history_depth > self.max_history:
+            tier, reason = self.strong, 'history'
+        elif DEFINITIONAL.search(message):
+            tier, reason = self.fast, 'definitional'
+        elif words <= self.short_words:
+            tier, reason = self.fast, 'short'
+        elif confidence >= self.min_confidence:
+            tier, reason = self.fast, 'confident'
+        else:
+            tier, reason = self.strong, 'default'
+        budget = self.budget.predict(agent, tier.max_tokens) if tier is self.fast else tier.max_tokens
+        TIER_DECISIONS.inc(agent=agent, tier=tier.name, reason=reason)
+        self.agents.add(agent)
+        return Decision(tier, budget, reason)
+
+    def escalation(self, decision: Decision, text: Optional[str], response) -> Optional[str]:
+        """Why a fast answer must go to the strong tier: 'empty' or 'truncated' (it hit its budget), else None"""
+        if decision.tier is not self.fast:
+            return None
+        if not text or not text.strip():
+            return 'empty'
+        reason = finish_reason(response)
+        if reason is not None:
+            return 'truncated' if reason in TRUNCATED else None
+        return 'truncated' if usage(response, '', text)[1] >= decision.budget else None
+
+    def escalate(self, agent: str, decision: Decision, reason: str) -> Decision:
+        """The strong-tier decision replacing ``decision``, counted as an escalation"""
+        decision.escalated = reason
+        TIER_ESCALATIONS.inc(agent=agent, reason=reason)
+        escalated = Decision(self.strong, self.strong.max_tokens, f'escalated:{reason}')
+        escalated.escalated = reason
+        return escalated
+
+    def record(self, agent: str, decision: Decision, response, prompt: str, text: str, seconds: float):
+        """Latency and tokens of one upstream call; complete fast answers feed the budget prediction"""
+        input_tokens, output_tokens = usage(response, prompt, text)
+        tier = decision.tier.name
+        TIER_LATENCY.observe(seconds, agent=agent, tier=tier)
+        TIER_TOKENS.inc(input_tokens, agent=agent, tier=tier, direction='input')
+        TIER_TOKENS.inc(output_tokens, agent=agent, tier=tier, direction='output')
+        if decision.tier is self.fast:
+            # A truncated answer only shows the budget was too small, so it counts at the tier's cap
+            truncated = self.escalation(decision, text, response) == 'truncated'
+            self.budget.observe(agent, decision.tier.max_tokens if truncated else output_tokens)
+
+    def status(self) -> Dict[str, Any]:
+        """Per tier and agent: answers, escalation rate, median and p90 latency, mean tokens and the current budget"""
+        tiers = {}
+        for name, tier in self.tiers.items():
+            rows = {}
+            for agent in sorted(self.agents):
+                answered = sum(TIER_DECISIONS.value(agent=agent, tier=name, reason=reason) for reason in REASONS)
+                latency = TIER_LATENCY.labels(agent=agent, tier=name)
+                if not answered and not latency.count:
+                    continue
+                calls = max(latency.count, 1)
+                row = {
+                    'answers': answered,
+                    'calls': latency.count,
+                    'p50_ms': round(latency.quantile(0.5) * 1000.0, 1) if latency.count else None,
+                    'p90_ms': round(latency.quantile(0.9) * 1000.0, 1) if latency.count else None,
+                    'input_tokens_per_call': round(TIER_TOKENS.value(agent=agent, tier=name, direction='input') / calls),
+                    'output_tokens_per_call': round(TIER_TOKENS.value(agent=agent, tier=name, direction='output') / calls),
+                }
+                if tier is self.fast:
+                    escalations = {reason: TIER_ESCALATIONS.value(agent=agent, reason=reason)
+                                   for reason in ESCALATION_REASONS}
+                    row['escalations'] = escalations
+                    row['escalation_rate'] = round(sum(escalations.values()) / answered, 3) if answered else None
+                    row['budget'] = self.budget.predict(agent, tier.max_tokens)
+                rows[agent] = row
+            tiers[name] = {'model': tier.model_name, 'max_tokens': tier.max_tokens, 'agents': rows}
+        return {'tiers': tiers}
@@ -0,0 +1,49 @@
+"""
+BytEdge Page Builder
+Renders the home page and one chat page per agent from AGENT_CONFIGS and the Jinja templates
+Every page shares agent-core.js; agent-specific data is a small inline config
+"""
+
+import os
+from typing import Dict, Any, Optional
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+def short_name(agent: Dict[str, Any]) -> str:
+    """'ClutchEdge AI' -> 'ClutchEdge'"""
+    return agent['name'].removesuffix(' AI')
+
+
+def client_config(key: str, agent: Dict[str, Any], static: bool = False) -> Dict[str, Optional[str]]:
+    """
+    The subset of an agent's registry entry the browser needs. Static builds (GitHub Pages) have no
+    server, so the page answers from ``<agent>-knowledge.json`` instead of the chat API
+    """
+    return {
+        'name': agent['name'],
+        'domain': key,
+        'avatar': agent['avatar'],
+        'apiEndpoint': None if static else f'/api/chat/{key}',
+        'wsEndpoint': None if static else '/api/ws',
+        'knowledgeUrl': f'{key}-knowledge.json' if static else None,
+        'exportName': short_name(agent),
+    }
+
+
+def render_pages(configs: Dict[str, Dict[str, Any]], static: bool = False) -> Dict[str, str]:
+    """HTML for index.html and every <agent>-edge.html, keyed by file name"""
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=True, undefined=StrictUndefined,
+                      trim_blocks=True, lstrip_blocks=True)
+    pages = {'index.html': env.get_template('index.html').render(agents=configs)}
+    template = env.get_template('agent-page.html')
+    for key, agent in configs.items():
+        pages[f'{key}-edge.html'] = template.render(
+            key=key,
+            agent=agent,
+            short_name=short_name(agent),
+            client_config=client_config(key, agent, static),
+        )
+    return pages
@@ -0,0 +1,191 @@
+"""
+BytEdge Prompt Prefix Handles
+Registers each agent's static prompt prefix (system prompt and tool guide) with the upstream once,
+so chat calls send only the per-request delta; handles follow the prefix and are replaced when it changes
+"""
+
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+from typing import Dict, Any, Optional, Tuple
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+PREFIX_REQUESTS = instrumentation.registry.counter(
+    'prompt_prefix_requests_total', 'Upstream calls by agent and prefix mode (cached, instruction, inline)')
+PREFIX_TOKENS_SAVED = instrumentation.registry.counter(
+    'prompt_prefix_tokens_saved_total', 'Prefix input tokens served from a cached context instead of billed as input')
+PREFIX_REGISTRATIONS = instrumentation.registry.counter(
+    'prompt_prefix_registrations_total', 'Prefix handles created by agent and outcome (created, replaced, failed)')
+UPSTREAM_BY_MODE = instrumentation.registry.histogram(
+    'upstream_prefix_latency_seconds', 'Upstream call latency by agent and prefix mode')
+
+
+def prefix_version(prefix: str) -> str:
+    return hashlib.sha256(prefix.encode()).hexdigest()[:12]
+
+
+def estimate_tokens(text: str) -> int:
+    """Same chars/4 estimate the token counters use when the SDK reports no usage"""
+    return len(text) // 4
+
+
+class PrefixHandle:
+    """A model bound to one registered prefix; ``model.generate_content`` takes only the delta"""
+
+    def __init__(self, agent: str, version: str, model, mode: str, tokens: int, resource=None):
+        self.agent = agent
+        self.version = version
+        self.model = model
+        self.mode = mode  # 'cached' (server-side cached context) or 'instruction' (system instruction)
+        self.tokens = tokens
+        self.resource = resource  # upstream object to release when the handle is replaced
+
+
+class GeminiPrefixes:
+    """Gemini backend: cached contents for prefixes large enough to cache, system instructions otherwise"""
+
+    def __init__(self, model_name: str, generation_config, cache_min_tokens: int = 32768, cache_ttl_s: int = 3600):
+        self.model_name = model_name
+        self.generation_config = generation_config
+        self.cache_min_tokens = cache_min_tokens
+        self.cache_ttl_s = cache_ttl_s
+
+    def create(self, agent: str, prefix: str, tokens: int) -> Tuple[Any, str, Any]:
+        import google.generativeai as genai
+
+        if tokens >= self.cache_min_tokens:
+            from google.generativeai import caching
+            cache = caching.CachedContent.create(
+                model=self.model_name, display_name=f'byteedge-{agent}', system_instruction=prefix,
+                ttl=timedelta(seconds=self.cache_ttl_s))
+            model = genai.GenerativeModel.from_cached_content(cache, generation_config=self.generation_config)
+            return model, 'cached', cache
+        model = genai.GenerativeModel(self.model_name, generation_config=self.generation_config,
+                                      system_instruction=prefix)
+        return model, 'instruction', None
+
+    def release(self, resource):
+        if resource is not None:
+            resource.delete()
+
+
+class _PrefixedModel:
+    """Stand-in handle model: puts the prefix back in front of the delta before calling the base model"""
+
+    def __init__(self, base, prefix: str):
+        self.base = base
+        self.prefix = prefix
+
+    def generate_content(self, prompt, stream=False, **options):
+        return self.base.generate_content(f"{self.prefix}\n\n{prompt}", stream=stream, **options)
+
+
+class LocalPrefixes:
+    """Local stand-in with the Gemini backend's interface, for tests and benchmarks without an API key"""
+
+    def __init__(self, base):
+        self.base = base
+        self.created = 0
+        self.released = 0
+
+    def create(self, agent: str, prefix: str, tokens: int) -> Tuple[Any, str, Any]:
+        self.created += 1
+        return _PrefixedModel(self.base, prefix), 'instruction', object()
+
+    def release(self, resource):
+        self.released += 1
+
+
+class PrefixRegistry:
+    """One handle per agent, keyed by the prefix's content hash so an edited prompt gets a new handle"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.handles: Dict[str, PrefixHandle] = {}
+        self.disabled: Dict[str, str] = {}  # agent -> prefix version the upstream rejected
+        self._lock = threading.Lock()
+
+    def handle(self, agent: str, prefix: str) -> Optional[PrefixHandle]:
+        """The agent's handle for ``prefix``, registering it (and releasing a stale one) on first use"""
+        version = prefix_version(prefix)
+        current = self.handles.get(agent)
+        if current is not None and current.version == version:
+            return current
+        if self.disabled.get(agent) == version:
+            return None
+        with self._lock:
+            current = self.handles.get(agent)
+            if current is not None and current.version == version:
+                return current
+            tokens = estimate_tokens(prefix)
+            try:
+                model, mode, resource = self.backend.create(agent, prefix, tokens)
+            except Exception as e:
+                logger.warning("Could not register the %s prompt prefix; sending it inline: %s", agent, e)
+                self.disabled[agent] = version
+                PREFIX_REGISTRATIONS.inc(agent=agent, outcome='failed')
+                return None
+            self.handles[agent] = PrefixHandle(agent, version, model, mode, tokens, resource)
+        if current is not None:
+            logger.info("%s prompt prefix changed (%s -> %s); replaced its handle", agent, current.version, version)
+            self._release(current)
+        PREFIX_REGISTRATIONS.inc(agent=agent, outcome='replaced' if current else 'created')
+        return self.handles[agent]
+
+    def disable(self, handle: PrefixHandle, error: Exception):
+        """Stop using a handle the upstream rejected; this prefix version is sent inline from now on"""
+        logger.warning("%s prompt prefix handle failed; sending the prefix inline: %s", handle.agent, error)
+        with self._lock:
+            if self.handles.get(handle.agent) is handle:
+                del self.handles[handle.agent]
+            self.disabled[handle.agent] = handle.version
+        PREFIX_REGISTRATIONS.inc(agent=handle.agent, outcome='failed')
+        self._release(handle)
+
+    def _release(self, handle: PrefixHandle):
+        try:
+            self.backend.release(handle.resource)
+        except Exception as e:
+            logger.warning("Could not release the %s prompt prefix: %s", handle.agent, e)
+
+    def record(self, agent: str, handle: Optional[PrefixHandle], response, seconds: float):
+        """Count one upstream call and, for a cached context, the input tokens the upstream served from cache"""
+        mode = handle.mode if handle else 'inline'
+        PREFIX_REQUESTS.inc(agent=agent, mode=mode)
+        UPSTREAM_BY_MODE.observe(seconds, agent=agent, mode=mode)
+        # A system instruction is still sent and billed on every call; only a cached context saves input tokens
+        if handle and handle.mode == 'cached':
+            usage = getattr(response, 'usage_metadata', None)
+            cached = getattr(usage, 'cached_content_token_count', None) if usage else None
+            if cached:
+                PREFIX_TOKENS_SAVED.inc(cached, agent=agent)
+
+    def status(self) -> Dict[str, Any]:
+        """Per-agent handle, saved tokens and median upstream latency with and without the prefix handle"""
+        agents = {}
+        for agent in sorted(set(self.handles) | set(self.disabled)):
+            handle = self.handles.get(agent)
+            inline = UPSTREAM_BY_MODE.labels(agent=agent, mode='inline')
+            prefixed = UPSTREAM_BY_MODE.labels(agent=agent, mode=handle.mode) if handle else None
+            row = {
+                'mode': handle.mode if handle else 'inline',
+                'version': handle.version if handle else self.disabled.get(agent),
+                'prefix_tokens': handle.tokens if handle else None,
+                'tokens_saved': PREFIX_TOKENS_SAVED.value(agent=agent),
+                'p50_inline_ms': round(inline.quantile(0.5) * 1000.0, 1) if inline.count else None,
+                'p50_prefixed_ms': round(prefixed.quantile(0.5) * 1000.0, 1) if prefixed and prefixed.count else None,
+            }
+            if row['p50_inline_ms'] is not None and row['p50_prefixed_ms'] is not None:
+                row['latency_saved_ms'] = round(row['p50_inline_ms'] - row['p50_prefixed_ms'], 1)
+            agents[agent] = row
+        return {'agents': agents}
+
+    def clear(self):
+        with self._lock:
+            handles, self.handles = list(self.handles.values()), {}
+        for handle in handles:
+            self._release(handle)
@@ -1,140 +1,56 @@
-# Create the ClutchEdge conversational AI interface
-clutch_edge_html = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>ClutchEdge AI - BytEdge Automotive</title>
-    <link rel="stylesheet" href="agent-styles.css">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap" rel="stylesheet">
-    <link href="https://fonts.googleapis.com/css2?family=JetBrains+Mono:wght@400;500;600&display=swap" rel="stylesheet">
-</head>
-<body class="clutch-theme">
-    <div class="container">
-        <!-- Header Section -->
-        <header class="agent-header">
-            <div class="header-content">
-                <div class="agent-branding">
-                    <div class="agent-logo clutch-logo">
-                        <div class="logo-icon">⚙️</div>
-                        <div class="logo-pulse"></div>
-                    </div>
-                    <div class="agent-info">
-                        <h1 class="agent-name">ClutchEdge AI</h1>
-                        <p class="agent-tagline">Advanced Clutch & Drivetrain Engineering Assistant</p>
-                        <div class="agent-status">
-                            <span class="status-indicator online"></span>
-                            <span class="status-text">Online & Ready</span>
-                        </div>
-                    </div>
-                </div>
-                <div class="header-actions">
-                    <button class="clear-chat-btn" onclick="clearChat()">
-                        <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                            <polyline points="3,6 5,6 21,6"></polyline>
-                            <path d="m19,6v14a2,2 0 0,1-2,2H7a2,2 0 0,1-2-2V6m3,0V4a2,2 0 0,1,2-2h4a2,2 0 0,1,2,2v2"></path>
-                        </svg>
-                        Clear Chat
-                    </button>
-                </div>
-            </div>
-        </header>
+#!/usr/bin/env python3
+"""
+BytEdge Agent Page Generator
+Renders the home page and every agent page from AGENT_CONFIGS, then minifies, precompresses
+and fingerprints them with the shared stylesheet and scripts (the server does the same at startup)
 
-        <!-- Main Chat Interface -->
-        <main class="chat-interface">
-            <div class="chat-container">
-                <div class="chat-messages" id="chatMessages">
-                    <div class="welcome-message">
-                        <div class="welcome-avatar">
-                            <div class="avatar-icon">⚙️</div>
-                        </div>
-                        <div class="welcome-content">
-                            <h3>Welcome to ClutchEdge AI</h3>
-                            <p>I'm your specialized clutch and drivetrain engineering assistant. I can help you with:</p>
-                            <ul class="expertise-list">
-                                <li>Clutch system design and optimization</li>
-                                <li>Torque transmission analysis</li>
-                                <li>Friction material selection</li>
-                                <li>Dual-clutch and automated systems</li>
-                                <li>Drivetrain integration and performance</li>
-                            </ul>
-                            <p class="welcome-prompt">Ask me anything about clutch systems and drivetrain engineering!</p>
-                        </div>
-                    </div>
-                </div>
+Usage: python script.py [--out dist] [--static]
+--static builds the GitHub Pages site: pages answer from each agent's knowledge file, without the server
+"""
 
-                <div class="typing-indicator" id="typingIndicator" style="display: none;">
-                    <div class="typing-avatar">
-                        <div class="avatar-icon">⚙️</div>
-                    </div>
-                    <div class="typing-content">
-                        <div class="typing-dots">
-                            <span></span>
-                            <span></span>
-                            <span></span>
-                        </div>
-                        <span class="typing-text">ClutchEdge is analyzing...</span>
-                    </div>
-                </div>
+import argparse
+import json
+import os
 
-                <div class="chat-input-section">
-                    <div class="input-container">
-                        <div class="input-wrapper">
-                            <textarea 
-                                id="messageInput" 
-                                placeholder="Ask me about clutch systems, torque analysis, drivetrain optimization..."
-                                rows="1"
-                                maxlength="2000"
-                            ></textarea>
-                            <div class="input-actions">
-                                <button class="send-button" id="sendButton" onclick="sendMessage()">
-                                    <svg width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2">
-                                        <line x1="22" y1="2" x2="11" y2="13"></line>
-                                        <polygon points="22,2 15,22 11,13 2,9"></polygon>
-                                    </svg>
-                                </button>
-                            </div>
-                        </div>
-                        <div class="input-footer">
-                            <span class="character-count">0/2000</span>
-                            <span class="input-hint">Press Enter to send, Shift+Enter for new line</span>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </main>
+from agent_configs import AGENT_CONFIGS
+from page_builder import render_pages
+from static_assets import AssetPipeline
 
-        <!-- Quick Actions Sidebar -->
-        <aside class="quick-actions">
-            <h3>Quick Topics</h3>
-            <div class="action-buttons">
-                <button class="action-btn" onclick="askQuestion('How does a dual-clutch transmission work?')">
-                    Dual-Clutch Systems
-                </button>
-                <button class="action-btn" onclick="askQuestion('What factors affect clutch torque capacity?')">
-                    Torque Capacity
-                </button>
-                <button class="action-btn" onclick="askQuestion('Explain clutch friction material selection criteria')">
-                    Friction Materials
-                </button>
-                <button class="action-btn" onclick="askQuestion('How to optimize clutch engagement smoothness?')">
-                    Engagement Tuning
-                </button>
-                <button class="action-btn" onclick="askQuestion('Compare wet vs dry clutch systems')">
-                    Wet vs Dry Clutch
-                </button>
-            </div>
-        </aside>
-    </div>
+ROOT = os.path.dirname(os.path.abspath(__file__))
 
-    <script src="clutch-agent.js"></script>
-</body>
-</html>'''
 
-# Save ClutchEdge HTML
-with open('clutch-edge.html', 'w', encoding='utf-8') as f:
-    f.write(clutch_edge_html)
+def write_knowledge(out_dir: str):
+    """<agent>-knowledge.json with each agent's curated entries, for pages built without a server"""
+    for key in AGENT_CONFIGS:
+        source = os.path.join(ROOT, 'knowledge', f'{key}.json')
+        if not os.path.exists(source):
+            continue
+        with open(source, encoding='utf-8') as f:
+            entries = json.load(f)['entries']
+        fields = ('title', 'questions', 'keywords', 'answer')
+        with open(os.path.join(out_dir, f'{key}-knowledge.json'), 'w', encoding='utf-8') as f:
+            json.dump({'entries': [{field: entry[field] for field in fields} for entry in entries]}, f,
+                      separators=(',', ':'))
 
-print("ClutchEdge HTML page created successfully!")
\ No newline at end of file
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', default=os.path.join(ROOT, 'dist'), help='output directory for built artifacts')
+    parser.add_argument('--static', action='store_true', help='pages answer from knowledge files, not the chat API')
+    args = parser.parse_args()
+
+    pipeline = AssetPipeline(ROOT)
+    pipeline.build(render_pages(AGENT_CONFIGS, static=args.static))
+    manifest = pipeline.write(args.out)
+    if args.static:
+        write_knowledge(args.out)
+
+    for name, url in sorted(manifest.items()):
+        asset = pipeline.lookup(url)
+        sizes = ', '.join(f"{encoding} {len(body)}" for encoding, body in asset.variants.items())
+        print(f"{url:<40} {sizes}")
+    print(f"Built {len(manifest)} assets for {len(AGENT_CONFIGS)} agents into {args.out}")
+
+
+if __name__ == '__main__':
+    main()
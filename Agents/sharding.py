@@ -0,0 +1,252 @@
+"""
+BytEdge Conversation Sharding
+Consistent-hash ring with virtual nodes that maps each conversation id to the node holding its history;
+other nodes forward or redirect its turns, and membership changes hand off only the conversations that move
+"""
+
+import bisect
+import hashlib
+import hmac
+import http.client
+import json
+import logging
+import queue
+import threading
+import urllib.parse
+import uuid
+from collections import OrderedDict
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+FORWARDED_HEADER = 'X-Shard-Forwarded'  # with a valid token, the request is answered and never re-forwarded
+TOKEN_HEADER = 'X-Shard-Token'
+
+SHARD_REQUESTS = instrumentation.registry.counter(
+    'shard_requests_total', 'Chat turns by routing decision (local, forwarded, redirected, forward_failed)')
+SHARD_MOVES = instrumentation.registry.counter(
+    'shard_conversations_moved_total', 'Conversations handed between nodes by direction (sent, received, pulled)')
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Immutable ring; each node owns ``vnodes`` points, so adding one node moves about 1/N of the keys"""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 128):
+        self.nodes = sorted(set(nodes))
+        self.vnodes = vnodes
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        return self._owners[bisect.bisect(self._points, _hash(key)) % len(self._points)]
+
+    def shares(self) -> Dict[str, float]:
+        """Fraction of the hash space each node owns"""
+        shares = {node: 0.0 for node in self.nodes}
+        previous = self._points[-1] - 2 ** 64 if self._points else 0
+        for point, node in zip(self._points, self._owners):
+            shares[node] += (point - previous) / 2 ** 64
+            previous = point
+        return shares
+
+
+class NodeClient:
+    """Keep-alive HTTP connections to one peer node, reused across forwarded requests"""
+
+    def __init__(self, base_url: str, timeout_s: float, pool_size: int = 16):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.timeout_s = timeout_s
+        self.idle: 'queue.LifoQueue[http.client.HTTPConnection]' = queue.LifoQueue(maxsize=pool_size)
+
+    def request(self, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[Dict[str, str]] = None) -> Tuple[int, str, bytes]:
+        """(status, content type, body); a pooled connection the peer already closed is retried once"""
+        for attempt in range(2):
+            try:
+                if attempt:
+                    raise queue.Empty  # the retry gets a new connection; other pooled ones may be stale too
+                conn, reused = self.idle.get_nowait(), True
+            except queue.Empty:
+                conn, reused = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout_s), False
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                try:
+                    self.idle.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            return response.status, response.getheader('Content-Type', 'application/json'), data
+        raise ConnectionError('unreachable')
+
+
+class ShardRouter:
+    """This node's view of the ring: who owns a conversation, and how to reach them"""
+
+    def __init__(self, self_node: str, nodes: Iterable[str], vnodes: int = 128, mode: str = 'forward',
+                 secret: str = '', timeout_s: float = 30.0):
+        if mode not in ('forward', 'redirect'):
+            raise ValueError("mode must be 'forward' or 'redirect'")
+        self.self_node = self_node.rstrip('/')
+        self.vnodes = vnodes
+        self.mode = mode
+        self.secret = secret
+        self.timeout_s = timeout_s
+        self.ring = HashRing([node.rstrip('/') for node in nodes], vnodes)
+        self.previous: Optional[HashRing] = None  # ring before the last membership change, for pulls
+        # Ids minted here since that change: brand-new conversations with nothing to pull
+        self.fresh: 'OrderedDict[str, bool]' = OrderedDict()
+        self.max_fresh = 4096
+        self.clients: Dict[str, NodeClient] = {}
+        self._lock = threading.Lock()
+        if self.ring.nodes and self.self_node not in self.ring.nodes:
+            logger.warning("SHARD_SELF %r is not in SHARD_NODES; sharding is off", self.self_node)
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.ring.nodes) > 1 and self.self_node in self.ring.nodes
+
+    def owner(self, conversation_id: str) -> str:
+        return self.ring.owner(conversation_id) or self.self_node
+
+    def is_local(self, conversation_id: str) -> bool:
+        return not self.enabled or self.owner(conversation_id) == self.self_node
+
+    def new_id(self, prefix: str) -> str:
+        """A fresh conversation id that hashes to this node, so a conversation starts where it landed"""
+        for _ in range(64):
+            conversation_id = f"{prefix}_{uuid.uuid4().hex[:12]}"
+            if self.is_local(conversation_id):
+                break
+        if self.previous is not None:
+            with self._lock:
+                self.fresh[conversation_id] = True
+                if len(self.fresh) > self.max_fresh:
+                    self.fresh.popitem(last=False)
+        return conversation_id
+
+    def authorized(self, token: Optional[str]) -> bool:
+        """Node-to-node calls carry the shared secret; without one the internal endpoints are off"""
+        return bool(self.secret) and hmac.compare_digest(token or '', self.secret)
+
+    def _client(self, node: str) -> NodeClient:
+        client = self.clients.get(node)
+        if client is None:
+            with self._lock:
+                client = self.clients.setdefault(node, NodeClient(node, self.timeout_s))
+        return client
+
+    def call(self, node: str, method: str, path: str, payload: Any = None,
+             headers: Optional[Dict[str, str]] = None) -> Tuple[int, str, bytes]:
+        """Request to a peer node with the shard token"""
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {TOKEN_HEADER: self.secret, FORWARDED_HEADER: self.self_node, **(headers or {})}
+        if body is not None:
+            headers.setdefault('Content-Type', 'application/json')
+        return self._client(node).request(method, path, body, headers)
+
+    def forward(self, node: str, path: str, body: bytes, request_id: Optional[str] = None) -> Tuple[int, str, bytes]:
+        headers = {'Content-Type': 'application/json', TOKEN_HEADER: self.secret,
+                   FORWARDED_HEADER: self.self_node}
+        if request_id:
+            headers['X-Request-Id'] = request_id
+        return self._client(node).request('POST', path, body, headers)
+
+    def redirect_url(self, node: str, path: str) -> str:
+        return f"{node}{path}"
+
+    def set_members(self, nodes: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Swap in a ring for ``nodes``; returns (added, removed)"""
+        ring = HashRing([node.rstrip('/') for node in nodes], self.vnodes)
+        with self._lock:
+            old, self.previous, self.ring = self.ring, self.ring, ring
+            self.fresh.clear()
+        added = sorted(set(ring.nodes) - set(old.nodes))
+        removed = sorted(set(old.nodes) - set(ring.nodes))
+        logger.info("Shard membership changed - added: %s, removed: %s", added, removed)
+        return added, removed
+
+    def rebalance(self, store: Dict[str, List[Dict[str, Any]]], batch: int = 200) -> Dict[str, int]:
+        """Send every conversation this node no longer owns to its new owner; returns counts per node"""
+        moving: Dict[str, List[str]] = {}
+        for conversation_id in list(store):
+            owner = self.owner(conversation_id)
+            if owner != self.self_node:
+                moving.setdefault(owner, []).append(conversation_id)
+        sent = {}
+        for node, conversation_ids in moving.items():
+            sent[node] = 0
+            for start in range(0, len(conversation_ids), batch):
+                chunk = {cid: store[cid] for cid in conversation_ids[start:start + batch] if cid in store}
+                try:
+                    status, _, _ = self.call(node, 'POST', '/api/shard/conversations', {'conversations': chunk})
+                except OSError as e:
+                    status = str(e)
+                if status != 200:
+                    logger.error("Handoff of %s conversations to %s failed (%s); keeping them", len(chunk), node, status)
+                    continue
+                for cid in chunk:
+                    store.pop(cid, None)
+                sent[node] += len(chunk)
+                SHARD_MOVES.inc(len(chunk), direction='sent')
+        return sent
+
+    def pull(self, conversation_id: str) -> Optional[List[Dict[str, Any]]]:
+        """History of a conversation that moved here but has not been handed off yet, from its old owner"""
+        previous = self.previous
+        if previous is None or not self.enabled:
+            return None
+        with self._lock:
+            if self.fresh.pop(conversation_id, False):
+                return None  # minted here after the change, so no other node ever held it
+        node = previous.owner(conversation_id)
+        if node is None or node == self.self_node:
+            return None
+        try:
+            status, _, data = self.call(node, 'POST', f"/api/shard/release/{urllib.parse.quote(conversation_id)}")
+        except OSError as e:
+            logger.warning("Could not pull conversation from %s: %s", node, e)
+            return None
+        if status != 200:
+            return None
+        SHARD_MOVES.inc(direction='pulled')
+        return json.loads(data).get('history')
+
+    def status(self, store: Dict[str, Any]) -> Dict[str, Any]:
+        local = list(store)
+        misplaced = sum(1 for cid in local if not self.is_local(cid))
+        return {
+            'enabled': self.enabled,
+            'self': self.self_node,
+            'mode': self.mode,
+            'nodes': self.ring.nodes,
+            'vnodes': self.vnodes,
+            'shares': {node: round(share, 4) for node, share in self.ring.shares().items()},
+            'conversations': len(local),
+            'misplaced': misplaced,
+            'requests': {decision: SHARD_REQUESTS.value(decision=decision)
+                         for decision in ('local', 'forwarded', 'redirected', 'forward_failed')},
+            'moved': {direction: SHARD_MOVES.value(direction=direction)
+                      for direction in ('sent', 'received', 'pulled')},
+        }
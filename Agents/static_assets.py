@@ -0,0 +1,257 @@
+"""
+BytEdge Static Asset Pipeline
+Minifies the agent pages, stylesheet and scripts once at startup, fingerprints them by content
+hash and keeps identity, gzip and (when available) brotli bytes in memory for conditional serving
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always produced
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+}
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# ============================================================================
+# MINIFIERS (conservative: whitespace and comments only, never renames)
+# ============================================================================
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCT = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(source: str) -> str:
+    css = _CSS_COMMENT.sub('', source)
+    css = _CSS_SPACE.sub(' ', css)
+    css = _CSS_PUNCT.sub(r'\1', css)  # ':' is left alone: "a :hover" and "a:hover" differ
+    return css.replace(';}', '}').strip()
+
+
+# A '/' starts a regex literal (not a division) after these characters
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^\n')
+
+
+def minify_js(source: str) -> str:
+    """Strip comments, indentation and blank lines outside string, template and regex literals"""
+    out = []
+    i, n = 0, len(source)
+    last = '\n'  # last significant character emitted
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+        if ch in '"\'`':
+            j = i + 1
+            while j < n and source[j] != ch:
+                j += 2 if source[j] == '\\' else 1
+            out.append(source[i:j + 1])
+            last = ch
+            i = j + 1
+        elif ch == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+        elif ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+        elif ch == '/' and last in _REGEX_PRECEDERS:
+            j, in_class = i + 1, False
+            while j < n and (source[j] != '/' or in_class) and source[j] != '\n':
+                if source[j] == '\\':
+                    j += 1
+                elif source[j] == '[':
+                    in_class = True
+                elif source[j] == ']':
+                    in_class = False
+                j += 1
+            out.append(source[i:j + 1])
+            last = '/'
+            i = j + 1
+        elif ch in ' \t\r\n':
+            j = i
+            while j < n and source[j] in ' \t\r\n':
+                j += 1
+            # Newlines are kept so automatic semicolon insertion behaves exactly as before
+            separator = '\n' if '\n' in source[i:j] else ' '
+            if separator == '\n':
+                if last != '\n':
+                    out.append('\n')
+                    last = '\n'
+            elif last != '\n' and j < n:
+                out.append(' ')
+            i = j
+        else:
+            out.append(ch)
+            last = ch
+            i += 1
+    return ''.join(out).strip()
+
+
+_HTML_RAW = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.S | re.I)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+
+
+def minify_html(source: str) -> str:
+    """Collapse whitespace runs (rendering-equivalent in HTML) outside raw-text elements"""
+    parts = _HTML_RAW.split(source)
+    out = []
+    i = 0
+    while i < len(parts):
+        text = _HTML_COMMENT.sub('', parts[i])
+        out.append(re.sub(r'\s+', ' ', text))
+        if i + 1 < len(parts):
+            block, tag = parts[i + 1], parts[i + 2].lower()
+            if tag in ('script', 'style'):
+                open_end = block.index('>') + 1
+                close_start = block.lower().rindex('</' + tag)
+                body = block[open_end:close_start]
+                if tag == 'style':
+                    body = minify_css(body)
+                elif 'src=' not in block[:open_end].lower():
+                    body = minify_js(body)
+                block = block[:open_end] + body + block[close_start:]
+            out.append(block)
+        i += 3
+    return ''.join(out).strip()
+
+
+MINIFIERS = {'.html': minify_html, '.css': minify_css, '.js': minify_js}
+
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+class Asset:
+    """One asset's encoded variants and validators"""
+
+    __slots__ = ('name', 'url', 'content_type', 'digest', 'fingerprinted', 'variants', 'source_bytes')
+
+    def __init__(self, name: str, url: str, content_type: str, body: bytes, fingerprinted: bool,
+                 source_bytes: int):
+        self.name = name
+        self.url = url
+        self.content_type = content_type
+        self.digest = hashlib.sha256(body).hexdigest()[:16]
+        self.fingerprinted = fingerprinted
+        self.source_bytes = source_bytes
+        self.variants: Dict[str, bytes] = {'identity': body, 'gzip': gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            self.variants['br'] = brotli.compress(body, quality=11)
+
+    def etag(self, encoding: str) -> str:
+        return f'"{self.digest}-{encoding}"'
+
+
+def fingerprint_name(name: str, digest: str) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{digest[:10]}{ext}"
+
+
+class AssetPipeline:
+    """Builds all assets at startup and answers requests from memory"""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.assets: Dict[str, Asset] = {}  # request path (original and fingerprinted) -> asset
+        self.manifest: Dict[str, str] = {}  # original name -> fingerprinted url
+
+    def build(self, pages: Optional[Dict[str, str]] = None):
+        """Minify and compress every .css/.js then every .html under root, plus extra in-memory pages"""
+        files = sorted(f for f in os.listdir(self.root) if os.path.splitext(f)[1] in CONTENT_TYPES)
+        sources = {}
+        for name in files:
+            with open(os.path.join(self.root, name), encoding='utf-8') as f:
+                sources[name] = f.read()
+        sources.update(pages or {})
+
+        # Subresources first so pages can reference their fingerprinted urls
+        for name in sorted(sources, key=lambda item: item.endswith('.html')):
+            ext = os.path.splitext(name)[1]
+            source = sources[name]
+            if ext == '.html':
+                source = self.rewrite_references(source)
+            self.add(name, MINIFIERS[ext](source), source_bytes=len(sources[name].encode('utf-8')))
+
+        raw = sum(asset.source_bytes for name, asset in self.assets.items() if name == asset.name)
+        sizes = {encoding: sum(len(asset.variants.get(encoding, b'')) for name, asset in self.assets.items()
+                               if name == asset.name) for encoding in ('identity', 'gzip', 'br')}
+        logger.info("Built %s static assets - source: %s bytes, minified: %s, gzip: %s, brotli: %s",
+                    len(self.manifest), raw, sizes['identity'], sizes['gzip'], sizes['br'] or 'n/a')
+
+    def add(self, name: str, text: str, source_bytes: int = 0):
+        """Register an asset; pages keep their names, subresources also get a fingerprinted url"""
+        ext = os.path.splitext(name)[1]
+        body = text.encode('utf-8')
+        fingerprinted = ext != '.html'
+        asset = Asset(name, name, CONTENT_TYPES[ext], body, fingerprinted, source_bytes or len(body))
+        if fingerprinted:
+            asset.url = fingerprint_name(name, asset.digest)
+            self.assets[asset.url] = asset
+        self.assets[name] = asset
+        self.manifest[name] = asset.url
+        return asset
+
+    def rewrite_references(self, html: str) -> str:
+        """Point href/src attributes at fingerprinted urls"""
+        def replace(match):
+            attribute, quote, path = match.group(1), match.group(2), match.group(3)
+            prefix = '/' if path.startswith('/') else ''
+            target = self.manifest.get(path.lstrip('/'))
+            return f'{attribute}={quote}{prefix}{target}{quote}' if target else match.group(0)
+        return re.sub(r'\b(href|src)=(["\'])([^"\']+\.(?:css|js))\2', replace, html)
+
+    def write(self, out_dir: str) -> Dict[str, str]:
+        """Write every asset under its served url with .gz/.br siblings plus manifest.json"""
+        os.makedirs(out_dir, exist_ok=True)
+        suffixes = {'identity': '', 'gzip': '.gz', 'br': '.br'}
+        for url, asset in self.assets.items():
+            if url != asset.url:
+                continue
+            for encoding, body in asset.variants.items():
+                with open(os.path.join(out_dir, url + suffixes[encoding]), 'wb') as f:
+                    f.write(body)
+        with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        return self.manifest
+
+    def url_for(self, name: str) -> str:
+        return self.manifest.get(name, name)
+
+    def lookup(self, path: str) -> Optional[Asset]:
+        return self.assets.get(path)
+
+    def negotiate(self, asset: Asset, path: str, accept_encoding: str,
+                  if_none_match: str) -> Tuple[int, Optional[bytes], Dict[str, str]]:
+        """Status, body and headers for one request (304 when any variant's ETag matches)"""
+        accepted = {token.split(';')[0].strip().lower() for token in accept_encoding.split(',')
+                    if not token.strip().endswith(';q=0')}
+        encoding = next((e for e in ('br', 'gzip') if e in accepted and e in asset.variants), 'identity')
+        immutable = asset.fingerprinted and path == asset.url
+        headers = {
+            'Content-Type': asset.content_type,
+            'Cache-Control': IMMUTABLE if immutable else REVALIDATE,
+            'ETag': asset.etag(encoding),
+            'Vary': 'Accept-Encoding',
+        }
+        if if_none_match:
+            tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+            if '*' in tags or tags & {asset.etag(e) for e in asset.variants}:
+                return 304, None, headers
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return 200, asset.variants[encoding], headers
@@ -0,0 +1,172 @@
+"""
+BytEdge Structured Logging
+Non-blocking pipeline: request threads enqueue records, one listener thread formats and writes them
+JSON-lines file output with request ids and timings, size/time rotation and info-log sampling
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+import traceback
+from typing import Callable, Dict, Optional, Tuple
+
+_request_id: contextvars.ContextVar = contextvars.ContextVar('byteedge_request_id', default=None)
+
+# Attributes present on every LogRecord; anything else was passed through ``extra=``
+_RESERVED = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'trace_id'}
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def bind_request(request_id: Optional[str]):
+    """Attach a request id to every record logged from the current context"""
+    _request_id.set(request_id)
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, request/trace ids and extra fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key in ('request_id', 'trace_id'):
+            value = getattr(record, key, None)
+            if value:
+                data[key] = value
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and key != 'request_id' and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info:
+            data['exception'] = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Thin out repetitive INFO/DEBUG records per message template.
+
+    Each template logs its first ``burst`` records per ``window_s`` in full, then one in
+    ``every``; the emitted record carries ``sampled_out`` with the count dropped since the
+    last one. WARNING and above always pass.
+    """
+
+    def __init__(self, burst: int = 20, every: int = 10, window_s: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.every = max(1, every)
+        self.window_s = window_s
+        self._state: Dict[Tuple[str, str], list] = {}  # template -> [window start, seen, dropped]
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, str(record.msg))
+        now = record.created
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window_s:
+                state = self._state[key] = [now, 0, state[2] if state else 0]
+            state[1] += 1
+            seen = state[1]
+            if seen > self.burst and (seen - self.burst) % self.every:
+                state[2] += 1
+                return False
+            dropped, state[2] = state[2], 0
+        if dropped:
+            record.sampled_out = dropped
+        return True
+
+
+class ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without formatting them on the request thread.
+
+    The request and trace ids live in context variables, so they are captured here;
+    message interpolation, JSON encoding and file I/O all happen on the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue, trace_id: Optional[Callable[[], Optional[str]]] = None):
+        super().__init__(log_queue)
+        self.trace_id = trace_id
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.request_id = _request_id.get()
+        if self.trace_id is not None:
+            record.trace_id = self.trace_id()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block a request on logging; losses are counted instead
+            self.dropped += 1
+
+
+def configure(log_file: str, level: int = logging.INFO, rotation: str = 'size', max_bytes: int = 10 * 1024 * 1024,
+              backup_count: int = 5, when: str = 'midnight', sample_burst: int = 20, sample_every: int = 10,
+              queue_size: int = 10000,
+              trace_id: Optional[Callable[[], Optional[str]]] = None) -> logging.handlers.QueueListener:
+    """Route the root logger through a bounded queue to rotating JSON-lines and console writers"""
+    if rotation == 'time':
+        file_handler = logging.handlers.TimedRotatingFileHandler(log_file, when=when, backupCount=backup_count,
+                                                                 encoding='utf-8', delay=True)
+    elif rotation == 'size':
+        file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count,
+                                                            encoding='utf-8', delay=True)
+    else:
+        raise ValueError("rotation must be 'size' or 'time'")
+    file_handler.setFormatter(JsonLinesFormatter())
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+    queue_handler = ContextQueueHandler(log_queue, trace_id=trace_id)
+    queue_handler.addFilter(SamplingFilter(burst=sample_burst, every=sample_every))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)  # flush queued records on shutdown
+    return listener
+
+
+def restart_after_fork(listener: logging.handlers.QueueListener) -> logging.handlers.QueueListener:
+    """
+    Give a forked worker its own queue and listener thread.
+
+    Threads do not survive fork, and the inherited queue's lock may have been held by the
+    parent's listener at that moment, so both are replaced; the writers are kept.
+    """
+    atexit.unregister(listener.stop)
+    old_queue = listener.queue
+    log_queue: queue.Queue = queue.Queue(maxsize=old_queue.maxsize)
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, ContextQueueHandler) and handler.queue is old_queue:
+            handler.queue = log_queue
+    restarted = logging.handlers.QueueListener(log_queue, *listener.handlers, respect_handler_level=True)
+    restarted.start()
+    atexit.register(restarted.stop)
+    return restarted
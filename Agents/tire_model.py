@@ -0,0 +1,318 @@
+"""
+TireEdge Force Model
+Pacejka Magic Formula (MF 5.2 style) for longitudinal, lateral and combined slip
+Vectorized over slip, vertical load, camber and inflation pressure grids
+"""
+
+import base64
+import numpy as np
+from typing import Dict, Any, Optional, Sequence
+
+# Representative passenger-car tire coefficients (205/55 R16 class)
+DEFAULT_COEFFICIENTS = {
+    'FNOMIN': 4000.0,   # nominal vertical load (N)
+    'NOMPRES': 220000.0,  # nominal inflation pressure (Pa)
+    # Longitudinal
+    'PCX1': 1.65, 'PDX1': 1.21, 'PDX2': -0.037, 'PDX3': 0.0,
+    'PEX1': 0.344, 'PEX2': 0.095, 'PEX3': -0.020, 'PEX4': 0.0,
+    'PKX1': 21.5, 'PKX2': 13.7, 'PKX3': -0.44,
+    'PHX1': 0.0, 'PHX2': 0.0, 'PVX1': 0.0, 'PVX2': 0.0,
+    'PPX1': -0.34, 'PPX2': 0.38, 'PPX3': -0.09, 'PPX4': 0.06,
+    # Lateral
+    'PCY1': 1.19, 'PDY1': 0.99, 'PDY2': -0.145, 'PDY3': 11.0,
+    'PEY1': -1.0, 'PEY2': -0.5, 'PEY3': 0.0, 'PEY4': -4.0,
+    'PKY1': -15.3, 'PKY2': 1.7, 'PKY3': 0.36,
+    'PHY1': 0.0, 'PHY2': 0.0,
+    'PVY1': 0.0, 'PVY2': 0.0, 'PVY3': -0.25, 'PVY4': -0.3,
+    'PPY1': -0.65, 'PPY2': -0.2, 'PPY3': -0.08, 'PPY4': 0.12,
+    # Combined slip weighting
+    'RBX1': 13.0, 'RBX2': 9.7, 'RCX1': 1.0,
+    'RBY1': 10.6, 'RBY2': 7.8, 'RCY1': 1.05,
+}
+
+MODES = ('longitudinal', 'lateral', 'combined')
+
+# Coefficients adjusted by default when fitting each force channel
+FIT_KEYS = {
+    'longitudinal': ('PCX1', 'PDX1', 'PDX2', 'PEX1', 'PEX2', 'PKX1', 'PKX2', 'PKX3'),
+    'lateral': ('PCY1', 'PDY1', 'PDY2', 'PEY1', 'PEY2', 'PKY1', 'PKY2', 'PVY3'),
+}
+
+
+def _load_and_pressure_terms(c: Dict[str, Any], fz, pressure):
+    """Normalized load and pressure increments"""
+    dfz = (fz - c['FNOMIN']) / c['FNOMIN']
+    dpi = (pressure - c['NOMPRES']) / c['NOMPRES']
+    return dfz, dpi
+
+
+def longitudinal_force(c: Dict[str, Any], kappa, fz, gamma=0.0, pressure=None):
+    """Pure longitudinal force Fx0 (N) for slip ratio kappa"""
+    pressure = c['NOMPRES'] if pressure is None else pressure
+    dfz, dpi = _load_and_pressure_terms(c, fz, pressure)
+
+    kx = kappa + c['PHX1'] + c['PHX2'] * dfz
+    mux = (c['PDX1'] + c['PDX2'] * dfz) * (1.0 + c['PPX3'] * dpi + c['PPX4'] * dpi ** 2) \
+        * (1.0 - c['PDX3'] * gamma ** 2)
+    dx = mux * fz
+    cx = c['PCX1']
+    kxk = fz * (c['PKX1'] + c['PKX2'] * dfz) * np.exp(c['PKX3'] * dfz) \
+        * (1.0 + c['PPX1'] * dpi + c['PPX2'] * dpi ** 2)
+    bx = kxk / (cx * dx + 1e-9)
+    ex = np.minimum((c['PEX1'] + c['PEX2'] * dfz + c['PEX3'] * dfz ** 2)
+                    * (1.0 - c['PEX4'] * np.sign(kx)), 1.0)
+    svx = fz * (c['PVX1'] + c['PVX2'] * dfz)
+
+    bxk = bx * kx
+    return dx * np.sin(cx * np.arctan(bxk - ex * (bxk - np.arctan(bxk)))) + svx
+
+
+def lateral_force(c: Dict[str, Any], alpha, fz, gamma=0.0, pressure=None):
+    """Pure lateral force Fy0 (N) for slip angle alpha (rad) and camber gamma (rad)"""
+    pressure = c['NOMPRES'] if pressure is None else pressure
+    dfz, dpi = _load_and_pressure_terms(c, fz, pressure)
+    fz0 = c['FNOMIN']
+
+    shy = c['PHY1'] + c['PHY2'] * dfz
+    ay = alpha + shy
+    muy = (c['PDY1'] + c['PDY2'] * dfz) * (1.0 + c['PPY3'] * dpi + c['PPY4'] * dpi ** 2) \
+        * (1.0 - c['PDY3'] * gamma ** 2)
+    dy = muy * fz
+    cy = c['PCY1']
+    kya = c['PKY1'] * fz0 * (1.0 + c['PPY1'] * dpi) \
+        * np.sin(2.0 * np.arctan(fz / (c['PKY2'] * fz0 * (1.0 + c['PPY2'] * dpi)))) \
+        * (1.0 - c['PKY3'] * np.abs(gamma))
+    by = kya / (cy * dy + 1e-9)
+    ey = np.minimum((c['PEY1'] + c['PEY2'] * dfz)
+                    * (1.0 - (c['PEY3'] + c['PEY4'] * gamma) * np.sign(ay)), 1.0)
+    svy = fz * (c['PVY1'] + c['PVY2'] * dfz) + fz * (c['PVY3'] + c['PVY4'] * dfz) * gamma
+
+    bya = by * ay
+    return dy * np.sin(cy * np.arctan(bya - ey * (bya - np.arctan(bya)))) + svy
+
+
+def combined_forces(c: Dict[str, Any], kappa, alpha, fz, gamma=0.0, pressure=None):
+    """Combined-slip (Fx, Fy) using cosine weighting functions on the pure-slip forces"""
+    fx0 = longitudinal_force(c, kappa, fz, gamma, pressure)
+    fy0 = lateral_force(c, alpha, fz, gamma, pressure)
+
+    bxa = c['RBX1'] * np.cos(np.arctan(c['RBX2'] * kappa))
+    gxa = np.cos(c['RCX1'] * np.arctan(bxa * alpha))
+    byk = c['RBY1'] * np.cos(np.arctan(c['RBY2'] * alpha))
+    gyk = np.cos(c['RCY1'] * np.arctan(byk * kappa))
+    return fx0 * gxa, fy0 * gyk
+
+
+def merge_coefficients(overrides: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+    """Default coefficients updated with validated user overrides"""
+    coefficients = dict(DEFAULT_COEFFICIENTS)
+    for key, value in (overrides or {}).items():
+        if key not in DEFAULT_COEFFICIENTS:
+            raise ValueError(f"Unknown Magic Formula coefficient: {key}")
+        coefficients[key] = float(value)
+    return coefficients
+
+
+def evaluate_grid(mode: str, slip: Sequence[float], loads: Sequence[float], cambers: Sequence[float],
+                  pressures: Sequence[float], coefficients: Optional[Dict[str, float]] = None,
+                  slip_angle: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+    """
+    Evaluate force surfaces on the outer product of the input axes.
+
+    Pure-slip modes return arrays shaped (slip, load, camber, pressure). Combined mode
+    treats ``slip`` as slip ratio and ``slip_angle`` as slip angle, giving
+    (slip_ratio, slip_angle, load, camber, pressure).
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}. Available: {', '.join(MODES)}")
+    c = coefficients or DEFAULT_COEFFICIENTS
+
+    s = np.asarray(slip, dtype=np.float64)
+    fz = np.asarray(loads, dtype=np.float64)
+    gamma = np.asarray(cambers, dtype=np.float64)
+    p = np.asarray(pressures, dtype=np.float64)
+
+    if mode == 'longitudinal':
+        return {'fx': longitudinal_force(c, s[:, None, None, None], fz[None, :, None, None],
+                                         gamma[None, None, :, None], p[None, None, None, :])}
+    if mode == 'lateral':
+        return {'fy': lateral_force(c, s[:, None, None, None], fz[None, :, None, None],
+                                    gamma[None, None, :, None], p[None, None, None, :])}
+
+    if slip_angle is None:
+        raise ValueError("Combined mode requires slip_angle values")
+    a = np.asarray(slip_angle, dtype=np.float64)
+    fx, fy = combined_forces(c, s[:, None, None, None, None], a[None, :, None, None, None],
+                             fz[None, None, :, None, None], gamma[None, None, None, :, None],
+                             p[None, None, None, None, :])
+    return {'fx': fx, 'fy': fy}
+
+
+def fit_coefficients(mode: str, slip, fz, force, gamma=None, pressure=None,
+                     initial: Optional[Dict[str, float]] = None, fit_keys: Optional[Sequence[str]] = None,
+                     max_iterations: int = 50, tolerance: float = 1e-8) -> Dict[str, Any]:
+    """
+    Fit Magic Formula coefficients to measured pure-slip data with Levenberg-Marquardt.
+
+    The Jacobian is built by evaluating the unperturbed and every perturbed coefficient
+    set as one batched model call (parameters on a leading batch axis).
+    """
+    if mode not in FIT_KEYS:
+        raise ValueError(f"Fitting supports: {', '.join(FIT_KEYS)}")
+    model = longitudinal_force if mode == 'longitudinal' else lateral_force
+    keys = tuple(fit_keys or FIT_KEYS[mode])
+    coefficients = merge_coefficients(initial)
+    for key in keys:
+        if key not in coefficients:
+            raise ValueError(f"Unknown Magic Formula coefficient: {key}")
+
+    slip = np.asarray(slip, dtype=np.float64).ravel()
+    fz = np.broadcast_to(np.asarray(fz, dtype=np.float64), slip.shape)
+    force = np.asarray(force, dtype=np.float64).ravel()
+    gamma = np.broadcast_to(np.asarray(0.0 if gamma is None else gamma, dtype=np.float64), slip.shape)
+    pressure = np.broadcast_to(np.asarray(coefficients['NOMPRES'] if pressure is None else pressure,
+                                          dtype=np.float64), slip.shape)
+    if force.shape != slip.shape:
+        raise ValueError("force must have one value per slip sample")
+
+    n_params = len(keys)
+    theta = np.array([coefficients[k] for k in keys])
+    steps = 1e-6 * np.maximum(np.abs(theta), 1e-3)
+    perturbation = np.vstack([np.zeros(n_params), np.diag(steps)])  # (n_params + 1, n_params)
+
+    def batched_model(theta_batch):
+        batch = dict(coefficients)
+        for j, key in enumerate(keys):
+            batch[key] = theta_batch[:, j:j + 1]
+        return model(batch, slip[None, :], fz[None, :], gamma[None, :], pressure[None, :])
+
+    damping = 1e-3
+    residual = model(dict(coefficients, **dict(zip(keys, theta))), slip, fz, gamma, pressure) - force
+    cost = float(residual @ residual)
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        evaluated = batched_model(theta[None, :] + perturbation)
+        residual = evaluated[0] - force
+        jacobian = ((evaluated[1:] - evaluated[0]) / steps[:, None]).T  # (samples, n_params)
+
+        jtj = jacobian.T @ jacobian
+        gradient = jacobian.T @ residual
+        improved = False
+        while damping < 1e10:
+            delta = np.linalg.solve(jtj + damping * np.diag(np.diag(jtj) + 1e-12), -gradient)
+            candidate = theta + delta
+            trial = batched_model(candidate[None, :])[0] - force
+            trial_cost = float(trial @ trial)
+            if np.isfinite(trial_cost) and trial_cost < cost:
+                relative_gain = (cost - trial_cost) / max(cost, 1e-30)
+                theta, cost = candidate, trial_cost
+                damping = max(damping / 3.0, 1e-12)
+                improved = True
+                break
+            damping *= 4.0
+        if not improved or relative_gain < tolerance:
+            break
+
+    fitted = dict(zip(keys, theta.tolist()))
+    rms = float(np.sqrt(cost / force.size))
+    return {
+        'coefficients': fitted,
+        'rms_error_n': rms,
+        'iterations': iterations,
+        'samples': int(force.size),
+    }
+
+
+def encode_array(array: np.ndarray, encoding: str = 'float32') -> Dict[str, Any]:
+    """Pack an array for JSON transport as base64 float32 bytes or a nested list"""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    if encoding == 'float32':
+        return {
+            'dtype': 'float32',
+            'shape': list(array.shape),
+            'data': base64.b64encode(array.tobytes()).decode('ascii'),
+        }
+    if encoding == 'json':
+        return {'shape': list(array.shape), 'data': np.round(array, 2).tolist()}
+    raise ValueError("encoding must be 'float32' or 'json'")
+
+
+def _axis(params: Dict[str, Any], name: str, default: Sequence[float], limit: int = 2000) -> np.ndarray:
+    """Explicit value list or {'start', 'stop', 'num'} range from a request body"""
+    spec = params.get(name, default)
+    if isinstance(spec, dict):
+        values = np.linspace(float(spec['start']), float(spec['stop']), int(spec.get('num', 50)))
+    else:
+        values = np.atleast_1d(np.asarray(spec, dtype=np.float64))
+    if values.ndim != 1 or values.size == 0 or values.size > limit:
+        raise ValueError(f"{name} must contain between 1 and {limit} values")
+    return values
+
+
+def evaluate_from_request(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate a force surface from a JSON request body"""
+    mode = params.get('mode', 'lateral')
+    default_slip = {'start': -0.3, 'stop': 0.3, 'num': 121} if mode != 'lateral' \
+        else {'start': -0.25, 'stop': 0.25, 'num': 121}
+    slip = _axis(params, 'slip', default_slip)
+    loads = _axis(params, 'loads', [2000.0, 4000.0, 6000.0], limit=200)
+    cambers = _axis(params, 'cambers', [0.0], limit=100)
+    pressures = _axis(params, 'pressures', [DEFAULT_COEFFICIENTS['NOMPRES']], limit=100)
+    slip_angle = _axis(params, 'slip_angle', {'start': -0.2, 'stop': 0.2, 'num': 41}) \
+        if mode == 'combined' else None
+
+    total = slip.size * loads.size * cambers.size * pressures.size * (1 if slip_angle is None else slip_angle.size)
+    if total > 5_000_000:
+        raise ValueError("Requested grid exceeds 5,000,000 points")
+
+    coefficients = merge_coefficients(params.get('coefficients'))
+    forces = evaluate_grid(mode, slip, loads, cambers, pressures, coefficients, slip_angle)
+
+    # Peaks come from the full-resolution surface, so downsampling cannot miss them
+    peak_force_n = {k: round(float(np.abs(v).max()), 2) for k, v in forces.items()}
+
+    # Strided downsampling along the slip axes keeps plot payloads bounded
+    max_points = int(params.get('max_points', 0))
+    slip_index = np.arange(slip.size)
+    if 0 < max_points < slip.size:
+        slip_index = np.unique(np.linspace(0, slip.size - 1, max_points).round().astype(int))
+        forces = {k: v[slip_index] for k, v in forces.items()}
+    if slip_angle is not None and 0 < max_points < slip_angle.size:
+        angle_index = np.unique(np.linspace(0, slip_angle.size - 1, max_points).round().astype(int))
+        forces = {k: v[:, angle_index] for k, v in forces.items()}
+        slip_angle = slip_angle[angle_index]
+
+    encoding = params.get('encoding', 'float32')
+    axes = {
+        'slip': slip[slip_index].tolist(),
+        'loads': loads.tolist(),
+        'cambers': cambers.tolist(),
+        'pressures': pressures.tolist(),
+    }
+    if slip_angle is not None:
+        axes['slip_angle'] = slip_angle.tolist()
+    return {
+        'mode': mode,
+        'axes': axes,
+        'forces': {k: encode_array(v, encoding) for k, v in forces.items()},
+        'peak_force_n': peak_force_n,
+        'points_evaluated': int(total),
+    }
+
+
+def fit_from_request(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Fit coefficients to measured samples from a JSON request body"""
+    for key in ('slip', 'fz', 'force'):
+        if key not in params:
+            raise ValueError(f"'{key}' samples are required")
+    return fit_coefficients(
+        params.get('mode', 'lateral'),
+        params['slip'],
+        params['fz'],
+        params['force'],
+        gamma=params.get('gamma'),
+        pressure=params.get('pressure'),
+        initial=params.get('initial'),
+        fit_keys=params.get('fit_keys'),
+        max_iterations=int(params.get('max_iterations', 50)),
+    )
@@ -0,0 +1,238 @@
+"""
+BytEdge Request Tracing and Profiling
+Per-request spans with a ring buffer of recent slow traces, plus on-demand
+statistical sampling and sampled cProfile sessions that return collapsed stacks
+"""
+
+import collections
+import contextvars
+import cProfile
+import io
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+_active_trace: contextvars.ContextVar = contextvars.ContextVar('byteedge_trace', default=None)
+
+
+class Trace:
+    """Spans recorded for one request"""
+
+    __slots__ = ('trace_id', 'name', 'attributes', 'started', 'started_at', 'spans', 'depth', 'duration_ms')
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.attributes = attributes or {}
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: List[tuple] = []
+        self.depth = 0
+        self.duration_ms = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'attributes': self.attributes,
+            'started_at': self.started_at,
+            'duration_ms': self.duration_ms,
+            'spans': [{'name': name, 'depth': depth, 'offset_ms': round(offset, 3), 'duration_ms': round(duration, 3)}
+                      for name, depth, offset, duration in self.spans],
+        }
+
+
+class Tracer:
+    """Creates traces and keeps the slowest recent ones in a bounded ring buffer"""
+
+    def __init__(self, enabled: bool = True, slow_threshold_ms: float = 2000.0, buffer_size: int = 100):
+        self.enabled = enabled
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_traces = collections.deque(maxlen=buffer_size)
+
+    @contextmanager
+    def trace(self, name: str, **attributes):
+        """Open a trace for the current request context; yields None when tracing is off"""
+        if not self.enabled:
+            yield None
+            return
+        current = Trace(name, attributes)
+        token = _active_trace.set(current)
+        try:
+            yield current
+        finally:
+            _active_trace.reset(token)
+            current.duration_ms = round((time.perf_counter() - current.started) * 1000.0, 3)
+            if current.duration_ms >= self.slow_threshold_ms:
+                self.slow_traces.append(current)
+
+    def recent_slow(self, limit: int = 20) -> List[Dict[str, Any]]:
+        return [t.to_dict() for t in list(self.slow_traces)[-limit:]][::-1]
+
+
+class _NullSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('trace', 'name', 'started')
+
+    def __init__(self, trace: Trace, name: str):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.trace.depth += 1
+        return self
+
+    def __exit__(self, *exc):
+        ended = time.perf_counter()
+        trace = self.trace
+        trace.depth -= 1
+        trace.spans.append((self.name, trace.depth, (self.started - trace.started) * 1000.0,
+                            (ended - self.started) * 1000.0))
+        return False
+
+
+def span(name: str):
+    """Time a block into the active trace; a shared no-op object when no trace is active"""
+    current = _active_trace.get()
+    if current is None:
+        return _NULL_SPAN
+    return _Span(current, name)
+
+
+def current_trace_id() -> Optional[str]:
+    current = _active_trace.get()
+    return current.trace_id if current else None
+
+
+# ============================================================================
+# PROFILING
+# ============================================================================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class Profiler:
+    """One profiling session at a time: statistical stack sampling or sampled cProfile"""
+
+    MODES = ('sample', 'cprofile')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.mode = None
+        self.sample_rate = 1.0
+        self._stats = None
+        self._requests = 0
+        self._stats_lock = threading.Lock()
+
+    def run(self, mode: str, seconds: float, interval_ms: float = 5.0, sample_rate: float = 1.0) -> Dict[str, Any]:
+        """Profile for ``seconds`` and return collapsed stacks (flamegraph.pl / speedscope input)"""
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of: {', '.join(self.MODES)}")
+        if not 0 < seconds <= 60:
+            raise ValueError("seconds must be between 0 and 60")
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profiling session is already running")
+        try:
+            self.mode = mode
+            if mode == 'sample':
+                stacks, samples = self._sample_stacks(seconds, interval_ms / 1000.0)
+                return {'mode': mode, 'seconds': seconds, 'samples': samples, 'collapsed': _collapse(stacks)}
+
+            self.sample_rate = sample_rate
+            self._stats = None
+            time.sleep(seconds)
+            self.mode = None
+            with self._stats_lock:
+                stats = self._stats
+            if stats is None:
+                return {'mode': mode, 'seconds': seconds, 'profiled_requests': 0, 'collapsed': '', 'top': ''}
+            return {'mode': mode, 'seconds': seconds, 'profiled_requests': self._requests,
+                    'collapsed': _collapse(_pstats_edges(stats)), 'top': _top_functions(stats)}
+        finally:
+            self.mode = None
+            self._lock.release()
+
+    def _sample_stacks(self, seconds: float, interval: float):
+        """Sample every other thread's Python stack at a fixed interval"""
+        own = threading.get_ident()
+        stacks: Dict[str, int] = collections.Counter()
+        samples = 0
+        end = time.time() + seconds
+        while time.time() < end:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                stacks[';'.join(reversed(labels))] += 1
+            samples += 1
+            time.sleep(interval)
+        return stacks, samples
+
+    @contextmanager
+    def maybe_profile(self):
+        """Profile the enclosed request when a cProfile session is active and it is sampled"""
+        if self.mode != 'cprofile' or random.random() >= self.sample_rate:
+            yield
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ allows one active cProfile per interpreter; overlapping requests run unprofiled
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._stats_lock:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                    self._requests = 1
+                else:
+                    self._stats.add(profile)
+                    self._requests += 1
+
+
+def _collapse(stacks: Dict[str, int]) -> str:
+    return '\n'.join(f"{stack} {count}" for stack, count in sorted(stacks.items(), key=lambda item: -item[1]))
+
+
+def _pstats_edges(stats: pstats.Stats) -> Dict[str, int]:
+    """Caller;callee pairs weighted by inclusive time in microseconds (cProfile has no full stacks)"""
+    edges: Dict[str, int] = collections.Counter()
+    for (filename, _, name), (_, _, _, _, callers) in stats.stats.items():
+        callee = f"{os.path.basename(filename)}:{name}"
+        for (caller_file, _, caller_name), caller_stats in callers.items():
+            cumulative = caller_stats[3]
+            edges[f"{os.path.basename(caller_file)}:{caller_name};{callee}"] += int(cumulative * 1e6)
+    return {stack: weight for stack, weight in edges.items() if weight > 0}
+
+
+def _top_functions(stats: pstats.Stats, limit: int = 30) -> str:
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
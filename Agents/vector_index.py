@@ -0,0 +1,370 @@
+"""
+BytEdge Vector Index
+Chunks and embeds per-agent reference documents on CPU into memory-mapped float16 matrices
+(optionally IVF-partitioned) and retrieves the best passages for a prompt within a token budget
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import time
+import zlib
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from knowledge_base import tokenize
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+DIM = 512  # hashing collisions blur short queries much below this
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 30
+IVF_THRESHOLD = 4096  # an exact scan converts ~1 µs of float16 per row, so small indexes skip IVF
+SCAN_BLOCK = 65_536  # rows converted to float32 at a time during exact scans
+
+# ============================================================================
+# EMBEDDING
+# ============================================================================
+
+# Feature weights: stemmed words, word pairs and character trigrams (for partial word matches)
+_UNIGRAM, _BIGRAM, _TRIGRAM = 1.0, 0.7, 0.25
+
+
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    """Deterministic (process-independent) hash bucket and sign for a feature"""
+    h = zlib.crc32(feature.encode('utf-8'))
+    return h % dim, 1.0 if (h >> 31) & 1 else -1.0
+
+
+def embed(texts: Iterable[str], dim: int = DIM) -> np.ndarray:
+    """
+    L2-normalised signed feature-hashing embeddings as float32 rows.
+
+    Needs no model download or GPU and is stable across processes, so vectors built offline
+    match queries embedded at request time. Counts are damped with log1p so long chunks
+    are not dominated by repeated terms.
+    """
+    texts = list(texts)
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = tokenize(text)
+        features: Dict[str, float] = {}
+        for i, word in enumerate(words):
+            features[word] = features.get(word, 0.0) + _UNIGRAM
+            if i:
+                pair = f"{words[i - 1]} {word}"
+                features[pair] = features.get(pair, 0.0) + _BIGRAM
+            padded = f"<{word}>"
+            for j in range(len(padded) - 2):
+                gram = '#' + padded[j:j + 3]
+                features[gram] = features.get(gram, 0.0) + _TRIGRAM
+        vector = out[row]
+        for feature, weight in features.items():
+            index, sign = _bucket(feature, dim)
+            vector[index] += sign * np.log1p(weight)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+    return out
+
+
+# ============================================================================
+# CHUNKING
+# ============================================================================
+
+_HEADING = re.compile(r'^(#{1,6})\s+(.*)$')
+
+
+def chunk_markdown(text: str, source: str, max_words: int = CHUNK_WORDS,
+                   overlap: int = CHUNK_OVERLAP) -> List[Dict[str, str]]:
+    """Split a markdown document into section-titled chunks of at most ``max_words`` words"""
+    document = source
+    sections: List[Tuple[str, List[str]]] = []
+    heading, paragraphs, current = None, [], []
+    for line in text.splitlines() + ['']:
+        match = _HEADING.match(line)
+        if match or not line.strip():
+            if current:
+                paragraphs.append('\n'.join(current))
+                current = []
+            if match:
+                if paragraphs:
+                    sections.append((heading or document, paragraphs))
+                if len(match.group(1)) == 1:
+                    document = match.group(2).strip()
+                heading, paragraphs = match.group(2).strip(), []
+        else:
+            current.append(line)
+    if paragraphs:
+        sections.append((heading or document, paragraphs))
+
+    chunks = []
+    for heading, paragraphs in sections:
+        title = heading if heading == document else f"{document} - {heading}"
+        buffer: List[str] = []
+        for paragraph in paragraphs:
+            words = paragraph.split(' ')
+            if buffer and len(' '.join(buffer).split()) + len(words) > max_words:
+                chunks.append({'title': title, 'source': source, 'text': '\n\n'.join(buffer)})
+                buffer = []
+            if len(words) <= max_words:
+                buffer.append(paragraph)
+                continue
+            step = max_words - overlap
+            for start in range(0, len(words), step):
+                chunks.append({'title': title, 'source': source, 'text': ' '.join(words[start:start + max_words])})
+                if start + max_words >= len(words):
+                    break
+        if buffer:
+            chunks.append({'title': title, 'source': source, 'text': '\n\n'.join(buffer)})
+    return chunks
+
+
+def source_files(source_dir: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(source_dir, '*.md')) + glob.glob(os.path.join(source_dir, '*.txt')))
+
+
+def fingerprint(paths: List[str], dim: int = DIM) -> str:
+    """Hash of the sources and every parameter that changes the stored vectors"""
+    digest = hashlib.sha256(f"{INDEX_VERSION}:{dim}:{CHUNK_WORDS}:{CHUNK_OVERLAP}".encode())
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# ============================================================================
+# BUILDING
+# ============================================================================
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 10, sample: int = 32, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on a sample of at most ``sample`` rows per centroid (float32 centroids)"""
+    rng = np.random.default_rng(seed)
+    n = vectors.shape[0]
+    rows = np.sort(rng.choice(n, size=min(n, k * sample), replace=False))
+    data = np.asarray(vectors[rows], dtype=np.float32)
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, data)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        centroids = np.where(empty[:, None], centroids, sums / np.maximum(norms, 1e-12))
+    return centroids
+
+
+def assign(vectors: np.ndarray, centroids: np.ndarray, block: int = SCAN_BLOCK) -> np.ndarray:
+    labels = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], block):
+        chunk = np.asarray(vectors[start:start + block], dtype=np.float32)
+        labels[start:start + block] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
+
+
+def write_index(out_dir: str, vectors: np.ndarray, records: List[Dict[str, Any]], nlist: Optional[int] = None,
+                source_fingerprint: str = '') -> Dict[str, Any]:
+    """
+    Persist one agent's index: float16 vectors, chunk records and (for large indexes) IVF lists.
+
+    With IVF the rows are stored grouped by list, so every probed list is one contiguous
+    slice of the memory-mapped matrix. ``nlist`` defaults to about 4 * sqrt(N) above IVF_THRESHOLD,
+    which keeps each list to a few hundred rows so a probe converts little float16 data.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    n, dim = vectors.shape
+    if nlist is None:
+        nlist = int(4 * np.sqrt(n)) if n >= IVF_THRESHOLD else 0
+    order = np.arange(n)
+    if nlist:
+        centroids = kmeans(vectors, nlist)
+        labels = assign(vectors, centroids)
+        order = np.argsort(labels, kind='stable')
+        lists = np.zeros(nlist + 1, dtype=np.int64)
+        lists[1:] = np.cumsum(np.bincount(labels, minlength=nlist))
+        np.save(os.path.join(out_dir, 'centroids.npy'), centroids.astype(np.float32))
+        np.save(os.path.join(out_dir, 'lists.npy'), lists)
+
+    matrix = np.lib.format.open_memmap(os.path.join(out_dir, 'vectors.npy'), mode='w+',
+                                       dtype=np.float16, shape=(n, dim))
+    for start in range(0, n, SCAN_BLOCK):
+        matrix[start:start + SCAN_BLOCK] = vectors[order[start:start + SCAN_BLOCK]]
+    matrix.flush()
+    del matrix
+
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    with open(os.path.join(out_dir, 'chunks.jsonl'), 'wb') as f:
+        for row, index in enumerate(order):
+            line = json.dumps(records[index], ensure_ascii=False).encode('utf-8') + b'\n'
+            f.write(line)
+            offsets[row + 1] = offsets[row] + len(line)
+    np.save(os.path.join(out_dir, 'offsets.npy'), offsets)
+
+    manifest = {'version': INDEX_VERSION, 'dim': dim, 'count': n, 'nlist': nlist,
+                'fingerprint': source_fingerprint, 'built_at': time.time()}
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def build_agent_index(source_dir: str, out_dir: str, nlist: Optional[int] = None) -> Dict[str, Any]:
+    """Chunk, embed and persist every document in one agent's reference directory"""
+    paths = source_files(source_dir)
+    records = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            records.extend(chunk_markdown(f.read(), os.path.basename(path)))
+    vectors = np.empty((len(records), DIM), dtype=np.float16)
+    for start in range(0, len(records), 4096):
+        batch = records[start:start + 4096]
+        vectors[start:start + len(batch)] = embed(f"{record['title']}\n{record['text']}" for record in batch)
+    return write_index(out_dir, vectors, records, nlist=nlist, source_fingerprint=fingerprint(paths))
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def _top_k(rows: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if len(scores) > k:
+        keep = np.argpartition(scores, -k)[-k:]
+        rows, scores = rows[keep], scores[keep]
+    order = np.argsort(-scores)
+    return rows[order], scores[order]
+
+
+class VectorIndex:
+    """One agent's memory-mapped index; vectors and chunk text are paged in only when touched"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r')
+        self.offsets = np.load(os.path.join(path, 'offsets.npy'), mmap_mode='r')
+        self.nlist = self.manifest.get('nlist', 0)
+        if self.nlist:
+            self.centroids = np.load(os.path.join(path, 'centroids.npy'))
+            self.lists = np.load(os.path.join(path, 'lists.npy'))
+        with open(os.path.join(path, 'chunks.jsonl'), 'rb') as f:
+            self._chunks = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(f.name) else b''
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def _probe(self, queries: np.ndarray, nprobe: int) -> List[Tuple[int, int]]:
+        """Row ranges of the union of each query's ``nprobe`` nearest IVF lists"""
+        nprobe = min(nprobe, self.nlist)
+        nearest = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        return [(int(self.lists[i]), int(self.lists[i + 1])) for i in np.unique(nearest)
+                if self.lists[i + 1] > self.lists[i]]
+
+    def search(self, queries: np.ndarray, k: int = 5, nprobe: int = 8) -> List[List[Tuple[int, float]]]:
+        """Top ``k`` (row, cosine) per query row, scoring the whole batch in one matrix product per block"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if self.nlist:
+            ranges = self._probe(queries, nprobe)
+            blocks = [(np.concatenate([np.arange(start, end) for start, end in ranges]),
+                       np.concatenate([self.vectors[start:end] for start, end in ranges]))] if ranges else []
+        else:
+            blocks = ((np.arange(start, min(start + SCAN_BLOCK, len(self))), self.vectors[start:start + SCAN_BLOCK])
+                      for start in range(0, len(self), SCAN_BLOCK))
+        best_rows = [np.empty(0, dtype=np.int64) for _ in queries]
+        best_scores = [np.empty(0, dtype=np.float32) for _ in queries]
+        for rows, vectors in blocks:
+            scores = queries @ vectors.astype(np.float32).T
+            for q in range(len(queries)):
+                best_rows[q], best_scores[q] = _top_k(np.concatenate([best_rows[q], rows]),
+                                                      np.concatenate([best_scores[q], scores[q]]), k)
+        return [list(zip(rows.tolist(), scores.tolist())) for rows, scores in zip(best_rows, best_scores)]
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return json.loads(self._chunks[int(self.offsets[row]):int(self.offsets[row + 1])])
+
+
+class Retriever:
+    """Per-agent vector indexes under one directory, packed into prompt context by token budget"""
+
+    def __init__(self, index_dir: str, source_dir: Optional[str] = None, top_k: int = 4, nprobe: int = 8,
+                 min_score: float = 0.15, token_budget: int = 600):
+        self.index_dir = index_dir
+        self.source_dir = source_dir
+        self.top_k = top_k
+        self.nprobe = nprobe
+        self.min_score = min_score
+        self.token_budget = token_budget
+        self.indexes: Dict[str, VectorIndex] = {}
+
+    def load(self) -> 'Retriever':
+        for manifest in sorted(glob.glob(os.path.join(self.index_dir, '*', 'manifest.json'))):
+            path = os.path.dirname(manifest)
+            agent = os.path.basename(path)
+            try:
+                index = VectorIndex(path)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Skipping vector index %s: %s", path, e)
+                continue
+            if index.manifest.get('version') != INDEX_VERSION:
+                logger.warning("Vector index %s was built by an older indexer; rebuild it", path)
+                continue
+            if self.source_dir:
+                sources = source_files(os.path.join(self.source_dir, agent))
+                if index.manifest.get('fingerprint') != fingerprint(sources, index.manifest['dim']):
+                    logger.warning("Vector index for %s is stale; run build_index.py to refresh it", agent)
+            self.indexes[agent] = index
+        return self
+
+    def sizes(self) -> Dict[str, int]:
+        return {agent: len(index) for agent, index in self.indexes.items()}
+
+    def search(self, agent: str, queries: List[str], k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Best chunks for a batch of queries.
+
+        Per-query rankings are interleaved (first hit of every query, then the second, ...) so
+        each query contributes its best chunks; a chunk reports its highest cosine in the batch.
+        """
+        index = self.indexes.get(agent)
+        if index is None or not queries:
+            return []
+        k = k or self.top_k
+        results = index.search(embed(queries, index.manifest['dim']), k, self.nprobe)
+        best: Dict[int, float] = {}
+        for hits in results:
+            for row, score in hits:
+                best[row] = max(score, best.get(row, -1.0))
+        ranked: List[int] = []
+        for rank in range(k):
+            for hits in results:
+                if rank < len(hits) and hits[rank][0] not in ranked:
+                    ranked.append(hits[rank][0])
+        return [{**index.record(row), 'score': round(best[row], 4)} for row in ranked[:k]]
+
+    def retrieve(self, agent: str, queries: List[str]) -> List[Dict[str, Any]]:
+        """Passages above ``min_score``, best first, whose estimated tokens fit the budget"""
+        passages, used = [], 0
+        for hit in self.search(agent, queries):
+            if hit['score'] < self.min_score:
+                continue
+            tokens = estimate_tokens(hit['text'])
+            if used + tokens > self.token_budget:
+                continue
+            passages.append({**hit, 'tokens': tokens})
+            used += tokens
+        return passages
+
+
+def estimate_tokens(text: str) -> int:
+    """Same chars/4 estimate the token counters use when the SDK reports no usage"""
+    return len(text) // 4 + 1
+
+
+def format_passages(passages: List[Dict[str, Any]]) -> str:
+    return '\n\n'.join(f"[{i}] {p['title']} ({p['source']}):\n{p['text']}" for i, p in enumerate(passages, 1))
@@ -0,0 +1,172 @@
+"""
+BytEdge Warmup Scheduler
+Pre-answers every agent's quick topics at startup and refreshes them while the server is idle,
+within a rate budget, so the first users after a deploy do not pay cold model latency
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Callable, Optional, Tuple
+
+import instrumentation
+
+logger = logging.getLogger(__name__)
+
+WARMUP_CALLS = instrumentation.registry.counter('warmup_calls_total', 'Warmup model calls by agent and outcome')
+
+_SPACE = re.compile(r'\s+')
+
+
+def normalize(question: str) -> str:
+    """Case, spacing and trailing punctuation do not change which quick topic was asked"""
+    return _SPACE.sub(' ', question.strip().lower()).rstrip(' ?.!')
+
+
+def prompt_version(*parts: Any) -> str:
+    """Short digest of everything that shapes an answer (system prompt, tool guide, model settings)"""
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode()).hexdigest()[:12]
+
+
+class WarmStore:
+    """Warmed answers keyed by agent and normalized question, each tagged with the prompt version"""
+
+    def __init__(self, version: Callable[[str], str]):
+        self.version = version  # agent -> current prompt version
+        self.entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, agent: str, question: str) -> Optional[Dict[str, Any]]:
+        """The warmed answer if it was produced by the agent's current prompt"""
+        entry = self.entries.get((agent, normalize(question)))
+        if entry is None or entry['version'] != self.version(agent):
+            return None
+        return entry
+
+    def put(self, agent: str, question: str, result: Dict[str, Any]):
+        with self._lock:
+            self.entries[(agent, normalize(question))] = {
+                'result': result, 'version': self.version(agent), 'warmed_at': time.time()}
+
+    def age(self, agent: str, question: str) -> Optional[float]:
+        """Seconds since a current-version answer was warmed, or None if there is none"""
+        entry = self.get(agent, question)
+        return time.time() - entry['warmed_at'] if entry else None
+
+    def sizes(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for agent, _ in list(self.entries):
+            counts[agent] = counts.get(agent, 0) + 1
+        return counts
+
+
+class WarmupScheduler:
+    """Background thread that warms missing topics first, then refreshes the oldest, only while idle"""
+
+    def __init__(self, store: WarmStore, topics: Dict[str, List[str]],
+                 warm: Callable[[str, str], Optional[Dict[str, Any]]], budget_per_minute: int = 20,
+                 idle_s: float = 2.0, refresh_s: float = 3600.0, retry_s: float = 60.0, poll_s: float = 0.25):
+        self.store = store
+        self.topics = topics  # agent -> quick-topic questions
+        self.warm = warm  # warm(agent, question) -> chat result, or None if it could not be answered
+        self.budget_per_minute = budget_per_minute
+        self.idle_s = idle_s
+        self.refresh_s = refresh_s
+        self.retry_s = retry_s
+        self.poll_s = poll_s
+        self.inflight = 0
+        self.last_activity = 0.0
+        self.failed_at: Dict[Tuple[str, str], float] = {}
+        self._calls: List[float] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @contextmanager
+    def interactive(self):
+        """Mark a user request in progress; warmup waits until none are and the server has been idle a while"""
+        with self._lock:
+            self.inflight += 1
+            self.last_activity = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.inflight -= 1
+                self.last_activity = time.monotonic()
+
+    def idle(self) -> bool:
+        return self.inflight == 0 and time.monotonic() - self.last_activity >= self.idle_s
+
+    def _within_budget(self) -> bool:
+        now = time.monotonic()
+        self._calls = [t for t in self._calls if now - t < 60.0]
+        return len(self._calls) < self.budget_per_minute
+
+    def next_topic(self) -> Optional[Tuple[str, str, bool]]:
+        """(agent, question, is_refresh): unwarmed or outdated topics first, then the oldest past refresh_s"""
+        now = time.monotonic()
+        oldest = None
+        for agent, questions in self.topics.items():
+            for question in questions:
+                failed = self.failed_at.get((agent, normalize(question)))
+                if failed is not None and now - failed < self.retry_s:
+                    continue
+                age = self.store.age(agent, question)
+                if age is None:
+                    return agent, question, False
+                if age >= self.refresh_s and (oldest is None or age > oldest[0]):
+                    oldest = (age, agent, question)
+        return (oldest[1], oldest[2], True) if oldest else None
+
+    def step(self) -> bool:
+        """Warm one topic if the server is idle and the budget allows; True if a call was made"""
+        if not self.idle() or not self._within_budget():
+            return False
+        topic = self.next_topic()
+        if topic is None:
+            return False
+        agent, question, refresh = topic
+        self._calls.append(time.monotonic())
+        started = time.perf_counter()
+        try:
+            result = self.warm(agent, question)
+        except Exception as e:
+            logger.warning("Warmup of %s topic failed: %s", agent, e)
+            result = None
+        if result is None:
+            self.failed_at[(agent, normalize(question))] = time.monotonic()
+            WARMUP_CALLS.inc(agent=agent, outcome='failed')
+            return True
+        self.failed_at.pop((agent, normalize(question)), None)
+        self.store.put(agent, question, result)
+        WARMUP_CALLS.inc(agent=agent, outcome='refreshed' if refresh else 'warmed')
+        logger.info("Warmed %s quick topic in %.0f ms (%s)", agent, (time.perf_counter() - started) * 1000,
+                    'refresh' if refresh else 'startup')
+        return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.step():
+                self._stop.wait(self.poll_s)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='warmup', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        topics = []
+        for agent, questions in self.topics.items():
+            for question in questions:
+                age = self.store.age(agent, question)
+                topics.append({'agent': agent, 'question': question, 'version': self.store.version(agent),
+                               'warm': age is not None, 'age_s': round(age, 1) if age is not None else None})
+        return {'running': self._thread is not None and not self._stop.is_set(), 'idle': self.idle(),
+                'budget_per_minute': self.budget_per_minute, 'topics': topics}
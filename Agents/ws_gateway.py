@@ -0,0 +1,248 @@
+"""
+BytEdge WebSocket Gateway
+One persistent connection per page carries any number of conversations with any agent, multiplexed
+by request and conversation id, with model output pushed as it streams and built-in heartbeats
+"""
+
+import json
+import logging
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Optional
+
+try:
+    from simple_websocket import ConnectionClosed
+except ImportError:  # flask-sock is optional; without it the pages keep using HTTP
+    ConnectionClosed = ConnectionError
+
+logger = logging.getLogger(__name__)
+
+# answer(message, agent_type, conversation_id, on_token) -> API result dict
+Answer = Callable[[str, str, str, Callable[[str], None]], Dict[str, Any]]
+
+# WebSocket close code for policy violations (RFC 6455)
+CLOSE_POLICY = 1008
+
+
+class ClientLimiter:
+    """Counts open connections per client address and refuses those over the limit"""
+
+    def __init__(self, max_per_client: int):
+        self.max_per_client = max_per_client
+        self.open: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str) -> bool:
+        with self._lock:
+            if self.open.get(client, 0) >= self.max_per_client:
+                return False
+            self.open[client] = self.open.get(client, 0) + 1
+            return True
+
+    def release(self, client: str):
+        with self._lock:
+            remaining = self.open.get(client, 0) - 1
+            if remaining > 0:
+                self.open[client] = remaining
+            else:
+                self.open.pop(client, None)
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.open.values())
+
+
+class Session:
+    """One client connection: a receive loop that hands chat frames to the gateway's workers"""
+
+    def __init__(self, gateway: 'Gateway', ws, client: str):
+        self.gateway = gateway
+        self.ws = ws
+        self.client = client
+        self.conversations: Dict[str, threading.Lock] = {}  # conversation id -> turn lock
+        self.inflight = 0
+        self.closed = False
+        self._send_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self.last_sent = time.monotonic()
+
+    def send(self, frame: Dict[str, Any]) -> bool:
+        """Serialize and send one frame; workers and the receive loop share the socket"""
+        if self.closed:
+            return False
+        data = json.dumps(frame, separators=(',', ':'))
+        try:
+            with self._send_lock:
+                self.ws.send(data)
+                self.last_sent = time.monotonic()
+        except (ConnectionClosed, OSError):
+            self.closed = True
+            return False
+        self.gateway.record_frame('out', frame['type'], len(data))
+        return True
+
+    def error(self, code: str, message: str, request_id: Optional[str] = None, **extra):
+        self.send({'type': 'error', 'id': request_id, 'code': code, 'error': message, **extra})
+
+    def run(self):
+        gateway = self.gateway
+        self.send({'type': 'ready', 'heartbeat_s': gateway.heartbeat_s, 'agents': sorted(gateway.agents),
+                   'limits': {'inflight': gateway.max_inflight, 'conversations': gateway.max_conversations}})
+        while not self.closed:
+            try:
+                data = self.ws.receive(timeout=gateway.heartbeat_s)
+            except ConnectionClosed:
+                break
+            if data is None:
+                # Idle: a heartbeat lets both sides tell a quiet connection from a dead one
+                if time.monotonic() - self.last_sent >= gateway.heartbeat_s:
+                    self.send({'type': 'heartbeat', 'ts': round(time.time(), 3)})
+                continue
+            self.dispatch(data)
+        self.closed = True
+
+    def dispatch(self, data):
+        try:
+            frame = json.loads(data)
+            kind = frame.get('type')
+        except (ValueError, TypeError, AttributeError):
+            self.gateway.record_frame('in', 'invalid', len(data or ''))
+            self.error('bad_frame', 'Frames must be JSON objects with a type')
+            return
+        self.gateway.record_frame('in', str(kind), len(data))
+
+        if kind == 'chat':
+            self.submit(frame)
+        elif kind == 'ping':
+            self.send({'type': 'pong', 'ts': round(time.time(), 3)})
+        elif kind == 'end':
+            with self._state_lock:
+                self.conversations.pop(frame.get('conversation_id'), None)
+        elif kind in ('pong', 'heartbeat'):
+            pass
+        else:
+            self.error('bad_frame', f"Unknown frame type: {kind}", frame.get('id'))
+
+    def submit(self, frame: Dict[str, Any]):
+        """Validate a chat frame and queue it, enforcing per-connection limits"""
+        gateway = self.gateway
+        request_id = frame.get('id')
+        agent_type = frame.get('agent')
+        message = frame.get('message')
+        message = message.strip() if isinstance(message, str) else ''
+        if not message:
+            return self.error('bad_request', 'Message is required', request_id)
+        if agent_type not in gateway.agents:
+            return self.error('bad_request', f"Unknown agent type: {agent_type}", request_id)
+
+        conversation_id = frame.get('conversation_id') or gateway.new_conversation_id(agent_type)
+        with self._state_lock:
+            if self.inflight >= gateway.max_inflight:
+                gateway.record_rejected('inflight')
+                return self.error('busy', f"At most {gateway.max_inflight} requests may be in flight "
+                                  "per connection", request_id, conversation_id=conversation_id)
+            if conversation_id not in self.conversations:
+                if len(self.conversations) >= gateway.max_conversations:
+                    gateway.record_rejected('conversations')
+                    return self.error('conversation_limit', f"At most {gateway.max_conversations} open "
+                                      "conversations per connection; end one first", request_id)
+                self.conversations[conversation_id] = threading.Lock()
+            turn_lock = self.conversations[conversation_id]
+            self.inflight += 1
+        gateway.workers.submit(self.answer, request_id, agent_type, conversation_id, message, turn_lock)
+
+    def answer(self, request_id: Optional[str], agent_type: str, conversation_id: str, message: str,
+               turn_lock: threading.Lock):
+        """Run one turn on a worker: start, token frames while the model streams, then done"""
+        base = {'id': request_id, 'conversation_id': conversation_id}
+        streamed = []
+        finished = threading.Event()
+
+        def on_token(text: str):
+            # Tokens still arriving after an upstream timeout are dropped; the fallback answer wins
+            if text and not finished.is_set():
+                streamed.append(text)
+                self.send({'type': 'token', 'id': request_id, 'text': text})
+
+        try:
+            # Turns of one conversation run in order; different conversations run in parallel
+            with turn_lock:
+                self.send({'type': 'start', **base, 'agent': agent_type})
+                try:
+                    result = self.gateway.answer(message, agent_type, conversation_id, on_token)
+                except Exception as e:
+                    logger.error("WebSocket turn failed for %s: %s", agent_type, e)
+                    result = {'success': False, 'error': 'Internal server error'}
+                finished.set()
+            done = {**result, 'type': 'done', **base}
+            # The reply text is only repeated when it differs from what was streamed
+            if result.get('success') and ''.join(streamed) == result.get('message'):
+                done.pop('message')
+                done['streamed'] = True
+            self.send(done)
+        finally:
+            with self._state_lock:
+                self.inflight -= 1
+
+
+class Gateway:
+    """Shared limits, worker pool and metrics for every WebSocket session"""
+
+    def __init__(self, answer: Answer, agents: Iterable[str], max_per_client: int = 4, max_inflight: int = 4,
+                 max_conversations: int = 32, heartbeat_s: float = 20.0, workers: int = 16,
+                 new_conversation_id: Optional[Callable[[str], str]] = None):
+        self.answer = answer
+        self.new_conversation_id = new_conversation_id or (lambda agent: f"{agent}_{uuid.uuid4().hex[:12]}")
+        self.agents = frozenset(agents)
+        self.max_inflight = max_inflight
+        self.max_conversations = max_conversations
+        self.heartbeat_s = heartbeat_s
+        self.limiter = ClientLimiter(max_per_client)
+        self.workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ws')
+        self.frames = None
+        self.frame_bytes = None
+        self.rejected = None
+
+    def register_metrics(self, registry):
+        self.frames = registry.counter('ws_frames_total', 'WebSocket frames by direction and type')
+        self.frame_bytes = registry.counter('ws_frame_bytes_total', 'WebSocket payload bytes by direction')
+        self.rejected = registry.counter('ws_rejected_total', 'WebSocket connections and requests refused by limit')
+        registry.gauge('ws_connections', lambda: {(): self.limiter.total()}, 'Open WebSocket connections')
+
+    def record_frame(self, direction: str, kind: str, size: int):
+        if self.frames is not None:
+            self.frames.inc(direction=direction, type=kind)
+            self.frame_bytes.inc(size, direction=direction)
+
+    def record_rejected(self, reason: str):
+        if self.rejected is not None:
+            self.rejected.inc(reason=reason)
+
+    def serve(self, ws, client: str):
+        """Run a session for an accepted connection until either side closes it"""
+        if not self.limiter.acquire(client):
+            self.record_rejected('connections')
+            logger.warning("Refused WebSocket from %s: %s connections open", client, self.limiter.max_per_client)
+            ws.close(reason=CLOSE_POLICY, message='Too many connections from this client')
+            return
+        started = time.monotonic()
+        # Frames are small and written back to back; without this Nagle holds each one for the previous ACK
+        sock = getattr(ws, 'sock', None)
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+        session = Session(self, ws, client)
+        try:
+            session.run()
+        finally:
+            session.closed = True
+            self.limiter.release(client)
+            logger.info("WebSocket from %s closed after %.1f s", client, time.monotonic() - started)
+
+    def shutdown(self):
+        self.workers.shutdown(wait=False)
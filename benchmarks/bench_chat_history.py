@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Chat history rerun benchmark
+Reruns the Streamlit app under AppTest with sessions of growing length and compares rerun time, chat
+elements and markdown bytes sent against the previous rendering (one element per message plus a
+full-history scan for the brake demo)
+
+Usage: python benchmarks/bench_chat_history.py [--sizes 20,200,2000,10000] [--runs 5] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from chat_history import ChatHistory  # noqa: E402
+
+ANSWER = ("**Frame stiffness**: closed sections are 5-10x more torsionally rigid than open ones; "
+          "target 20,000+ Nm/deg and check the suspension pickup points. ") * 12
+
+
+def previous_rendering():
+    """The chat part of main() before windowing"""
+    import streamlit as st
+
+    for message in st.session_state.chat_history:
+        st.markdown(f'<div class="chat-message">{message["content"]}</div>', unsafe_allow_html=True)
+    if st.session_state.chat_history and any("brake" in msg["content"].lower()
+                                             for msg in st.session_state.chat_history):
+        st.markdown("### Live Simulation Demo - Brake Performance Analysis")
+
+
+def conversation(count: int):
+    for i in range(count):
+        yield ('user', f'Question {i} about the frame layout') if i % 2 == 0 else ('assistant', ANSWER)
+
+
+def chat_markdown(at: AppTest):
+    return [m.value for m in at.markdown if '<div class="chat-message' in m.value]
+
+
+def timed_reruns(at: AppTest, runs: int) -> float:
+    at.run()  # first run imports and builds caches
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        at.run()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def measure(count: int, runs: int, spill_dir: str):
+    previous = AppTest.from_function(previous_rendering, default_timeout=120)
+    previous.session_state['chat_history'] = [{'role': role, 'content': content}
+                                              for role, content in conversation(count)]
+    previous_ms = timed_reruns(previous, runs)
+    previous_chat = chat_markdown(previous)
+
+    history = ChatHistory(int(os.getenv('CHAT_MAX_MESSAGES', 200)), int(os.getenv('CHAT_WINDOW', 20)),
+                          spill_dir, track=('brake',))
+    for role, content in conversation(count):
+        history.append(role, content)
+    app = AppTest.from_file(os.path.join(ROOT, 'byteedge_automotive_ai.py'), default_timeout=120)
+    app.session_state['chat_history'] = history
+    app_ms = timed_reruns(app, runs)
+    app_chat = chat_markdown(app)
+    return {
+        'previous_rerun_ms': round(previous_ms, 1),
+        'previous_elements': len(previous_chat),
+        'previous_kb': round(sum(len(value) for value in previous_chat) / 1024, 1),
+        'app_rerun_ms': round(app_ms, 1),
+        'app_elements': len(app_chat),
+        'app_kb': round(sum(len(value) for value in app_chat) / 1024, 1),
+        'in_memory': len(history.messages),
+        'spilled': history.spilled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='20,200,2000,10000', help='messages in the session')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    os.environ.pop('GEMINI_API_KEY', None)
+    with tempfile.TemporaryDirectory() as spill_dir:
+        results = {int(size): measure(int(size), args.runs, spill_dir) for size in args.sizes.split(',')}
+
+    print(f"{'messages':>8} | {'previous ms':>11} {'elements':>8} {'KB':>7} | {'app ms':>7} {'elements':>8} "
+          f"{'KB':>5} {'in memory':>9} {'spilled':>7}")
+    for size, row in results.items():
+        print(f"{size:>8} | {row['previous_rerun_ms']:>11.1f} {row['previous_elements']:>8} {row['previous_kb']:>7.1f} | "
+              f"{row['app_rerun_ms']:>7.1f} {row['app_elements']:>8} {row['app_kb']:>5.1f} "
+              f"{row['in_memory']:>9} {row['spilled']:>7}")
+    print("previous: chat elements only; app: the whole page, including metrics, agent cards and footer")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({str(size): row for size, row in results.items()}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
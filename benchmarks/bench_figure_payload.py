@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Figure payload benchmark
+Compares JSON bytes and build + serialize time for raw float64 traces against
+LTTB / min-max decimated float32 traces and cached figures
+
+Usage: python benchmarks/bench_figure_payload.py [--points 10000 100000 500000] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.graph_objects as go
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figure_builder import FigureCache, line_trace_kwargs  # noqa: E402
+
+
+def signal(n: int):
+    """Noisy temperature sweep with occasional spikes, like a long simulation trace"""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0.0, 3600.0, n)
+    y = 80 + 30 * np.sin(x / 300.0) + rng.normal(0, 2, n)
+    y[rng.integers(0, n, max(1, n // 5000))] += 40
+    return x, y
+
+
+def build(x, y, method: str):
+    fig = go.Figure()
+    if method == 'raw':
+        fig.add_trace(go.Scatter(x=x.tolist(), y=y.tolist(), mode='lines+markers'))
+    else:
+        fig.add_trace(go.Scatter(**line_trace_kwargs(x, y, method=method)))
+    fig.update_layout(template='plotly_dark', height=500)
+    return fig
+
+
+def measure(n: int, method: str, repeats: int = 3):
+    x, y = signal(n)
+    best = float('inf')
+    size = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        payload = build(x, y, method).to_json()
+        best = min(best, time.perf_counter() - start)
+        size = len(payload.encode('utf-8'))
+    return {'points': n, 'method': method, 'payload_bytes': size, 'build_serialize_ms': round(best * 1000, 2)}
+
+
+def measure_cached(n: int):
+    x, y = signal(n)
+    cache = FigureCache()
+    params = {'points': n}
+    cache.get_or_build('bench', params, lambda: build(x, y, 'lttb'))
+    start = time.perf_counter()
+    for _ in range(100):
+        cache.get_or_build('bench', params, lambda: build(x, y, 'lttb'))
+    return {'points': n, 'method': 'lttb+cache', 'lookup_us': round((time.perf_counter() - start) * 1e4, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--points', type=int, nargs='+', default=[10000, 100000, 500000])
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'points':>9} {'method':>10} {'payload KB':>11} {'build+json ms':>14}")
+    for n in args.points:
+        for method in ('raw', 'lttb', 'minmax'):
+            row = measure(n, method)
+            results.append(row)
+            print(f"{n:>9} {method:>10} {row['payload_bytes'] / 1024:>11.1f} {row['build_serialize_ms']:>14.2f}")
+        cached = measure_cached(n)
+        results.append(cached)
+        print(f"{n:>9} {'cache hit':>10} {'':>11} {cached['lookup_us'] / 1000:>14.4f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Hot-path micro-benchmarks
+Times query routing, prompt assembly and history storage in the agent server, Simulation figure
+construction and a headless Streamlit rerun of main(), and checks the results against a committed baseline
+
+Usage: python benchmarks/bench_hotpaths.py [groups...] [--check] [--threshold 0.25] [--update] [--json out.json]
+Compare two saved runs: python benchmarks/bench_hotpaths.py --results new.json --baseline old.json --check
+"""
+
+import argparse
+import functools
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+AGENTS_DIR = os.path.join(ROOT, 'Agents')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hotpaths_baseline.json')
+
+HISTORY_LENGTHS = (0, 6, 50)  # empty, the prompt's 6-exchange window, the 50-exchange store cap
+QUESTION = 'Walk me through the stiffness and weight trade-offs of a ladder frame versus a unibody for a light truck'
+OFF_TOPIC = [
+    'What should our Series A pitch emphasise?',
+    'Summarise the last conversation',
+    'Can you help me plan a test programme for next quarter?',
+]
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+    def __iter__(self):
+        return iter([self])
+
+
+class InstantModel:
+    """Upstream stand-in that answers at once, so only the local work is timed"""
+
+    def generate_content(self, prompt, stream=False):
+        return _Response('A unibody is stiffer per kilogram; a ladder frame carries payload and towing loads better.')
+
+
+def _timed(run, loops: int) -> float:
+    started = time.perf_counter()
+    measured = run(loops)
+    return measured if measured is not None else time.perf_counter() - started
+
+
+def time_case(run, min_s: float, repeat: int):
+    """
+    Median and best microseconds per operation.
+
+    ``run(n)`` performs n operations and may return the seconds of the part being measured; otherwise
+    its wall time counts. Loops are calibrated so each of the ``repeat`` samples takes about ``min_s / repeat``.
+    """
+    target = min_s / repeat
+    loops = 1
+    while loops < 1 << 20:
+        started = time.perf_counter()
+        run(loops)
+        wall = time.perf_counter() - started
+        if wall >= target:
+            break
+        loops = min(1 << 20, max(loops * 2, int(loops * target / max(wall, 1e-9))))
+    samples = [_timed(run, loops) / loops * 1e6 for _ in range(repeat)]
+    return {'us_per_op': round(statistics.median(samples), 2), 'min_us': round(min(samples), 2), 'loops': loops}
+
+
+@functools.lru_cache(maxsize=None)
+def load_agent_server():
+    """The agent server module with logging to a temp file and no background warmup or tracing"""
+    os.environ.update(LOG_FILE=os.path.join(tempfile.mkdtemp(), 'bench.log'), LOG_LEVEL='WARNING',
+                      TRACING='False', WARMUP='False')
+    sys.path.insert(0, AGENTS_DIR)
+    spec = importlib.util.spec_from_file_location('agent_server', os.path.join(AGENTS_DIR, 'agent-server.py'))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    return server
+
+
+def load_streamlit_app():
+    sys.path.insert(0, ROOT)
+    import byteedge_automotive_ai
+    return byteedge_automotive_ai
+
+
+def routing_cases():
+    """ConversationalAI.analyze_query over the agents' curated questions, quick topics and off-topic queries"""
+    app = load_streamlit_app()
+    corpus = list(OFF_TOPIC)
+    for config in app.AGENT_CONFIGS.values():
+        corpus.extend(question for _, question in config['quick_topics'])
+    knowledge_dir = os.path.join(AGENTS_DIR, 'knowledge')
+    for name in sorted(os.listdir(knowledge_dir)):
+        if name.endswith('.json'):
+            with open(os.path.join(knowledge_dir, name)) as f:
+                corpus.extend(question for entry in json.load(f)['entries'] for question in entry['questions'])
+    ai = app.ConversationalAI()
+
+    def run(n: int):
+        for i in range(n):
+            ai.analyze_query(corpus[i % len(corpus)])
+
+    yield 'routing/analyze_query', run
+
+
+def prompt_cases():
+    """get_agent_response with an instant model: end to end, and its prompt_build stage alone"""
+    server = load_agent_server()
+    handler = server.ai_handler
+    handler.model = InstantModel()
+    stage = server.instrumentation.STAGE_LATENCY.labels(stage='prompt_build', agent='frame')
+    for length in HISTORY_LENGTHS:
+        conversation_id = f'bench_history_{length}'
+        handler.conversation_history[conversation_id] = [
+            {'user': f'Earlier question {i} about frame rails and crossmembers',
+             'assistant': 'Box-section rails with boxed crossmembers at the spring hangers. ' * 8,
+             'timestamp': '2026-01-01T00:00:00', 'agent': 'frame'} for i in range(length)]
+
+        def run(n: int, conversation_id=conversation_id):
+            history = handler.conversation_history
+            for _ in range(n):
+                handler.get_agent_response(QUESTION, 'frame', conversation_id, use_prepared=False)
+                history[conversation_id].pop()  # back to the benchmark length
+
+        def prompt_build(n: int, run=run):
+            before = stage.sum
+            run(n)
+            return stage.sum - before  # seconds spent in the prompt_build stage of those calls
+
+        yield f'prompt/get_agent_response[history={length}]', run
+        yield f'prompt/prompt_build[history={length}]', prompt_build
+
+
+def history_cases():
+    """_build_response storing an exchange and trimming to 50, from one thread and from eight"""
+    server = load_agent_server()
+    handler = server.ai_handler
+    conversation_ids = [f'bench_contention_{i}' for i in range(64)]
+    for conversation_id in conversation_ids:
+        handler.conversation_history[conversation_id] = [{'user': 'q', 'assistant': 'a', 'timestamp': '',
+                                                          'agent': 'frame'}] * 50
+    for threads in (1, 8):
+        def run(n: int, threads=threads):
+            def worker(offset: int):
+                for i in range(n // threads):
+                    handler._build_response(QUESTION, 'answer', 'frame', conversation_ids[(offset + i) % 64])
+
+            workers = [threading.Thread(target=worker, args=(t * 8,)) for t in range(threads)]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+
+        yield f'history/append_trim[threads={threads}]', run
+
+
+def figure_cases():
+    """SimulationEngine figure construction: built from scratch at two sample counts, and from the cache"""
+    app = load_streamlit_app()
+    for samples in (50, 20000):
+        def run(n: int, samples=samples):
+            for _ in range(n):
+                app.SimulationEngine._build_brake_performance_demo(samples, app.DEFAULT_SCREEN_WIDTH)
+
+        yield f'figures/brake_build[samples={samples}]', run
+
+    def cached(n: int):
+        for _ in range(n):
+            app.SimulationEngine.create_brake_performance_demo()
+
+    yield 'figures/brake_cached', cached
+
+
+def streamlit_cases():
+    """Headless AppTest reruns of main(), with an empty session and with a long one"""
+    from streamlit.testing.v1 import AppTest
+    app = load_streamlit_app()
+    for messages in (0, 1000):
+        at = AppTest.from_file(os.path.join(ROOT, 'byteedge_automotive_ai.py'), default_timeout=120)
+        history = app.ChatHistory(app.CHAT_MAX_MESSAGES, app.CHAT_WINDOW, None, track=('brake',))
+        for i in range(messages):
+            history.append('user' if i % 2 == 0 else 'assistant', f'Message {i} about frame stiffness targets')
+        at.session_state['chat_history'] = history
+        at.run()
+
+        def run(n: int, at=at):
+            for _ in range(n):
+                at.run()
+
+        yield f'streamlit/main_rerun[messages={messages}]', run
+
+
+GROUPS = {
+    'routing': routing_cases,
+    'prompt': prompt_cases,
+    'history': history_cases,
+    'figures': figure_cases,
+    'streamlit': streamlit_cases,
+}
+
+
+def compare(results, baseline, threshold: float):
+    """Regression messages for cases whose best time is above baseline * (1 + threshold)"""
+    failures = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        # Best of the repeats: noise from other processes only ever adds time
+        if reference and result['min_us'] > reference['min_us'] * (1 + threshold):
+            failures.append(f"{name}: best {result['min_us']:.2f} us/op exceeds baseline "
+                            f"{reference['min_us']:.2f} by more than {threshold:.0%}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('groups', nargs='*', default=list(GROUPS), help=f"groups to run ({', '.join(GROUPS)})")
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds per case, split across the repeats')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE, help='baseline file for --check and --update')
+    parser.add_argument('--results', help='compare this saved --json run instead of measuring')
+    parser.add_argument('--check', action='store_true', help='exit 1 on regression against the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown as a fraction of baseline')
+    parser.add_argument('--update', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+    else:
+        os.environ.pop('GEMINI_API_KEY', None)
+        results = {}
+        for group in args.groups:
+            for name, run in GROUPS[group]():
+                results[name] = time_case(run, args.min_time, args.repeat)
+
+    print(f"{'case':<44} {'us/op':>10} {'best':>10} {'baseline':>10} {'change':>8}")
+    for name, result in results.items():
+        reference = baseline.get(name, {}).get('min_us')
+        change = f"{result['min_us'] / reference - 1:>+8.0%}" if reference else f"{'':>8}"
+        print(f"{name:<44} {result['us_per_op']:>10.2f} {result['min_us']:>10.2f} "
+              f"{reference if reference else '-':>10} {change}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.update:
+        merged = {**baseline, **{name: {'us_per_op': r['us_per_op'], 'min_us': r['min_us']}
+                               for name, r in results.items()}}
+        with open(args.baseline, 'w') as f:
+            json.dump(merged, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+    if args.check:
+        failures = compare(results, baseline, args.threshold)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print("Hot paths within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Vector retrieval benchmark
+Builds a synthetic clustered float16 index (1M chunks by default), then measures open time,
+resident memory after opening, per-batch query latency and recall@k of IVF against an exact scan
+
+Usage: python benchmarks/bench_retrieval.py [--chunks 1000000] [--nprobe 4 8 16] [--batch 1 4] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Agents'))
+from memory_monitor import rss_bytes  # noqa: E402
+from vector_index import DIM, SCAN_BLOCK, VectorIndex, write_index  # noqa: E402
+
+
+def synthetic_vectors(n: int, dim: int, topics: int = 4000, seed: int = 0) -> np.ndarray:
+    """Unit vectors scattered around ``topics`` centres, like chunks of many related documents"""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((topics, dim)).astype(np.float32)
+    centres /= np.linalg.norm(centres, axis=1, keepdims=True)
+    out = np.empty((n, dim), dtype=np.float16)
+    for start in range(0, n, SCAN_BLOCK):
+        count = min(SCAN_BLOCK, n - start)
+        block = centres[rng.integers(0, topics, count)] + 0.02 * rng.standard_normal((count, dim)).astype(np.float32)
+        out[start:start + count] = block / np.linalg.norm(block, axis=1, keepdims=True)
+    return out
+
+
+def exact_top_k(index: VectorIndex, queries: np.ndarray, k: int):
+    """Reference results from a full scan of the memory-mapped matrix"""
+    scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    rows = np.zeros((len(queries), k), dtype=np.int64)
+    for start in range(0, len(index), SCAN_BLOCK):
+        block = queries @ np.asarray(index.vectors[start:start + SCAN_BLOCK], dtype=np.float32).T
+        merged_scores = np.concatenate([scores, block], axis=1)
+        merged_rows = np.concatenate([rows, np.broadcast_to(np.arange(start, start + block.shape[1]),
+                                                            block.shape)], axis=1)
+        keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(merged_scores, keep, axis=1)
+        rows = np.take_along_axis(merged_rows, keep, axis=1)
+    return [set(r.tolist()) for r in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--chunks', type=int, default=1_000_000)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[4, 8, 16])
+    parser.add_argument('--batch', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--k', type=int, default=4)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='bench_retrieval_')
+    try:
+        started = time.perf_counter()
+        vectors = synthetic_vectors(args.chunks, DIM)
+        records = [{'title': f'chunk {i}', 'source': 'synthetic', 'text': ''} for i in range(args.chunks)]
+        manifest = write_index(workdir, vectors, records)
+        print(f"Built {args.chunks} x {DIM} float16 index ({manifest['nlist']} IVF lists) "
+              f"in {time.perf_counter() - started:.1f} s, {vectors.nbytes / 2**20:.0f} MiB on disk")
+
+        rng = np.random.default_rng(1)
+        queries = np.asarray(vectors[rng.integers(0, args.chunks, args.queries)], dtype=np.float32)
+        queries += 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        del vectors, records
+
+        before = rss_bytes()
+        started = time.perf_counter()
+        index = VectorIndex(workdir)
+        open_ms = (time.perf_counter() - started) * 1000
+        opened = rss_bytes()
+        print(f"Opened in {open_ms:.2f} ms, RSS +{((opened or 0) - (before or 0)) / 2**20:.1f} MiB")
+
+        truth = exact_top_k(index, queries, args.k)
+        results = {'chunks': args.chunks, 'dim': DIM, 'nlist': manifest['nlist'], 'open_ms': round(open_ms, 2),
+                   'runs': []}
+        print(f"{'nprobe':>6} {'batch':>5} {'p50 ms':>8} {'p99 ms':>8} {'recall@' + str(args.k):>9}")
+        for nprobe in args.nprobe:
+            for batch in args.batch:
+                latencies, found = [], 0
+                for start in range(0, len(queries) - batch + 1, batch):
+                    group = queries[start:start + batch]
+                    began = time.perf_counter()
+                    hits = index.search(group, args.k, nprobe)
+                    latencies.append((time.perf_counter() - began) * 1000)
+                    found += sum(len({row for row, _ in h} & truth[start + i]) for i, h in enumerate(hits))
+                searched = len(latencies) * batch
+                row = {'nprobe': nprobe, 'batch': batch, 'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+                       'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+                       'recall': round(found / (searched * args.k), 4)}
+                results['runs'].append(row)
+                print(f"{nprobe:>6} {batch:>5} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['recall']:>9.3f}")
+        del index
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Server benchmark
+Runs the agent server with a stand-in model under the Werkzeug dev server and under gunicorn with
+gunicorn.conf.py, then compares time to first response, throughput, latency, memory shared between
+workers and errors across a graceful reload (SIGHUP) under load
+
+Usage: python benchmarks/bench_server.py [--seconds 5] [--clients 16] [--workers 2] [--upstream-ms 50] [--json out.json]
+"""
+
+import argparse
+import http.client
+import importlib
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENTS_DIR = os.path.join(BENCH_DIR, '..', 'Agents')
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+    def __iter__(self):
+        return iter([self])
+
+
+class StandInModel:
+    """Waits like an upstream call (off the GIL) and returns a fixed answer"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def generate_content(self, prompt, stream=False):
+        time.sleep(self.latency_s)
+        return _Response('The main trade-offs are stiffness, mass and cost.')
+
+
+def standin_app():
+    """App factory for both servers: the real app with the stand-in model set before any fork"""
+    sys.path.insert(0, AGENTS_DIR)
+    server = importlib.import_module('agent-server')
+    server.ai_handler.model = StandInModel(float(os.environ.get('BENCH_UPSTREAM_MS', 50)) / 1000.0)
+    return server.create_app(init=False)
+
+
+def serve_dev(port: int):
+    """Same startup as ``python agent-server.py``: init this process, then the threaded dev server"""
+    app = standin_app()
+    sys.modules['agent-server'].init_worker()
+    app.run(host='127.0.0.1', port=port, threaded=True)
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def launch(mode: str, port: int, workers: int, env: dict) -> subprocess.Popen:
+    if mode == 'dev':
+        command = [sys.executable, os.path.abspath(__file__), '--serve-dev', str(port)]
+    else:
+        env = {**env, 'GUNICORN_PRELOAD': str(mode == 'gunicorn')}
+        command = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(AGENTS_DIR, 'gunicorn.conf.py'),
+                   '--pythonpath', BENCH_DIR, '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+                   'bench_server:standin_app()']
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(port: int, timeout_s: float = 30.0) -> float:
+    """Seconds until /api/health answers"""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout_s:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/health')
+            if conn.getresponse().status == 200:
+                return time.perf_counter() - started
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def requests_for(client: int, i: int):
+    """Mostly chat turns that reach the (stand-in) model, plus health checks and a page"""
+    kind = i % 10
+    if kind < 7:
+        body = json.dumps({'message': f'Walk me through the design trade-offs of layout {client}-{i}'})
+        return 'POST', '/api/chat/frame', body, {'Content-Type': 'application/json'}
+    if kind < 9:
+        return 'GET', '/api/health', None, {}
+    return 'GET', '/frame-edge.html', None, {'Accept-Encoding': 'gzip'}
+
+
+def load(port: int, seconds: float, clients: int, during=None):
+    """Keep-alive clients issuing requests back to back; ``during`` runs halfway through"""
+    latencies, counts = [], {'errors': 0, 'stale_retries': 0, 'connections': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def count(key: str):
+        with lock:
+            counts[key] += 1
+
+    def client(n: int):
+        conn, reused, i, mine = None, False, 0, []
+        while time.perf_counter() < deadline:
+            method, path, body, headers = requests_for(n, i)
+            i += 1
+            started = time.perf_counter()
+            for attempt in range(2):
+                if conn is None:
+                    conn, reused = http.client.HTTPConnection('127.0.0.1', port, timeout=10), False
+                    count('connections')
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    conn = None
+                    # A kept-alive connection the server closed before answering: clients resend once
+                    if reused and attempt == 0:
+                        count('stale_retries')
+                        continue
+                    count('errors')
+                    break
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = None
+                    count('errors')
+                    break
+                if response.status != 200:
+                    count('errors')
+                else:
+                    mine.append(time.perf_counter() - started)
+                reused = True
+                if response.will_close:
+                    conn.close()
+                    conn = None
+                break
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    if during:
+        time.sleep(seconds / 2)
+        during()
+    for thread in threads:
+        thread.join()
+    ordered = sorted(latencies)
+    return {
+        'requests_per_s': round(len(ordered) / seconds, 1),
+        'p50_ms': round(statistics.median(ordered) * 1000, 2) if ordered else None,
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2) if ordered else None,
+        **counts,
+    }
+
+
+def process_tree(pid: int):
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            with open(f'/proc/{current}/task/{current}/children') as f:
+                pending.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def memory(pid: int):
+    """Summed RSS, PSS and private memory of the server's processes (Linux smaps_rollup)"""
+    totals = {'processes': 0, 'rss_mb': 0.0, 'pss_mb': 0.0, 'private_mb': 0.0, 'shared_mb': 0.0}
+    for current in process_tree(pid):
+        try:
+            with open(f'/proc/{current}/smaps_rollup') as f:
+                fields = {line.split(':')[0]: int(line.split()[1]) for line in f if line.endswith('kB\n')}
+        except OSError:
+            continue
+        totals['processes'] += 1
+        totals['rss_mb'] += fields.get('Rss', 0) / 1024
+        totals['pss_mb'] += fields.get('Pss', 0) / 1024
+        totals['private_mb'] += (fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)) / 1024
+        totals['shared_mb'] += (fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0)) / 1024
+    return {key: round(value, 1) for key, value in totals.items()}
+
+
+def run(mode: str, args, env: dict):
+    port = free_port()
+    started = time.perf_counter()
+    process = launch(mode, port, args.workers, env)
+    try:
+        wait_ready(port)
+        ready_s = time.perf_counter() - started
+        load(port, 1.0, args.clients)  # warm up routes and connections
+        result = {'ready_s': round(ready_s, 2), **load(port, args.seconds, args.clients), **memory(process.pid)}
+        if mode != 'dev':
+            reload = load(port, args.seconds, args.clients, during=lambda: os.kill(process.pid, signal.SIGHUP))
+            result['reload'] = {key: reload[key] for key in ('requests_per_s', 'p99_ms', 'errors', 'stale_retries')}
+        return result
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--upstream-ms', type=float, default=50.0)
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--serve-dev', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_dev:
+        return serve_dev(args.serve_dev)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        env = {**os.environ, 'LOG_FILE': os.path.join(log_dir, 'bench.log'), 'LOG_LEVEL': 'WARNING',
+               'TRACING': 'False', 'WARMUP': 'False', 'BENCH_UPSTREAM_MS': str(args.upstream_ms)}
+        env.pop('GEMINI_API_KEY', None)
+        results = {mode: run(mode, args, env) for mode in ('dev', 'gunicorn', 'gunicorn-no-preload')}
+
+    print(f"{'server':<20} {'ready s':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'conns':>6} "
+          f"{'procs':>6} {'PSS MB':>7} {'shared MB':>10}")
+    for mode, row in results.items():
+        print(f"{mode:<20} {row['ready_s']:>8.2f} {row['requests_per_s']:>8.1f} {row['p50_ms']:>8.2f} "
+              f"{row['p99_ms']:>8.2f} {row['errors']:>7} {row['connections']:>6} {row['processes']:>6} "
+              f"{row['pss_mb']:>7.1f} {row['shared_mb']:>10.1f}")
+    for mode in ('gunicorn', 'gunicorn-no-preload'):
+        reload = results[mode]['reload']
+        print(f"{mode} across a SIGHUP reload: {reload['requests_per_s']} req/s, p99 {reload['p99_ms']} ms, "
+              f"{reload['errors']} errors, {reload['stale_retries']} resent on closed keep-alive connections")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'workers': args.workers, 'clients': args.clients, 'upstream_ms': args.upstream_ms,
+                       **results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
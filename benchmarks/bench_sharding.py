@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Conversation sharding benchmark
+Starts several agent-server nodes on local ports (gunicorn, one worker each) with a stand-in model that
+has a fixed per-node capacity, sends multi-turn conversations to random nodes and reports throughput per
+node count, the share of forwarded turns and whether every turn saw its full history. A final run adds a
+node to a live ring and reports how many conversations moved
+
+Usage: python benchmarks/bench_sharding.py [--nodes 1,2,4] [--seconds 6] [--clients 24] [--json out.json]
+"""
+
+import argparse
+import http.client
+import importlib
+import json
+import os
+import random
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENTS_DIR = os.path.join(BENCH_DIR, '..', 'Agents')
+SECRET = 'bench-shard-secret'
+TURNS = 4
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+    def __iter__(self):
+        return iter([self])
+
+
+class CapacityModel:
+    """Stand-in upstream with a per-node concurrency limit; answers with the history turns it was given"""
+
+    def __init__(self, latency_s: float, capacity: int):
+        self.latency_s = latency_s
+        self.slots = threading.BoundedSemaphore(capacity)
+
+    def generate_content(self, prompt, stream=False):
+        with self.slots:
+            time.sleep(self.latency_s)
+        return _Response(f"history={prompt.count('Previous User:')}")
+
+
+def node_app():
+    """App factory for one node"""
+    sys.path.insert(0, AGENTS_DIR)
+    server = importlib.import_module('agent-server')
+    server.ai_handler.model = CapacityModel(float(os.environ['BENCH_UPSTREAM_MS']) / 1000.0,
+                                            int(os.environ['BENCH_NODE_CAPACITY']))
+    return server.create_app(init=False)
+
+
+def free_ports(count: int):
+    sockets = [socket.socket() for _ in range(count)]
+    for s in sockets:
+        s.bind(('127.0.0.1', 0))
+    ports = [s.getsockname()[1] for s in sockets]
+    for s in sockets:
+        s.close()
+    return ports
+
+
+def url(port: int) -> str:
+    return f'http://127.0.0.1:{port}'
+
+
+def launch(port: int, members, env: dict) -> subprocess.Popen:
+    env = {**env, 'SHARD_SELF': url(port), 'SHARD_NODES': ','.join(url(p) for p in members)}
+    command = [sys.executable, '-m', 'gunicorn', '-c', os.path.join(AGENTS_DIR, 'gunicorn.conf.py'),
+               '--pythonpath', BENCH_DIR, '--bind', f'127.0.0.1:{port}', '--workers', '1', 'bench_sharding:node_app()']
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def call(port: int, method: str, path: str, payload=None, headers=None, timeout: float = 30.0):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    body = json.dumps(payload) if payload is not None else None
+    conn.request(method, path, body=body, headers={'Content-Type': 'application/json', **(headers or {})})
+    response = conn.getresponse()
+    data = response.read()
+    conn.close()
+    return response.status, json.loads(data) if data else None
+
+
+def wait_ready(ports, timeout_s: float = 30.0):
+    deadline = time.monotonic() + timeout_s
+    for port in ports:
+        while True:
+            try:
+                if call(port, 'GET', '/api/health', timeout=1)[0] == 200:
+                    break
+            except OSError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f'node on port {port} did not start')
+            time.sleep(0.05)
+
+
+def status(port: int):
+    return call(port, 'GET', '/api/admin/shard', headers={'X-Admin-Token': SECRET})[1]
+
+
+class Conversations:
+    """Clients that each run conversations of TURNS turns, sending every turn to a random node"""
+
+    def __init__(self, ports):
+        self.ports = ports
+        self.latencies, self.turns, self.history_misses, self.errors = [], 0, 0, 0
+        self.ids = []
+        self._lock = threading.Lock()
+
+    def turn(self, conns, message: str, conversation_id=None, expected_history: int = 0):
+        port = random.choice(self.ports)
+        conn = conns.get(port) or conns.setdefault(port, http.client.HTTPConnection('127.0.0.1', port, timeout=60))
+        body = json.dumps({'message': message, 'conversation_id': conversation_id})
+        started = time.perf_counter()
+        try:
+            conn.request('POST', '/api/chat/frame', body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            result = json.loads(response.read())
+        except (OSError, http.client.HTTPException, ValueError):
+            conns.pop(port).close()
+            with self._lock:
+                self.errors += 1
+            return None
+        elapsed = time.perf_counter() - started
+        seen = re.search(r'history=(\d+)', result.get('message') or '')
+        with self._lock:
+            self.latencies.append(elapsed)
+            self.turns += 1
+            if not result.get('success') or seen is None or int(seen.group(1)) != min(expected_history, 6):
+                self.history_misses += 1
+        return result.get('conversation_id')
+
+    def run(self, clients: int, seconds: float, existing=None):
+        """Run new conversations for ``seconds``, or one more turn of each ``existing`` (id, turns) pair"""
+        deadline = time.perf_counter() + seconds
+        work = list(existing or [])
+
+        def client(n: int):
+            conns = {}
+            while True:
+                if existing is not None:
+                    with self._lock:
+                        if not work:
+                            break
+                        conversation_id, done = work.pop()
+                    self.turn(conns, f'Follow-up on layout {conversation_id}', conversation_id, done)
+                    continue
+                if time.perf_counter() >= deadline:
+                    break
+                conversation_id = self.turn(conns, f'Walk me through the design trade-offs of layout {n}-{random.random()}')
+                done = 1
+                while conversation_id and done < TURNS and time.perf_counter() < deadline:
+                    self.turn(conns, f'And what about option {done}?', conversation_id, done)
+                    done += 1
+                if conversation_id:
+                    with self._lock:
+                        self.ids.append((conversation_id, done))
+            for conn in conns.values():
+                conn.close()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - started
+
+
+def stop(processes):
+    for process in processes:
+        process.send_signal(signal.SIGTERM)
+    for process in processes:
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def scale_run(count: int, args, env: dict):
+    ports = free_ports(count)
+    processes = [launch(port, ports, env) for port in ports]
+    try:
+        wait_ready(ports)
+        Conversations(ports).run(args.clients, 1.0)  # warm up
+        before = [status(port) for port in ports]
+        load = Conversations(ports)
+        load.run(args.clients, args.seconds)
+        after = [status(port) for port in ports]
+        forwarded = sum(a['requests']['forwarded'] - b['requests']['forwarded'] for a, b in zip(after, before))
+        ordered = sorted(load.latencies)
+        return {
+            'turns_per_s': round(load.turns / load.elapsed, 1),
+            'p50_ms': round(statistics.median(ordered) * 1000, 1),
+            'forwarded_share': round(forwarded / max(load.turns, 1), 3),
+            'forward_failed': sum(a['requests']['forward_failed'] - b['requests']['forward_failed']
+                                  for a, b in zip(after, before)),
+            'history_misses': load.history_misses,
+            'errors': load.errors,
+            'misplaced': sum(s['misplaced'] for s in after),
+        }
+    finally:
+        stop(processes)
+
+
+def rebalance_run(args, env: dict):
+    """Three nodes take traffic, a fourth joins, and every conversation continues where it left off"""
+    ports = free_ports(4)
+    processes = [launch(port, ports[:3], env) for port in ports[:3]]
+    processes.append(launch(ports[3], ports, env))
+    try:
+        wait_ready(ports)
+        load = Conversations(ports[:3])
+        load.run(args.clients, args.seconds)
+        total = sum(status(port)['conversations'] for port in ports[:3])
+        started = time.perf_counter()
+        _, changed = call(ports[0], 'POST', '/api/shard/members', {'nodes': [url(p) for p in ports]},
+                          headers={'X-Shard-Token': SECRET})
+        change_ms = (time.perf_counter() - started) * 1000
+        after = [status(port) for port in ports]
+        moved = sum(s['moved']['received'] for s in after)
+        follow = Conversations(ports)
+        follow.run(args.clients, 0, existing=load.ids)
+        return {
+            'conversations': total,
+            'moved': moved,
+            'moved_share': round(moved / max(total, 1), 3),
+            'ideal_share': 0.25,
+            'membership_change_ms': round(change_ms, 1),
+            'conversations_after': sum(s['conversations'] for s in after),
+            'misplaced_after': sum(s['misplaced'] for s in after),
+            'follow_up_history_misses': follow.history_misses,
+            'follow_up_turns': follow.turns,
+            'added': changed['added'],
+        }
+    finally:
+        stop(processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--nodes', default='1,2,4', help='node counts to compare')
+    parser.add_argument('--seconds', type=float, default=6.0)
+    parser.add_argument('--clients', type=int, default=24)
+    parser.add_argument('--upstream-ms', type=float, default=200.0)
+    parser.add_argument('--capacity', type=int, default=4, help='concurrent upstream calls per node')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        env = {**os.environ, 'LOG_FILE': os.path.join(log_dir, 'bench.log'), 'LOG_LEVEL': 'WARNING',
+               'TRACING': 'False', 'WARMUP': 'False', 'SHARD_SECRET': SECRET, 'ADMIN_TOKEN': SECRET,
+               'BENCH_UPSTREAM_MS': str(args.upstream_ms), 'BENCH_NODE_CAPACITY': str(args.capacity)}
+        env.pop('GEMINI_API_KEY', None)
+        scaling = {int(count): scale_run(int(count), args, env) for count in args.nodes.split(',')}
+        rebalance = rebalance_run(args, env)
+
+    base = scaling[min(scaling)]['turns_per_s'] / min(scaling)
+    print(f"{'nodes':>5} {'turns/s':>8} {'per node':>9} {'scaling':>8} {'p50 ms':>7} {'forwarded':>10} "
+          f"{'history misses':>15} {'errors':>7} {'fwd failed':>10}")
+    for count, row in scaling.items():
+        print(f"{count:>5} {row['turns_per_s']:>8.1f} {row['turns_per_s'] / count:>9.1f} "
+              f"{row['turns_per_s'] / (base * count):>8.2f} {row['p50_ms']:>7.1f} {row['forwarded_share']:>10.1%} "
+              f"{row['history_misses']:>15} {row['errors']:>7} {row['forward_failed']:>10}")
+    print(f"3 -> 4 nodes: {rebalance['moved']} of {rebalance['conversations']} conversations moved "
+          f"({rebalance['moved_share']:.1%}, ideal 25%) in {rebalance['membership_change_ms']} ms; "
+          f"{rebalance['misplaced_after']} misplaced, {rebalance['follow_up_history_misses']} of "
+          f"{rebalance['follow_up_turns']} follow-up turns missing history")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'upstream_ms': args.upstream_ms, 'capacity': args.capacity, 'clients': args.clients,
+                       'scaling': scaling, 'rebalance': rebalance}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
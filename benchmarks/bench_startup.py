@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Startup time benchmark
+Starts each entry point in a fresh interpreter under `python -X importtime`, reports wall time,
+import time and the heaviest imports, and checks them against a committed baseline. Deferred modules
+loaded at startup always fail the check. Times are compared as ratios to a bare import of the entry
+point's framework, measured in the same run, so the check does not depend on the machine's speed
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--check] [--threshold 0.2] [--update] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_baseline.json')
+
+# Each entry point's import snippet, the heavy modules it must not load until first use, and the bare
+# framework import its times are measured against
+ENTRY_POINTS = {
+    'agent-server': {
+        'cwd': os.path.join(ROOT, 'Agents'),
+        'code': ("import importlib.util, os\n"
+                 "spec = importlib.util.spec_from_file_location('agent_server', 'agent-server.py')\n"
+                 "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+                 "os._exit(0)"),
+        # NumPy is not deferred: the reference vector indexes are opened (memory-mapped) at import
+        'deferred': ['google.generativeai', 'scipy', 'battery_sim', 'tire_model', 'frame_fe'],
+        'reference': 'flask',
+    },
+    'streamlit-app': {
+        'cwd': ROOT,
+        'code': "import os\nimport byteedge_automotive_ai\nos._exit(0)",
+        'deferred': ['google.generativeai', 'plotly.express', 'pandas', 'plotly.graph_objs._figure'],
+        'reference': 'streamlit',
+    },
+}
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)')
+
+
+def parse_importtime(stderr: str):
+    """(total top-level import µs, {module: cumulative µs}) from -X importtime output"""
+    total, modules = 0, {}
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules[name] = cumulative
+        if not indent:
+            total += cumulative
+    return total, modules
+
+
+def run_once(name: str, log_dir: str, code: str, cwd: str):
+    env = {key: value for key, value in os.environ.items() if key != 'GEMINI_API_KEY'}
+    env.update(LOG_FILE=os.path.join(log_dir, f'{name}.log'), PYTHONDONTWRITEBYTECODE='1')
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd,
+                               env=env, capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} failed to start:\n{completed.stderr[-2000:]}")
+    total_us, modules = parse_importtime(completed.stderr)
+    return wall_ms, total_us / 1000, modules
+
+
+def measure(name: str, runs: int):
+    entry = ENTRY_POINTS[name]
+    reference_code = f"import os\nimport {entry['reference']}\nos._exit(0)"
+    with tempfile.TemporaryDirectory() as log_dir:
+        # One warm-up each fills the OS page cache and __pycache__; runs then alternate so load drifts hit both
+        run_once(name, log_dir, entry['code'], entry['cwd'])
+        run_once(name, log_dir, reference_code, entry['cwd'])
+        samples, references = [], []
+        for _ in range(runs):
+            samples.append(run_once(name, log_dir, entry['code'], entry['cwd']))
+            references.append(run_once(name, log_dir, reference_code, entry['cwd']))
+    modules = samples[-1][2]
+    top_level = {module: us for module, us in modules.items() if '.' not in module}
+    wall_ms = statistics.median(s[0] for s in samples)
+    import_ms = statistics.median(s[1] for s in samples)
+    reference_wall_ms = statistics.median(s[0] for s in references)
+    reference_import_ms = statistics.median(s[1] for s in references)
+    return {
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(import_ms, 1),
+        'reference': entry['reference'],
+        'reference_wall_ms': round(reference_wall_ms, 1),
+        'reference_import_ms': round(reference_import_ms, 1),
+        'wall_ratio': round(wall_ms / reference_wall_ms, 3),
+        'import_ratio': round(import_ms / reference_import_ms, 3),
+        'heaviest': [[module, round(us / 1000, 1)]
+                     for module, us in sorted(top_level.items(), key=lambda item: -item[1])[:8]],
+        'loaded_deferred': [module for module in ENTRY_POINTS[name]['deferred'] if module in modules],
+    }
+
+
+def compare(results, baseline, threshold: float):
+    """
+    Regression messages: deferred modules loaded eagerly, or times relative to the bare framework
+    import above the baseline ratio * (1 + threshold)
+    """
+    failures = []
+    for name, result in results.items():
+        if result['loaded_deferred']:
+            failures.append(f"{name}: imports {', '.join(result['loaded_deferred'])} at startup")
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for metric in ('wall_ratio', 'import_ratio'):
+            if metric in reference and result[metric] > reference[metric] * (1 + threshold):
+                failures.append(f"{name}: {metric} {result[metric]:.2f}x {result['reference']} exceeds baseline "
+                                f"{reference[metric]:.2f}x by more than {threshold:.0%}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('entries', nargs='*', default=list(ENTRY_POINTS), help='entry points to measure')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--check', action='store_true', help='exit 1 on regression against the baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed growth of the time ratio to the bare framework import')
+    parser.add_argument('--update', action='store_true', help='write these results as the new baseline')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.entries:
+        results[name] = result = measure(name, args.runs)
+        print(f"{name:<14} wall {result['wall_ms']:>7.1f} ms ({result['wall_ratio']:.2f}x)   "
+              f"imports {result['import_ms']:>7.1f} ms ({result['import_ratio']:.2f}x import {result['reference']})")
+        for module, ms in result['heaviest']:
+            print(f"    {module:<28} {ms:>7.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.update:
+        with open(BASELINE, 'w') as f:
+            json.dump({name: {key: r[key] for key in ('wall_ms', 'import_ms', 'reference', 'wall_ratio', 'import_ratio')}
+                       for name, r in results.items()}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {BASELINE}")
+    if args.check:
+        baseline = {}
+        if os.path.exists(BASELINE):
+            with open(BASELINE) as f:
+                baseline = json.load(f)
+        failures = compare(results, baseline, args.threshold)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            sys.exit(1)
+        print("Startup within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Model tiering benchmark
+Answers a mixed question corpus through get_agent_response with local stand-in fast and strong models,
+once with every question on the strong model and once with the tiering policy, and reports latency,
+tokens, the fast-tier share, escalations and whether any answer reached the user cut off
+
+Usage: python benchmarks/bench_tiers.py [--agent frame] [--json out.json]
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+AGENTS_DIR = os.path.join(BENCH_DIR, '..', 'Agents')
+
+DESIGN_QUESTIONS = [
+    'Walk me through designing a crash-compatible front structure for a 2,100 kg electric SUV',
+    'How should I trade torsional stiffness against mass for an aluminium space frame on a sports car?',
+    'Design a subframe mounting strategy that isolates road noise without losing steering precision',
+    'Compare hydroformed rails with stamped and welded rails for a mid-size pickup, including cost',
+    'Optimise the battery enclosure so it adds torsional stiffness to the body in white',
+    'What architecture would you recommend for a modular skateboard chassis shared by three body styles?',
+    'Analyse the load paths in a small-overlap crash and recommend where to add reinforcement',
+    'Evaluate carbon fibre versus high-strength steel for the roof structure of a convertible',
+]
+FOLLOW_UPS = ['And the weight?', 'What about cost?', 'Would that change for a hybrid?']
+
+
+class _Candidate:
+    def __init__(self, finish_reason: str):
+        self.finish_reason = finish_reason
+
+
+class _Usage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+
+
+class _Response:
+    def __init__(self, text: str, finish_reason: str, prompt_tokens: int, output_tokens: int):
+        self.text = text
+        self.candidates = [_Candidate(finish_reason)]
+        self.usage_metadata = _Usage(prompt_tokens, output_tokens)
+
+    def __iter__(self):
+        return iter([self])
+
+
+def needed_tokens(question: str, design: bool) -> int:
+    """How long a complete answer to this question is, fixed per question"""
+    spread = int(hashlib.blake2b(question.encode(), digest_size=4).hexdigest(), 16) % 1000 / 1000.0
+    return int(600 + 800 * spread) if design else int(150 + 400 * spread)
+
+
+class StandInModel:
+    """Latency of a first token plus a per-token cost; stops at the answer's length or the output budget"""
+
+    def __init__(self, first_token_s: float, per_token_s: float, needs, max_tokens: int):
+        self.first_token_s = first_token_s
+        self.per_token_s = per_token_s
+        self.needs = needs  # question -> complete answer length in tokens
+        self.max_tokens = max_tokens
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False, generation_config=None):
+        self.calls += 1
+        budget = (generation_config or {}).get('max_output_tokens', self.max_tokens)
+        question = prompt.split('Current User Question: ', 1)[1].split('\n', 1)[0]
+        remaining = self.needs[question]
+        if prompt.endswith('Continuation:'):
+            remaining -= prompt.count('tok ')
+        tokens = max(0, min(remaining, budget))
+        time.sleep(self.first_token_s + tokens * self.per_token_s)
+        return _Response('tok ' * tokens, 'MAX_TOKENS' if remaining > budget else 'STOP', len(prompt) // 4, tokens)
+
+
+def load_agent_server():
+    os.environ.update(LOG_FILE=os.path.join(tempfile.mkdtemp(), 'bench.log'), LOG_LEVEL='WARNING',
+                      TRACING='False', WARMUP='False')
+    sys.path.insert(0, AGENTS_DIR)
+    spec = importlib.util.spec_from_file_location('agent_server', os.path.join(AGENTS_DIR, 'agent-server.py'))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    return server
+
+
+def corpus(server, agent: str):
+    """(question, design) pairs: the agent's quick topics and curated questions, plus design questions"""
+    simple = [question for _, question in server.AGENT_CONFIGS[agent]['quick_topics']]
+    with open(os.path.join(AGENTS_DIR, 'knowledge', f'{agent}.json')) as f:
+        simple += [question for entry in json.load(f)['entries'] for question in entry['questions']]
+    return [(question, False) for question in simple] + [(question, True) for question in DESIGN_QUESTIONS]
+
+
+def run(server, agent: str, questions, needs, tiered: bool):
+    handler = server.ai_handler
+    strong = StandInModel(0.15, 0.0003, needs, server.Config.MAX_TOKENS)
+    fast = StandInModel(0.05, 0.00008, needs, server.Config.FAST_MAX_TOKENS)
+    handler.model = strong
+    handler.tiers = handler.tier_policy(fast) if tiered else None
+    latencies, output_tokens, cut_off, tiers, escalated = [], 0, 0, {'fast': 0, 'strong': 0}, 0
+    for n, (question, design) in enumerate(questions):
+        conversation_id = f'bench_tiers_{tiered}_{n}'
+        # Every third conversation continues with follow-ups, so deeper histories are in the mix
+        turns = [question] + (FOLLOW_UPS if n % 3 == 0 else [])
+        for turn in turns:
+            needs.setdefault(turn, needed_tokens(turn + question, design))
+            started = time.perf_counter()
+            result = handler.get_agent_response(turn, agent, conversation_id, use_prepared=False)
+            latencies.append(time.perf_counter() - started)
+            answer = result.get('message') or ''
+            output_tokens += answer.count('tok ')
+            cut_off += answer.count('tok ') < needs[turn]
+            tier = result.get('model_tier', {'tier': 'strong'})
+            tiers[tier['tier']] += 1
+            escalated += bool(tier.get('escalated'))
+    ordered = sorted(latencies)
+    return {
+        'turns': len(latencies),
+        'mean_ms': round(statistics.mean(ordered) * 1000, 1),
+        'p50_ms': round(statistics.median(ordered) * 1000, 1),
+        'p90_ms': round(ordered[int(len(ordered) * 0.9)] * 1000, 1),
+        'fast_share': round(tiers['fast'] / len(latencies), 3),
+        'escalation_rate': round(escalated / max(tiers['fast'], 1), 3),
+        'strong_calls': strong.calls,
+        'fast_calls': fast.calls,
+        'output_tokens': output_tokens,
+        'cut_off_answers': cut_off,
+        'status': handler.tiers.status() if handler.tiers else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--agent', default='frame')
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    os.environ.pop('GEMINI_API_KEY', None)
+    server = load_agent_server()
+    questions = corpus(server, args.agent)
+    needs = {question: needed_tokens(question, design) for question, design in questions}
+    results = {'strong only': run(server, args.agent, questions, needs, tiered=False),
+               'tiered': run(server, args.agent, questions, needs, tiered=True)}
+
+    print(f"{len(questions)} questions ({len(DESIGN_QUESTIONS)} design), follow-ups on every third")
+    print(f"{'policy':<12} {'turns':>6} {'mean ms':>8} {'p50 ms':>7} {'p90 ms':>7} {'fast':>6} {'escalated':>10} "
+          f"{'strong calls':>13} {'fast calls':>11} {'cut off':>8}")
+    for policy, row in results.items():
+        print(f"{policy:<12} {row['turns']:>6} {row['mean_ms']:>8.1f} {row['p50_ms']:>7.1f} {row['p90_ms']:>7.1f} "
+              f"{row['fast_share']:>6.0%} {row['escalation_rate']:>10.1%} {row['strong_calls']:>13} "
+              f"{row['fast_calls']:>11} {row['cut_off_answers']:>8}")
+    fast = results['tiered']['status']['tiers']['fast']['agents'].get(args.agent, {})
+    print(f"fast tier: predicted budget {fast.get('budget')} tokens (cap {server.Config.FAST_MAX_TOKENS}), "
+          f"escalations {fast.get('escalations')}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
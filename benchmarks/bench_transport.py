@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Chat transport benchmark
+Serves the agent server in-process with a stand-in model and compares per-message latency, wire
+bytes and connection setup for HTTP POST (with and without a CORS preflight) and the WebSocket endpoint
+
+Usage: python benchmarks/bench_transport.py [--messages 200] [--json out.json]
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Agents')
+MESSAGE = 'Walk me through the design trade-offs of this layout'
+
+
+class _Chunk:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Response:
+    def __init__(self, parts):
+        self.parts = parts
+        self.text = ''.join(parts)
+
+    def __iter__(self):
+        return iter(_Chunk(part) for part in self.parts)
+
+
+class StandInModel:
+    """Answers instantly so only transport and server overhead are measured"""
+    PARTS = ['The main ', 'trade-offs ', 'are stiffness, ', 'mass and cost.']
+
+    def generate_content(self, prompt, stream=False):
+        return _Response(self.PARTS)
+
+
+def load_server(log_dir: str):
+    os.environ.update(LOG_FILE=os.path.join(log_dir, 'bench.log'), TRACING='False', WS_MAX_PER_CLIENT='1000',
+                      WARMUP='False')
+    os.environ.pop('GEMINI_API_KEY', None)
+    sys.path.insert(0, AGENTS_DIR)
+    spec = importlib.util.spec_from_file_location('agent_server', os.path.join(AGENTS_DIR, 'agent-server.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module.ai_handler.model = StandInModel()
+    logging.disable(logging.INFO)  # keep per-request log lines out of the measurement
+    return module
+
+
+def http_exchange(port: int, raw: bytes) -> int:
+    """Send one raw HTTP/1.0 request on a fresh connection; returns bytes received"""
+    with socket.create_connection(('127.0.0.1', port)) as conn:
+        conn.sendall(raw)
+        received = 0
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                return received
+            received += len(data)
+
+
+def http_requests(port: int, agent: str, preflight: bool):
+    body = json.dumps({'message': MESSAGE, 'conversation_id': f'bench_{agent}'}).encode()
+    post = (f'POST /api/chat/{agent} HTTP/1.0\r\nHost: 127.0.0.1:{port}\r\nOrigin: https://embed.example\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n').encode() + body
+    options = (f'OPTIONS /api/chat/{agent} HTTP/1.0\r\nHost: 127.0.0.1:{port}\r\nOrigin: https://embed.example\r\n'
+               'Access-Control-Request-Method: POST\r\nAccess-Control-Request-Headers: content-type\r\n\r\n').encode()
+    return ([options] if preflight else []) + [post]
+
+
+def bench_http(port: int, messages: int, preflight: bool):
+    latencies, sent, received = [], 0, 0
+    for i in range(messages):
+        started = time.perf_counter()
+        for raw in http_requests(port, 'frame', preflight):
+            sent += len(raw)
+            received += http_exchange(port, raw)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, (sent + received) / messages, None
+
+
+def ws_frame_bytes(payload: int, client: bool) -> int:
+    header = 2 + (2 if payload >= 126 else 0) + (6 if payload >= 65536 else 0)
+    return payload + header + (4 if client else 0)
+
+
+def bench_ws(port: int, messages: int):
+    from websockets.sync.client import connect
+
+    started = time.perf_counter()
+    with connect(f'ws://127.0.0.1:{port}/api/ws', compression=None) as ws:
+        ready = ws.recv()
+        setup_ms = (time.perf_counter() - started) * 1000
+        wire = ws_frame_bytes(len(ready), False)
+        latencies, total = [], 0
+        conversation = None
+        for i in range(messages):
+            frame = json.dumps({'type': 'chat', 'id': str(i), 'agent': 'frame', 'message': MESSAGE,
+                                'conversation_id': conversation})
+            began = time.perf_counter()
+            ws.send(frame)
+            total += ws_frame_bytes(len(frame), True)
+            while True:
+                data = ws.recv()
+                total += ws_frame_bytes(len(data), False)
+                reply = json.loads(data)
+                if reply['type'] == 'done':
+                    conversation = reply['conversation_id']
+                    break
+            latencies.append((time.perf_counter() - began) * 1000)
+    return latencies, total / messages, {'setup_ms': round(setup_ms, 3), 'handshake_bytes': wire}
+
+
+def bench_connect(port: int, attempts: int = 50):
+    """Median time to open a socket connection, with and without the WebSocket upgrade"""
+    from websockets.sync.client import connect
+
+    tcp, upgrade = [], []
+    for _ in range(attempts):
+        started = time.perf_counter()
+        socket.create_connection(('127.0.0.1', port)).close()
+        tcp.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        with connect(f'ws://127.0.0.1:{port}/api/ws', compression=None) as ws:
+            ws.recv()
+            upgrade.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(tcp), 3), round(statistics.median(upgrade), 3)
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {'p50_ms': round(statistics.median(ordered), 3),
+            'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=200)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    from werkzeug.serving import make_server
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        server = load_server(log_dir)
+        httpd = make_server('127.0.0.1', 0, server.app, threaded=True)
+        port = httpd.server_port
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        try:
+            bench_http(port, 10, False)  # warm up routes, templates and caches
+            results = {}
+            for name, run in (('http', lambda: bench_http(port, args.messages, False)),
+                              ('http+preflight', lambda: bench_http(port, args.messages, True)),
+                              ('websocket', lambda: bench_ws(port, args.messages))):
+                latencies, wire_bytes, extra = run()
+                results[name] = {**summarize(latencies), 'bytes_per_message': round(wire_bytes), **(extra or {})}
+            tcp_ms, upgrade_ms = bench_connect(port)
+            results['connect'] = {'tcp_ms': tcp_ms, 'websocket_open_ms': upgrade_ms}
+        finally:
+            httpd.shutdown()
+            server.gateway.shutdown()
+            server.ai_handler.tools.shutdown()
+
+    print(f"{'transport':<16} {'p50 ms':>8} {'p99 ms':>8} {'bytes/msg':>10}")
+    for name in ('http', 'http+preflight', 'websocket'):
+        row = results[name]
+        print(f"{name:<16} {row['p50_ms']:>8.3f} {row['p99_ms']:>8.3f} {row['bytes_per_message']:>10}")
+    print(f"TCP connect {results['connect']['tcp_ms']:.3f} ms, WebSocket open (connect + upgrade + ready) "
+          f"{results['connect']['websocket_open_ms']:.3f} ms, paid once per page")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Pre-parser regression check
+Runs questions with known answers through engineering_tools.pre_parse and the tool registry, and exits
+non-zero when a question maps to the wrong arguments or result. Pre-parsed answers are returned without
+a model step, so a misread number reaches the user unchecked
+
+Usage: python benchmarks/check_pre_parse.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Agents'))
+
+import engineering_tools  # noqa: E402
+
+# (agent, question, expected arguments of the first call or None for no pre-parse, expected result subset)
+CASES = [
+    ('clutch', 'Torque capacity of a clutch with 150 mm inner diameter and 240 mm outer diameter at 8 kN clamp load',
+     {'outer_diameter_mm': 240.0, 'inner_diameter_mm': 150.0, 'clamp_load_kn': 8.0}, {'torque_capacity_nm': 468.0}),
+    ('clutch', 'Clutch torque for 240 mm OD / 160 mm ID at 8 kN clamp load',
+     {'outer_diameter_mm': 240.0, 'inner_diameter_mm': 160.0, 'clamp_load_kn': 8.0}, {'torque_capacity_nm': 480.0}),
+    ('clutch', 'What torque can a 240 mm single-plate clutch carry at 8 kN clamp load?',
+     {'outer_diameter_mm': 240.0, 'clamp_load_kn': 8.0, 'plates': 1}, {'inner_diameter_mm': 156.0}),
+    ('clutch', 'Clutch torque with 240 mm and 160 mm friction rings at 8 kN', None, None),
+    ('battery', 'What is the energy of a 96s4p 400V pack with 5Ah cells?',
+     {'series': 96, 'parallel': 4, 'cell_capacity_ah': 5.0}, {'nominal_voltage_v': 400.0, 'nominal_energy_kwh': 8.0}),
+    ('battery', 'Energy of a 96s4p pack of 5Ah cells at 3.6 V',
+     {'series': 96, 'parallel': 4, 'cell_capacity_ah': 5.0, 'nominal_voltage': 3.6}, {'nominal_energy_kwh': 6.91}),
+]
+
+
+def check(registry, agent, question, arguments, result):
+    """Failure messages for one case"""
+    calls = engineering_tools.pre_parse(question, agent)
+    if arguments is None:
+        return [f"expected no pre-parse, got {calls}"] if calls else []
+    if not calls:
+        return ["expected a pre-parsed call, got none"]
+    got = calls[0]['arguments']
+    failures = [f"{key} = {got.get(key)}, expected {value}" for key, value in arguments.items()
+                if got.get(key) != value]
+    record = registry.execute(calls[:1], agent)[0]
+    if 'error' in record:
+        return failures + [record['error']]
+    return failures + [f"{key} = {record['result'].get(key)}, expected {value}" for key, value in result.items()
+                       if record['result'].get(key) != value]
+
+
+def main():
+    registry = engineering_tools.default_registry()
+    failed = 0
+    for agent, question, arguments, result in CASES:
+        failures = check(registry, agent, question, arguments, result)
+        print(f"{'FAIL' if failures else 'ok':<5} {agent:<8} {question}")
+        for failure in failures:
+            print(f"      {failure}")
+        failed += bool(failures)
+    registry.shutdown()
+    if failed:
+        sys.exit(1)
+    print(f"{len(CASES)} pre-parse cases pass")
+
+
+if __name__ == '__main__':
+    main()
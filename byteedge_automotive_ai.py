@@ -5,15 +5,31 @@ Designed for VC Pitch - Professional Interface with Intelligent Agent Routing
 """
 
 import os
+import sys
+import json
+import urllib.request
 import streamlit as st
-import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, TYPE_CHECKING
 import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
 import time
 from datetime import datetime
+from figure_builder import DEFAULT_SCREEN_WIDTH, figure_cache, line_trace_kwargs
+from chat_history import DEFAULT_SPILL_DIR, ChatHistory
+
+if TYPE_CHECKING:  # plotly and the Gemini SDK are imported on first use, not on every script start
+    import plotly.graph_objects as go
+
+# Shared runtime instrumentation lives with the agent server modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Agents"))
+import instrumentation
+import knowledge_base
+from agent_configs import AGENT_CONFIGS
+from consult import Consultation
+
+figure_cache.on_lookup = lambda hit: instrumentation.record_cache("figure", hit)
+# Speculative handoffs are not routed queries, so they are counted apart from REQUESTS
+SPECULATIONS = instrumentation.registry.counter(
+    'router_speculations_total', 'Speculative handoffs the router asked for by agent and outcome (started, refused)')
 
 # ============================================================================
 # CONFIGURATION & STYLING
@@ -319,16 +335,42 @@ class AgentSystem:
 class ConversationalAI:
     """Advanced Gemini-powered conversational AI with agent routing"""
     
+    # Consult mode: every suggested agent answers in parallel within one overall deadline
+    CONSULT_DEADLINE = float(os.getenv("CONSULT_DEADLINE", 15))
+    CONSULT_SYNTHESIS = os.getenv("CONSULT_SYNTHESIS", "merge")  # 'merge' (local, instant) or 'model'
+    CONSULT_SYNTHESIS_S = float(os.getenv("CONSULT_SYNTHESIS_S", 4))
+    # Speculative handoff: a confidently routed question is answered on the agent server while the user reads
+    AGENT_SERVER_URL = os.getenv("AGENT_SERVER_URL", "").rstrip("/")
+    SPECULATE_MIN_SCORE = int(os.getenv("SPECULATE_MIN_SCORE", 2))
+    SPECULATE_MIN_SHARE = float(os.getenv("SPECULATE_MIN_SHARE", 0.6))
+    
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY", "")
         if self.api_key:
+            import google.generativeai as genai
             genai.configure(api_key=self.api_key)
             self.model = genai.GenerativeModel('gemini-1.5-flash')
         else:
             self.model = None
+        # Curated agent answers used when Gemini is unavailable or fails
+        self.knowledge = knowledge_base.KnowledgeBase(
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "Agents", "knowledge")).load()
+        self.consultation = Consultation()
+    
+    def knowledge_note(self, user_input: str) -> str:
+        """Closest curated answer across all agents, formatted for the offline responses"""
+        hit = self.knowledge.search_all(user_input)
+        if not hit:
+            return ""
+        return f"\n\n**From the {hit['agent'].title()} Agent knowledge base - {hit['title']}:**\n\n{hit['answer']}\n"
     
     def analyze_query(self, user_input: str) -> Dict:
         """Analyze user query and suggest appropriate agents"""
+        with instrumentation.timed("route"):
+            return self._score_agents(user_input)
+
+    def _score_agents(self, user_input: str) -> Dict:
+        """Keyword relevance scoring behind analyze_query"""
         query_lower = user_input.lower()
         suggested_agents = []
         confidence_scores = {}
@@ -390,6 +432,7 @@ class ConversationalAI:
     def generate_response(self, user_input: str, suggested_agents: List[str]) -> str:
         """Generate AI response with agent recommendations"""
         if not self.model:
+            instrumentation.REQUESTS.inc(agent="router", status="offline")
             return f"""
 **BytEdge Automotive AI Analysis**
 
@@ -400,6 +443,7 @@ I've analyzed your query and identified the most relevant engineering domains. B
 Our agents use advanced simulation and analysis to provide precise engineering solutions for automotive systems. Each agent specializes in specific components and can perform real-time analysis, FEA simulations, and optimization recommendations.
 
 Please select the appropriate agent below to begin your engineering analysis.
+{self.knowledge_note(user_input)}
             """
         
         try:
@@ -419,11 +463,104 @@ Provide a professional, technical response that:
 Keep response concise but authoritative. Focus on technical accuracy and practical engineering value.
 """
             
-            response = self.model.generate_content(prompt)
+            with instrumentation.timed("upstream_call"):
+                response = self.model.generate_content(prompt)
+            instrumentation.record_tokens("router", response, prompt, response.text)
+            instrumentation.REQUESTS.inc(agent="router", status="ok")
             return response.text
             
         except Exception as e:
-            return f"I've analyzed your automotive engineering query and identified {len(suggested_agents)} relevant specialist agents. Our {suggested_agents[0]} would be the optimal choice for your requirements, offering advanced simulation capabilities and expert engineering guidance."
+            instrumentation.REQUESTS.inc(agent="router", status="error")
+            return f"I've analyzed your automotive engineering query and identified {len(suggested_agents)} relevant specialist agents. Our {suggested_agents[0]} would be the optimal choice for your requirements, offering advanced simulation capabilities and expert engineering guidance.{self.knowledge_note(user_input)}"
+
+    @staticmethod
+    def agent_key(agent_name: str) -> str:
+        """'Brake Agent' -> 'brake', the key used by AGENT_CONFIGS, the knowledge base and metrics"""
+        return agent_name.split()[0].lower()
+    
+    def specialist_prompt(self, agent_name: str, user_input: str) -> str:
+        """The agent's own system prompt from AGENT_CONFIGS, or one built from its portfolio entry"""
+        config = AGENT_CONFIGS.get(self.agent_key(agent_name))
+        if config:
+            persona = config["system_prompt"]
+        else:
+            agent = AgentSystem.AGENTS[agent_name]
+            persona = (f"You are the BytEdge {agent_name}. {agent['description']}. "
+                       f"You specialize in {', '.join(agent['specializes_in'])}.")
+        return (f"{persona}\n\nOther BytEdge specialists are answering the same question, so cover only "
+                f"your own domain in under 200 words.\n\nCurrent User Question: {user_input}\n\nAssistant Response:")
+    
+    def _ask_specialist(self, agent_name: str, user_input: str) -> Optional[str]:
+        """One specialist's answer: Gemini when configured, otherwise its curated knowledge base"""
+        key = self.agent_key(agent_name)
+        if not self.model:
+            hit = self.knowledge.fallback_answer(key, user_input)
+            return hit["answer"] if hit else None
+        prompt = self.specialist_prompt(agent_name, user_input)
+        with instrumentation.timed("upstream_call", key):
+            response = self.model.generate_content(prompt)
+        instrumentation.record_tokens(key, response, prompt, response.text)
+        return response.text
+    
+    def _synthesize(self, user_input: str, answers: List[Dict]) -> str:
+        """Model-written synthesis of the specialists' answers"""
+        sections = "\n\n".join(f"{answer['name']}:\n{answer['text']}" for answer in answers)
+        prompt = f"""
+You are BytEdge Automotive AI. Several specialist agents answered the same question.
+
+User Query: {user_input}
+
+{sections}
+
+Merge these into one concise engineering recommendation. Explain how the systems interact, resolve any
+conflicts explicitly and attribute key figures to the agent that gave them.
+"""
+        with instrumentation.timed("upstream_call"):
+            response = self.model.generate_content(prompt)
+        instrumentation.record_tokens("router", response, prompt, response.text)
+        return response.text
+    
+    def speculation_target(self, analysis: Dict) -> Optional[str]:
+        """The top suggested agent if routing is confident and the agent server has a page for it"""
+        scores = analysis["confidence_scores"]
+        if not self.AGENT_SERVER_URL or not scores:
+            return None
+        top = analysis["suggested_agents"][0]
+        if self.agent_key(top) not in AGENT_CONFIGS:
+            return None
+        if scores[top] < self.SPECULATE_MIN_SCORE or scores[top] / sum(scores.values()) < self.SPECULATE_MIN_SHARE:
+            return None
+        return top
+    
+    def speculate(self, user_input: str, analysis: Dict) -> Optional[Dict]:
+        """Start the top agent's answer on the agent server; returns the agent and its page url with the token"""
+        agent_name = self.speculation_target(analysis)
+        if not agent_name:
+            return None
+        key = self.agent_key(agent_name)
+        request = urllib.request.Request(
+            f"{self.AGENT_SERVER_URL}/api/handoff",
+            data=json.dumps({"agent": key, "message": user_input}).encode(),
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=1.0) as response:
+                handoff = json.load(response)
+        except (OSError, ValueError):
+            # Over the server's speculation budget (429) or unreachable: the plain recommendation still works
+            SPECULATIONS.inc(agent=key, outcome="refused")
+            return None
+        SPECULATIONS.inc(agent=key, outcome="started")
+        return {"agent": agent_name, "url": f"{self.AGENT_SERVER_URL}{handoff['url']}"}
+    
+    def consult(self, user_input: str, suggested_agents: List[str]) -> Dict:
+        """Ask every suggested agent concurrently; latency tracks the slowest on-time answer, not the sum"""
+        asks = {self.agent_key(name): (lambda name=name: self._ask_specialist(name, user_input))
+                for name in suggested_agents}
+        synthesize = self._synthesize if self.model and self.CONSULT_SYNTHESIS == "model" else None
+        return self.consultation.run(user_input, asks, self.CONSULT_DEADLINE, synthesize=synthesize,
+                                     synthesis_s=self.CONSULT_SYNTHESIS_S,
+                                     names={self.agent_key(name): name for name in suggested_agents})
 
 # ============================================================================
 # SIMULATION & VISUALIZATION
@@ -433,11 +570,21 @@ class SimulationEngine:
     """Advanced simulation and visualization engine"""
     
     @staticmethod
-    def create_brake_performance_demo() -> go.Figure:
+    def create_brake_performance_demo(samples: int = 50, screen_width: int = DEFAULT_SCREEN_WIDTH) -> "go.Figure":
         """Create professional brake performance visualization"""
+        params = {"samples": samples, "screen_width": screen_width}
+        return figure_cache.get_or_build(
+            "brake_performance", params,
+            lambda: SimulationEngine._build_brake_performance_demo(samples, screen_width)
+        )
+
+    @staticmethod
+    def _build_brake_performance_demo(samples: int, screen_width: int) -> "go.Figure":
+        """Build the brake performance figure with traces decimated to the screen resolution"""
+        import plotly.graph_objects as go
         
         # Generate sample brake performance data
-        temperatures = np.linspace(50, 400, 50)
+        temperatures = np.linspace(50, 400, samples)
         friction_coeff = 0.45 - 0.0003 * temperatures + 0.0000002 * temperatures**2
         wear_rate = 0.1 * np.exp(temperatures / 200)
         
@@ -445,9 +592,7 @@ class SimulationEngine:
         
         # Friction coefficient
         fig.add_trace(go.Scatter(
-            x=temperatures,
-            y=friction_coeff,
-            mode='lines+markers',
+            **line_trace_kwargs(temperatures, friction_coeff, screen_width=screen_width),
             name='Friction Coefficient',
             line=dict(color='#667eea', width=3),
             marker=dict(size=6)
@@ -455,9 +600,7 @@ class SimulationEngine:
         
         # Wear rate on secondary axis
         fig.add_trace(go.Scatter(
-            x=temperatures,
-            y=wear_rate,
-            mode='lines+markers',
+            **line_trace_kwargs(temperatures, wear_rate, screen_width=screen_width),
             name='Wear Rate (μm/stop)',
             line=dict(color='#764ba2', width=3, dash='dash'),
             marker=dict(size=6),
@@ -482,14 +625,51 @@ class SimulationEngine:
     
     @staticmethod
     def create_system_metrics() -> Dict:
-        """Generate system performance metrics for dashboard"""
+        """Generate live system performance metrics for dashboard"""
+        p95 = instrumentation.latency_quantile(0.95, stage="turn")
+        hit_rate = instrumentation.cache_hit_rate("figure")
         return {
-            "Active Agents": 1,
-            "Simulations Run": 2847,
-            "Analysis Accuracy": "99.2%",
-            "Response Time": "<2s"
+            "Active Agents": sum(1 for config in AgentSystem.AGENTS.values() if config["status"] == "active"),
+            "Queries Routed": int(instrumentation.REQUESTS.total()),
+            "Figure Cache Hits": f"{hit_rate:.0%}" if hit_rate is not None else "—",
+            "Response Time (p95)": f"{p95:.2f}s" if p95 else "—"
         }
 
+# ============================================================================
+# CHAT HISTORY
+# ============================================================================
+
+# Reruns render one window of messages; beyond CHAT_MAX_MESSAGES the oldest spill to a per-session file
+CHAT_WINDOW = int(os.getenv("CHAT_WINDOW", 20))
+CHAT_MAX_MESSAGES = int(os.getenv("CHAT_MAX_MESSAGES", 200))
+CHAT_SPILL_DIR = os.getenv("CHAT_SPILL_DIR", DEFAULT_SPILL_DIR) or None  # empty: drop instead of spilling
+
+
+def _turn_page(step: int):
+    st.session_state.chat_page = max(0, st.session_state.get("chat_page", 0) + step)
+
+
+def _show_latest():
+    st.session_state.chat_page = 0
+
+
+@st.fragment
+def render_chat_history():
+    """Newest window of the conversation with paging to older messages; paging reruns only this fragment"""
+    history = st.session_state.chat_history
+    if not history:
+        return
+    page = min(st.session_state.get("chat_page", 0), history.page_count - 1)
+    if history.page_count > 1:
+        first, last = history.page_range(page)
+        earlier, position, later = st.columns([1, 4, 1])
+        earlier.button("◀ Earlier", key="chat_earlier", disabled=page >= history.page_count - 1,
+                       on_click=_turn_page, args=(1,), use_container_width=True)
+        position.caption(f"Messages {first}-{last} of {len(history)}")
+        later.button("Later ▶", key="chat_later", disabled=page == 0,
+                     on_click=_turn_page, args=(-1,), use_container_width=True)
+    st.markdown(history.page_html(page), unsafe_allow_html=True)
+
 # ============================================================================
 # MAIN APPLICATION
 # ============================================================================
@@ -501,7 +681,7 @@ def main():
     if "ai_assistant" not in st.session_state:
         st.session_state.ai_assistant = ConversationalAI()
     if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
+        st.session_state.chat_history = ChatHistory(CHAT_MAX_MESSAGES, CHAT_WINDOW, CHAT_SPILL_DIR, track=("brake",))
     if "suggested_agents" not in st.session_state:
         st.session_state.suggested_agents = []
     
@@ -538,32 +718,57 @@ def main():
     st.markdown("*Describe your automotive engineering challenge and I'll connect you with the right specialist agent.*")
     
     # Chat History Display
-    for message in st.session_state.chat_history:
-        role_class = "user" if message["role"] == "user" else "assistant"
-        st.markdown(f'<div class="chat-message">{message["content"]}</div>', unsafe_allow_html=True)
+    render_chat_history()
     
     # User Input
     user_query = st.text_input(
         "Your Engineering Query:",
         placeholder="e.g., 'I need to optimize brake performance for high-speed applications' or 'Analyze frame stress under crash conditions'",
-        key="user_input"
+        key="user_input",
+        on_change=_show_latest
     )
+    consult_mode = st.toggle("Consult mode - ask every suggested agent at once", key="consult_mode",
+                             help=f"Specialists answer in parallel; answers missing the "
+                                  f"{ConversationalAI.CONSULT_DEADLINE:g} s deadline are left out")
     
     if user_query:
         # Add user message to history
-        st.session_state.chat_history.append({"role": "user", "content": user_query})
+        st.session_state.chat_history.append("user", user_query)
         
         # Analyze query and suggest agents
-        with st.spinner("Analyzing your query with AI..."):
+        consultation = None
+        # The whole turn is its own stage, so the dashboard's response time is what the user waited
+        with st.spinner("Analyzing your query with AI..."), instrumentation.timed("turn"):
             analysis = st.session_state.ai_assistant.analyze_query(user_query)
-            ai_response = st.session_state.ai_assistant.generate_response(user_query, analysis["suggested_agents"])
+            # Started before the router's own reply so both run at once; reruns reuse the same handoff
+            if st.session_state.get("handoff", {}).get("query") != user_query:
+                st.session_state.handoff = {"query": user_query,
+                                            "prepared": st.session_state.ai_assistant.speculate(user_query, analysis)}
+            prepared = st.session_state.handoff["prepared"]
+            if consult_mode and len(analysis["suggested_agents"]) > 1:
+                consultation = st.session_state.ai_assistant.consult(user_query, analysis["suggested_agents"])
+                ai_response = consultation["synthesis"]
+            else:
+                ai_response = st.session_state.ai_assistant.generate_response(user_query, analysis["suggested_agents"])
             
         # Add AI response to history
-        st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
+        st.session_state.chat_history.append("assistant", ai_response)
         st.session_state.suggested_agents = analysis["suggested_agents"]
         
         # Display AI response
-        st.markdown(f'<div class="chat-message">{ai_response}</div>', unsafe_allow_html=True)
+        if consultation:
+            st.markdown(ai_response)
+            for answer in consultation["answers"]:
+                with st.expander(f"{answer['name']} - answered in {answer['latency_ms'] / 1000:.1f} s"):
+                    st.markdown(answer["text"])
+            if consultation["missing"]:
+                st.caption("Left out: " +
+                           ", ".join(f"{item['name']} ({item['reason']})" for item in consultation["missing"]))
+            st.caption(f"Consulted {len(consultation['answers']) + len(consultation['missing'])} agents "
+                       f"in {consultation['elapsed_ms'] / 1000:.1f} s "
+                       f"(deadline {consultation['deadline_s']:g} s, synthesis: {consultation['synthesis_source']})")
+        else:
+            st.markdown(f'<div class="chat-message">{ai_response}</div>', unsafe_allow_html=True)
         
         # Show suggested agents
         if st.session_state.suggested_agents:
@@ -586,7 +791,13 @@ def main():
                     """, unsafe_allow_html=True)
                     
                     # Agent Action Button
-                    if agent_config['status'] == 'active' and agent_config['app_url']:
+                    if prepared and prepared["agent"] == agent_name:
+                        st.link_button(
+                            label=f"Open {agent_name} - answer ready",
+                            url=prepared["url"],
+                            use_container_width=True
+                        )
+                    elif agent_config['status'] == 'active' and agent_config['app_url']:
                         # WORKING REDIRECT SOLUTION
                         st.link_button(
                             label=f"Launch {agent_name}",
@@ -639,7 +850,7 @@ def main():
                 st.button(f"Coming Soon - {agent_name}", disabled=True, use_container_width=True)
     
     # Demo Simulation Section (for VC presentation)
-    if st.session_state.chat_history and any("brake" in msg["content"].lower() for msg in st.session_state.chat_history):
+    if st.session_state.chat_history.mentioned("brake"):
         st.markdown('<div class="simulation-panel">', unsafe_allow_html=True)
         st.markdown("### Live Simulation Demo - Brake Performance Analysis")
         
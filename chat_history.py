@@ -0,0 +1,130 @@
+# BytEdge Automotive AI - Chat History Layer
+"""
+Bounded, windowed chat history for a Streamlit session
+Per-message HTML fragments rendered once, topic flags kept up to date on append
+and spill-over of the oldest messages to a per-session JSONL file
+"""
+
+import json
+import os
+import tempfile
+import uuid
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "byteedge-chat")
+
+
+def render_fragment(role: str, content: str) -> str:
+    role_class = "user" if role == "user" else "assistant"
+    return f'<div class="chat-message {role_class}">{content}</div>'
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ChatHistory:
+    """
+    Chat messages with the newest ``max_messages`` held in memory.
+
+    Older messages are appended to a spill file and read back only when the user pages to them;
+    reruns touch one window of pre-rendered fragments, so their cost does not grow with the session.
+    """
+
+    def __init__(self, max_messages: int = 200, window: int = 20, spill_dir: Optional[str] = None,
+                 track: Iterable[str] = ()):
+        self.max_messages = max(max_messages, window)
+        self.window = window
+        self.spill_dir = spill_dir  # None keeps no spill file; the oldest messages are dropped instead
+        self.messages: List[Dict] = []
+        self.spilled = 0
+        self.dropped = 0
+        self.spill_path: Optional[str] = None
+        self._offsets: List[int] = []  # byte offset of each spilled message in the spill file
+        self.mentions = {term.lower(): False for term in track}
+        self._joined: Tuple[Tuple[int, int], str] = ((-1, -1), "")
+
+    def __len__(self) -> int:
+        return self.dropped + self.spilled + len(self.messages)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def append(self, role: str, content: str) -> Dict:
+        message = {"role": role, "content": content, "html": render_fragment(role, content)}
+        self.messages.append(message)
+        lowered = None
+        for term, seen in self.mentions.items():
+            if not seen:
+                lowered = lowered if lowered is not None else content.lower()
+                self.mentions[term] = term in lowered
+        if len(self.messages) > self.max_messages:
+            # Spill a whole window at a time, so the file is written once per ``window`` appends
+            self._spill(len(self.messages) - self.max_messages + self.window)
+        return message
+
+    def mentioned(self, term: str) -> bool:
+        """Whether any message so far, including spilled ones, contained a tracked term"""
+        return self.mentions[term.lower()]
+
+    def _spill(self, count: int):
+        oldest, self.messages = self.messages[:count], self.messages[count:]
+        if self.spill_dir is not None:
+            try:
+                self._write(oldest)
+                self.spilled += len(oldest)
+                return
+            except OSError:
+                pass
+        self.dropped += len(oldest)
+
+    def _write(self, messages: List[Dict]):
+        if self.spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self.spill_path = os.path.join(self.spill_dir, f"chat-{uuid.uuid4().hex}.jsonl")
+            weakref.finalize(self, _remove, self.spill_path)  # the file goes when the session's history does
+        with open(self.spill_path, "ab") as f:
+            offset = f.tell()
+            for message in messages:
+                line = (json.dumps(message) + "\n").encode("utf-8")
+                self._offsets.append(offset)
+                f.write(line)
+                offset += len(line)
+
+    def _read_spilled(self, start: int, stop: int) -> List[Dict]:
+        if start >= stop:
+            return []
+        with open(self.spill_path, "rb") as f:
+            f.seek(self._offsets[start])
+            return [json.loads(f.readline()) for _ in range(stop - start)]
+
+    @property
+    def page_count(self) -> int:
+        available = self.spilled + len(self.messages)
+        return max(1, -(-available // self.window))
+
+    def page(self, number: int = 0) -> List[Dict]:
+        """Messages of page ``number``, counted back from the newest window (page 0)"""
+        number = min(max(number, 0), self.page_count - 1)
+        available = self.spilled + len(self.messages)
+        stop = available - number * self.window
+        start = max(0, stop - self.window)
+        spilled = self._read_spilled(start, min(stop, self.spilled))
+        return spilled + self.messages[max(start - self.spilled, 0):max(stop - self.spilled, 0)]
+
+    def page_html(self, number: int = 0) -> str:
+        """The page's fragments joined for one markdown element; kept until the history changes"""
+        key = (number, len(self))
+        if self._joined[0] != key:
+            self._joined = (key, "".join(message["html"] for message in self.page(number)))
+        return self._joined[1]
+
+    def page_range(self, number: int = 0) -> Tuple[int, int]:
+        """1-based positions of the page's first and last message across the whole session"""
+        number = min(max(number, 0), self.page_count - 1)
+        stop = len(self) - number * self.window
+        return max(self.dropped + 1, stop - self.window + 1), stop
@@ -0,0 +1,145 @@
+# BytEdge Automotive AI - Figure Building Layer
+"""
+Screen-resolution decimation and compact encoding for Plotly simulation figures
+Largest-Triangle-Three-Buckets and min/max decimation, float32 typed-array payloads
+and a parameter-hash keyed figure cache
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_SCREEN_WIDTH = 1200  # px; one LTTB point per horizontal pixel is visually lossless
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices selected by Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, in each bucket, the point forming the largest
+    triangle with the previously selected point and the mean of the next bucket.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Mean of every bucket, computed once with cumulative sums
+    cx = np.concatenate([[0.0], np.cumsum(x, dtype=np.float64)])
+    cy = np.concatenate([[0.0], np.cumsum(y, dtype=np.float64)])
+    starts, stops = edges[:-1], edges[1:]
+    counts = np.maximum(stops - starts, 1)
+    mean_x = (cx[stops] - cx[starts]) / counts
+    mean_y = (cy[stops] - cy[starts]) / counts
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(len(starts)):
+        lo, hi = starts[b], stops[b]
+        if b + 1 < len(starts):
+            nx, ny = mean_x[b + 1], mean_y[b + 1]
+        else:
+            nx, ny = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - nx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (ny - ay))
+        a = lo + int(area.argmax())
+        selected[b + 1] = a
+    return selected
+
+
+def minmax_decimate(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Indices of the minimum and maximum of each bucket, preserving peaks and spikes"""
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    width = int(np.max(np.diff(edges)))
+    # Pad buckets to equal width so argmin/argmax run in one vectorized pass
+    index = edges[:-1, None] + np.arange(width)[None, :]
+    valid = index < edges[1:, None]
+    index = np.minimum(index, n - 1)
+    values = y[index]
+    lo = np.where(valid, values, np.inf).argmin(axis=1)
+    hi = np.where(valid, values, -np.inf).argmax(axis=1)
+    rows = np.arange(n_buckets)
+    picks = np.sort(np.stack([index[rows, lo], index[rows, hi]], axis=1), axis=1).ravel()
+    return np.unique(picks)
+
+
+def decimate(x, y, method: str = 'lttb', screen_width: int = DEFAULT_SCREEN_WIDTH) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce one trace to the screen resolution and cast to float32"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if method == 'lttb':
+        index = lttb(x, y, screen_width)
+    elif method == 'minmax':
+        index = minmax_decimate(y, screen_width)
+    elif method == 'none':
+        index = np.arange(len(x))
+    else:
+        raise ValueError("method must be 'lttb', 'minmax' or 'none'")
+    # float32 numpy arrays are serialized by Plotly as base64 typed arrays (bdata)
+    return x[index].astype(np.float32), y[index].astype(np.float32)
+
+
+def parameter_hash(name: str, params: Dict) -> str:
+    payload = json.dumps({'figure': name, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures keyed by parameter hash"""
+
+    def __init__(self, max_entries: int = 32, on_lookup: Optional[Callable[[bool], None]] = None):
+        self.max_entries = max_entries
+        self.on_lookup = on_lookup  # called with True on a hit, False on a miss
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, name: str, params: Dict, builder: Callable[[], object]):
+        key = parameter_hash(name, params)
+        with self._lock:
+            hit = key in self._entries
+            if hit:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                figure = self._entries[key]
+            else:
+                self.misses += 1
+        if self.on_lookup:
+            self.on_lookup(hit)
+        if hit:
+            return figure
+        figure = builder()
+        with self._lock:
+            self._entries[key] = figure
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+figure_cache = FigureCache()
+
+
+def payload_size(figure) -> int:
+    """Bytes of JSON that a figure ships to the browser"""
+    return len(figure.to_json().encode('utf-8'))
+
+
+def line_trace_kwargs(x, y, method: str = 'lttb', screen_width: int = DEFAULT_SCREEN_WIDTH,
+                      marker_threshold: Optional[int] = 200) -> Dict:
+    """Decimated x/y plus a draw mode that drops markers once a trace is dense"""
+    xs, ys = decimate(x, y, method, screen_width)
+    mode = 'lines+markers' if marker_threshold and len(xs) <= marker_threshold else 'lines'
+    return {'x': xs, 'y': ys, 'mode': mode}